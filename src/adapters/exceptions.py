@@ -32,3 +32,32 @@ class WallNotFoundException(BaseNotFoundException):
 
 class FootfallNotFoundException(BaseNotFoundException):
     entity_name = "Footfall"
+
+
+class ImportJobNotFoundException(BaseNotFoundException):
+    entity_name = "Import job"
+
+
+class ImportLedgerEntryNotFoundException(BaseNotFoundException):
+    entity_name = "Import ledger entry"
+
+
+class BaseAlreadyExistsException(Exception):
+    entity_name: str
+
+    def __init__(self, filters: dict[str, Any]):
+        self.filters = filters
+
+    def __str__(self) -> str:
+        filters = ""
+        for key, value in self.filters.items():
+            filters += f" {key}={value}"
+        return f"{self.entity_name} already exists:{filters}"
+
+
+class FootfallAlreadyExistsException(BaseAlreadyExistsException):
+    entity_name = "Active footfall"
+
+
+class ImportLedgerEntryAlreadyExistsException(BaseAlreadyExistsException):
+    entity_name = "Import ledger entry"
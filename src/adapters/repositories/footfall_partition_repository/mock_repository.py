@@ -0,0 +1,23 @@
+from domain.entities.footfall import FootfallPartition
+from ports.repositories.footfall_partition_repository import (
+    FootfallPartitionRepository,
+)
+
+
+class MockFootfallPartitionRepository(FootfallPartitionRepository):
+    def __init__(self, partitions: list[FootfallPartition] | None = None):
+        self.partitions = {partition.name: partition for partition in partitions or []}
+        self.detached: list[str] = []
+
+    def get_all(self) -> list[FootfallPartition]:
+        return list(self.partitions.values())
+
+    def add(self, partition: FootfallPartition) -> None:
+        self.partitions[partition.name] = partition
+
+    def detach(self, partition: FootfallPartition) -> None:
+        del self.partitions[partition.name]
+        self.detached.append(partition.name)
+
+    def delete(self, partition: FootfallPartition) -> None:
+        del self.partitions[partition.name]
@@ -0,0 +1,124 @@
+import logging
+import re
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from adapters.exceptions import DatabaseException
+from adapters.repositories.models import FootfallDailyMallORM, FootfallDailyWallORM
+from domain.entities.footfall import FootfallPartition
+from ports.repositories.footfall_partition_repository import (
+    FootfallPartitionRepository,
+)
+
+logger = logging.getLogger()
+
+GET_PARTITIONS_SQL = """
+    SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+    FROM pg_inherits
+    JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid
+    WHERE pg_inherits.inhparent = 'footfall'::regclass
+    ORDER BY child.relname
+"""
+BOUNDS_PATTERN = re.compile(r"FROM \('(?P<start>[^']+)'\) TO \('(?P<end>[^']+)'\)")
+
+
+class SQLAlchemyFootfallPartitionRepository(FootfallPartitionRepository):
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_all(self) -> list[FootfallPartition]:
+        try:
+            rows = self.session.execute(sa.text(GET_PARTITIONS_SQL)).all()
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            raise DatabaseException
+        partitions = []
+        for name, bounds in rows:
+            # The default partition has no bounds.
+            if match := BOUNDS_PATTERN.search(bounds):
+                partitions.append(
+                    FootfallPartition(
+                        name=name,
+                        start_datetime=datetime.fromisoformat(match["start"]),
+                        end_datetime=datetime.fromisoformat(match["end"]),
+                    )
+                )
+        return partitions
+
+    def add(self, partition: FootfallPartition) -> None:
+        name = self._quote(partition.name)
+        bounds = {
+            "start_datetime": partition.start_datetime,
+            "end_datetime": partition.end_datetime,
+        }
+        try:
+            self.session.execute(
+                sa.text(
+                    f"CREATE TABLE {name} "
+                    "(LIKE footfall INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+                )
+            )
+            # Rows already written to the default partition for this range have
+            # to move, otherwise attaching the partition fails.
+            self.session.execute(
+                sa.text(
+                    f"""
+                    WITH moved AS (
+                        DELETE FROM footfall_default
+                        WHERE start_datetime >= :start_datetime
+                            AND start_datetime < :end_datetime
+                        RETURNING *
+                    )
+                    INSERT INTO {name} SELECT * FROM moved
+                    """
+                ),
+                bounds,
+            )
+            self.session.execute(
+                sa.text(
+                    f"ALTER TABLE footfall ATTACH PARTITION {name} "
+                    f"FOR VALUES FROM ('{partition.start_datetime.isoformat()}') "
+                    f"TO ('{partition.end_datetime.isoformat()}')"
+                )
+            )
+            self.session.commit()
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            self.session.rollback()
+            raise DatabaseException
+
+    def detach(self, partition: FootfallPartition) -> None:
+        self._remove(
+            partition,
+            f"ALTER TABLE footfall DETACH PARTITION {self._quote(partition.name)}",
+        )
+
+    def delete(self, partition: FootfallPartition) -> None:
+        self._remove(partition, f"DROP TABLE {self._quote(partition.name)}")
+
+    def _remove(self, partition: FootfallPartition, statement: str) -> None:
+        try:
+            self.session.execute(sa.text(statement))
+            # The daily rollups would otherwise keep counting the removed footfalls.
+            self.session.execute(
+                sa.delete(FootfallDailyWallORM).where(
+                    FootfallDailyWallORM.start_datetime >= partition.start_datetime,
+                    FootfallDailyWallORM.start_datetime < partition.end_datetime,
+                )
+            )
+            self.session.execute(
+                sa.delete(FootfallDailyMallORM).where(
+                    FootfallDailyMallORM.start_datetime >= partition.start_datetime,
+                    FootfallDailyMallORM.start_datetime < partition.end_datetime,
+                )
+            )
+            self.session.commit()
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            self.session.rollback()
+            raise DatabaseException
+
+    def _quote(self, name: str) -> str:
+        return self.session.get_bind().dialect.identifier_preparer.quote(name)
@@ -1,8 +1,17 @@
 import logging
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterator
 
-from domain.entities.footfall import Footfall, OriginType
+from domain.entities.footfall import Footfall, FootfallBatch, FootfallRange, OriginType
+from domain.entities.footfall_aggregate import (
+    FootfallBucket,
+    FootfallGroup,
+    FootfallOccupancy,
+    FootfallRanking,
+    FootfallSeries,
+)
+from domain.entities.footfall_import import ImportStrategy
 from ports.repositories.footfall_repository import FootfallRepository
 
 logger = logging.getLogger()
@@ -19,6 +28,10 @@ class MockFootfallRepository(FootfallRepository):
         wall_id=1,
     )
 
+    @contextmanager
+    def atomic(self) -> Iterator[None]:
+        yield
+
     def add(self, footfall: Footfall) -> Footfall:
         return footfall
 
@@ -37,5 +50,56 @@ class MockFootfallRepository(FootfallRepository):
     def count(self, **filters: Any) -> int:
         return 1
 
-    def add_batch(self, footfalls: list[Footfall]) -> None:
+    def aggregate(
+        self, bucket: FootfallBucket, group_by: FootfallGroup, **filters: Any
+    ) -> list[FootfallSeries]:
+        return []
+
+    def occupancy(
+        self, group_by: FootfallGroup, daily_reset: bool = False, **filters: Any
+    ) -> list[FootfallOccupancy]:
+        return []
+
+    def rank(
+        self, walls_limit: int, hours_limit: int, **filters: Any
+    ) -> FootfallRanking:
+        return FootfallRanking()
+
+    def rebuild_rollups(self) -> None:
+        return None
+
+    def add_batch(self, footfalls: list[Footfall] | FootfallBatch) -> None:
+        return None
+
+    def replace_batch(
+        self, footfalls: list[Footfall] | FootfallBatch, ranges: list[FootfallRange]
+    ) -> None:
+        return None
+
+    def stage_batch(
+        self,
+        staging_key: str,
+        footfalls: FootfallBatch,
+        import_job_id: int | None = None,
+    ) -> None:
         return None
+
+    def upsert_batch(self, footfalls: FootfallBatch) -> None:
+        return None
+
+    def apply_staged(
+        self, staging_key: str, strategy: ImportStrategy = ImportStrategy.history
+    ) -> None:
+        return None
+
+    def discard_staged(self, staging_key: str) -> None:
+        return None
+
+    def purge_staged(self, import_job_id: int | None = None) -> int:
+        return 0
+
+    def get_active_in_ranges(self, ranges: list[FootfallRange]) -> FootfallBatch:
+        return FootfallBatch([], [], [], [], [], [], [])
+
+    def count_active_in_ranges(self, ranges: list[FootfallRange]) -> int:
+        return 0
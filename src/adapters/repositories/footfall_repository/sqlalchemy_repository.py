@@ -1,38 +1,110 @@
 import logging
-from typing import Any
+import uuid
+from dataclasses import replace
+from datetime import datetime, time, timedelta
+from itertools import chain, groupby
+from typing import Any, Iterable, Iterator
 
+import psycopg2
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.sql.expression import ColumnElement
 
 from adapters.exceptions import (
     DatabaseException,
+    FootfallAlreadyExistsException,
     FootfallNotFoundException,
     WallNotFoundException,
 )
-from adapters.repositories.models import FootfallORM
-from domain.entities.footfall import Footfall
+from adapters.repositories.models import (
+    FootfallDailyMallORM,
+    FootfallDailyWallORM,
+    FootfallORM,
+    FootfallStagingORM,
+    ImportJobORM,
+    WallORM,
+)
+from adapters.repositories.sqlalchemy_repository import SQLAlchemyRepository
+from adapters.repositories.utils import estimate_count, get_mall_rollup_query
+from domain.entities.footfall import Footfall, FootfallBatch, FootfallRange
+from domain.entities.footfall_aggregate import (
+    FootfallBucket,
+    FootfallGroup,
+    FootfallOccupancy,
+    FootfallPeakHours,
+    FootfallRanking,
+    FootfallSeries,
+)
+from domain.entities.footfall_import import ImportStrategy
+from domain.entities.import_job import ImportJobStatus
 from domain.entities.mall import Mall
 from domain.entities.wall import Wall
 from ports.repositories.footfall_repository import FootfallRepository
 
 logger = logging.getLogger()
 
+WALL_FOREIGN_KEY = "footfall_wall_id_fkey"
+# Partitions report the unique index under their own name, e.g.
+# footfall_2024_03_wall_id_start_datetime_origin_idx.
+ACTIVE_KEY_COLUMNS = "wall_id_start_datetime_origin"
+
+COPY_FOOTFALLS_SQL = """
+    COPY footfall (
+        start_datetime, end_datetime, people_in, people_out, is_active, origin, wall_id
+    ) FROM STDIN
+"""
+COPY_FOOTFALL_STAGING_SQL = """
+    COPY footfall_staging (
+        start_datetime, end_datetime, people_in, people_out, is_active, origin, wall_id,
+        staging_key, import_job_id
+    ) FROM STDIN
+"""
+COPY_NULL = "\\N"
+STAGED_COLUMNS = (
+    "start_datetime",
+    "end_datetime",
+    "people_in",
+    "people_out",
+    "is_active",
+    "origin",
+    "wall_id",
+)
+ROLLUP_COLUMNS = ("start_datetime", "origin", "people_in", "people_out")
+# Filters the daily rollups can answer, they only hold active rows.
+ROLLUP_FILTERS = {
+    "wall_id_filter",
+    "mall_id_filter",
+    "is_active_filter",
+    "origin_filter",
+    "start_datetime_from_filter",
+    "start_datetime_to_filter",
+}
+DAY = sa.literal_column("'day'", sa.String)
 
-class SQLAlchemyFootfallRepository(FootfallRepository):
-    def __init__(self, session: sa.orm.Session):
-        self.session = session
 
+class SQLAlchemyFootfallRepository(SQLAlchemyRepository, FootfallRepository):
     def add(self, footfall: Footfall) -> Footfall:
         try:
             footfall_orm = self._to_orm(footfall)
             self.session.add(footfall_orm)
-            self.session.commit()
+            self.session.flush()
+            self._refresh_rollups([(footfall_orm.wall_id, footfall_orm.start_datetime)])
+            self._commit()
             return self._to_entity(footfall_orm)
         except sa.exc.IntegrityError as e:
             logger.exception(e)
             self.session.rollback()
-            if "footfall_wall_id_fkey" in e.args[0]:
+            constraint_name = self._get_constraint_name(e)
+            if constraint_name == WALL_FOREIGN_KEY:
                 raise WallNotFoundException({"id_filter": footfall.wall_id})
+            if ACTIVE_KEY_COLUMNS in constraint_name:
+                raise FootfallAlreadyExistsException(
+                    {
+                        "wall_id": footfall.wall_id,
+                        "start_datetime": footfall.start_datetime,
+                        "origin": footfall.origin,
+                    }
+                )
             raise DatabaseException
         except sa.exc.SQLAlchemyError as e:
             logger.exception(e)
@@ -56,15 +128,38 @@ class SQLAlchemyFootfallRepository(FootfallRepository):
     ) -> None:
         filter_expressions = self._get_filter_expressions(filters)
         try:
+            # Rows moved to another wall or day leave their previous rollup stale.
+            previous = (
+                self.session.execute(
+                    sa.select(FootfallORM.wall_id, FootfallORM.start_datetime).where(
+                        *filter_expressions
+                    )
+                )
+                .tuples()
+                .all()
+            )
             query = (
                 sa.update(FootfallORM)
                 .where(*filter_expressions)
                 .values(fields_to_update)
+                .returning(FootfallORM.wall_id, FootfallORM.start_datetime)
             )
-            result = self.session.execute(query)
-            self.session.commit()
-            if not result.rowcount and with_error:
+            updated = self.session.execute(query).tuples().all()
+            self._refresh_rollups([*previous, *updated])
+            self._commit()
+            if not updated and with_error:
                 raise FootfallNotFoundException(filters)
+        except sa.exc.IntegrityError as e:
+            self.session.rollback()
+            logger.error(e)
+            constraint_name = self._get_constraint_name(e)
+            if constraint_name == WALL_FOREIGN_KEY:
+                raise WallNotFoundException(
+                    {"id_filter": fields_to_update.get("wall_id")}
+                )
+            if ACTIVE_KEY_COLUMNS in constraint_name:
+                raise FootfallAlreadyExistsException(filters)
+            raise DatabaseException
         except sa.exc.SQLAlchemyError as e:
             self.session.rollback()
             logger.error(e)
@@ -73,32 +168,63 @@ class SQLAlchemyFootfallRepository(FootfallRepository):
     def delete(self, **filters: Any) -> None:
         filter_expressions = self._get_filter_expressions(filters)
         try:
-            query = sa.delete(FootfallORM).where(*filter_expressions)
-            result = self.session.execute(query)
-            self.session.commit()
-            if not result.rowcount:
+            query = (
+                sa.delete(FootfallORM)
+                .where(*filter_expressions)
+                .returning(FootfallORM.wall_id, FootfallORM.start_datetime)
+            )
+            deleted = self.session.execute(query).tuples().all()
+            self._refresh_rollups(deleted)
+            self._commit()
+            if not deleted:
                 raise FootfallNotFoundException(filters)
         except sa.exc.SQLAlchemyError as e:
             self.session.rollback()
             logger.error(e)
             raise DatabaseException
 
-    def get_all(self, page: int = 1, limit: int = 50, **filters: Any) -> list[Footfall]:
-        offset = (page - 1) * limit
+    def get_all(
+        self,
+        page: int = 1,
+        limit: int = 50,
+        cursor: tuple[Any, ...] | None = None,
+        **filters: Any,
+    ) -> list[Footfall]:
         filter_expressions = self._get_filter_expressions(filters)
         try:
-            query = (
-                sa.select(FootfallORM)
-                .where(*filter_expressions)
-                .offset(offset)
-                .limit(limit)
-            )
+            query = self._get_page_query(page, limit, cursor, filter_expressions)
             result = self.session.scalars(query)
             return [self._to_entity(footfall_orm) for footfall_orm in result]
         except sa.exc.SQLAlchemyError as e:
             logger.exception(e)
             raise DatabaseException
 
+    def get_all_with_count(
+        self,
+        page: int = 1,
+        limit: int = 50,
+        cursor: tuple[Any, ...] | None = None,
+        **filters: Any,
+    ) -> tuple[list[Footfall], int]:
+        filter_expressions = self._get_filter_expressions(filters)
+        total_count = (
+            sa.select(sa.func.count())
+            .select_from(FootfallORM)
+            .where(*filter_expressions)
+            .scalar_subquery()
+        )
+        try:
+            query = self._get_page_query(
+                page, limit, cursor, filter_expressions
+            ).add_columns(total_count)
+            rows = self.session.execute(query).all()
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            raise DatabaseException
+        if not rows:
+            return [], self.count(**filters) if cursor or page > 1 else 0
+        return [self._to_entity(row[0]) for row in rows], rows[0][1]
+
     def count(self, **filters: Any) -> int:
         filter_expressions = self._get_filter_expressions(filters)
         try:
@@ -112,21 +238,684 @@ class SQLAlchemyFootfallRepository(FootfallRepository):
             logger.error(e)
             raise DatabaseException
 
-    def add_batch(self, footfalls: list[Footfall]) -> None:
+    def estimate_count(self, **filters: Any) -> int:
+        filter_expressions = self._get_filter_expressions(filters)
+        try:
+            query = sa.select(FootfallORM.id).where(*filter_expressions)
+            return estimate_count(self.session, query)
+        except sa.exc.SQLAlchemyError as e:
+            logger.error(e)
+            raise DatabaseException
+
+    def aggregate(
+        self, bucket: FootfallBucket, group_by: FootfallGroup, **filters: Any
+    ) -> list[FootfallSeries]:
+        query = self._get_aggregate_query(bucket, group_by, filters)
+        try:
+            rows = self.session.execute(query).all()
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            raise DatabaseException
+        series = []
+        for group_id, group_rows in groupby(rows, key=lambda row: row[0]):
+            item = FootfallSeries(id=group_id)
+            for _, start_datetime, people_in, people_out in group_rows:
+                item.start_datetimes.append(start_datetime)
+                item.people_in.append(people_in)
+                item.people_out.append(people_out)
+            series.append(item)
+        return series
+
+    def occupancy(
+        self, group_by: FootfallGroup, daily_reset: bool = False, **filters: Any
+    ) -> list[FootfallOccupancy]:
+        filter_expressions = self._get_filter_expressions(filters)
+        group_column = (
+            WallORM.mall_id if group_by == FootfallGroup.mall else FootfallORM.wall_id
+        )
+        partition_by: list[sa.ColumnExpressionArgument[Any]] = [group_column]
+        if daily_reset:
+            partition_by.append(sa.func.date_trunc(DAY, FootfallORM.start_datetime))
+        # Hours are summed over the walls and origins of each group first, the
+        # running total then adds them up in order.
+        occupancy = sa.func.sum(
+            sa.func.sum(FootfallORM.people_in - FootfallORM.people_out)
+        ).over(partition_by=partition_by, order_by=FootfallORM.start_datetime)
+        query = (
+            sa.select(
+                group_column,
+                FootfallORM.start_datetime,
+                sa.cast(occupancy, sa.BigInteger),
+            )
+            .where(*filter_expressions)
+            .group_by(group_column, FootfallORM.start_datetime)
+            .order_by(group_column, FootfallORM.start_datetime)
+        )
+        if group_by == FootfallGroup.mall:
+            query = query.join(WallORM, WallORM.id == FootfallORM.wall_id)
+        try:
+            rows = self.session.execute(query).all()
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            raise DatabaseException
+        series = []
+        for group_id, group_rows in groupby(rows, key=lambda row: row[0]):
+            item = FootfallOccupancy(id=group_id)
+            for _, start_datetime, value in group_rows:
+                item.start_datetimes.append(start_datetime)
+                item.occupancy.append(value)
+            series.append(item)
+        return series
+
+    def rank(
+        self, walls_limit: int, hours_limit: int, **filters: Any
+    ) -> FootfallRanking:
+        walls_query = self._get_wall_ranking_query(walls_limit, filters)
+        hours_query = self._get_peak_hours_query(hours_limit, filters)
+        ranking = FootfallRanking()
         try:
-            self.session.add_all([self._to_orm(footfall) for footfall in footfalls])
+            walls = self.session.execute(walls_query).all()
+            hours = self.session.execute(hours_query).all()
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            raise DatabaseException
+        for wall_id, traffic in walls:
+            ranking.wall_ids.append(wall_id)
+            ranking.wall_traffic.append(traffic)
+        for mall_id, mall_rows in groupby(hours, key=lambda row: row[0]):
+            item = FootfallPeakHours(id=mall_id)
+            for _, start_datetime, traffic in mall_rows:
+                item.start_datetimes.append(start_datetime)
+                item.traffic.append(traffic)
+            ranking.peak_hours.append(item)
+        return ranking
+
+    def rebuild_rollups(self) -> None:
+        wall_rollup = (
+            sa.select(
+                FootfallORM.wall_id,
+                sa.func.date_trunc(DAY, FootfallORM.start_datetime),
+                FootfallORM.origin,
+                sa.func.sum(FootfallORM.people_in),
+                sa.func.sum(FootfallORM.people_out),
+            )
+            .where(FootfallORM.is_active.is_(True))
+            .group_by(
+                FootfallORM.wall_id,
+                sa.func.date_trunc(DAY, FootfallORM.start_datetime),
+                FootfallORM.origin,
+            )
+        )
+        try:
+            self.session.execute(sa.delete(FootfallDailyMallORM))
+            self.session.execute(sa.delete(FootfallDailyWallORM))
+            self.session.execute(
+                sa.insert(FootfallDailyWallORM).from_select(
+                    ("wall_id", *ROLLUP_COLUMNS), wall_rollup
+                )
+            )
+            self.session.execute(
+                sa.insert(FootfallDailyMallORM).from_select(
+                    ("mall_id", *ROLLUP_COLUMNS), get_mall_rollup_query()
+                )
+            )
             self.session.commit()
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            self.session.rollback()
+            raise DatabaseException
+
+    def _refresh_rollups(
+        self, footfalls: Iterable[tuple[int, datetime]] | sa.Select[Any]
+    ) -> None:
+        # Rollup days are recomputed from the footfalls of every wall and day
+        # touched by a write, then their malls from the wall rollups.
+        if isinstance(footfalls, sa.Select):
+            touched = footfalls
+        else:
+            days = {(wall_id, self._get_day(start)) for wall_id, start in footfalls}
+            if not days:
+                return
+            touched = sa.select(
+                self._get_ranges_values(
+                    [FootfallRange(wall_id, day, day) for wall_id, day in days]
+                )
+            )
+        ranges = touched.cte("touched")
+        first_day = sa.func.date_trunc(DAY, ranges.c.start_datetime)
+        wall_rollup = (
+            sa.select(
+                FootfallORM.wall_id,
+                sa.func.date_trunc(DAY, FootfallORM.start_datetime).label(
+                    "start_datetime"
+                ),
+                FootfallORM.origin,
+                sa.func.sum(FootfallORM.people_in).label("people_in"),
+                sa.func.sum(FootfallORM.people_out).label("people_out"),
+            )
+            .where(
+                FootfallORM.is_active.is_(True),
+                sa.exists().where(
+                    ranges.c.wall_id == FootfallORM.wall_id,
+                    FootfallORM.start_datetime >= first_day,
+                    FootfallORM.start_datetime
+                    < sa.func.date_trunc(DAY, ranges.c.end_datetime)
+                    + timedelta(days=1),
+                ),
+            )
+            .group_by(
+                FootfallORM.wall_id,
+                sa.func.date_trunc(DAY, FootfallORM.start_datetime),
+                FootfallORM.origin,
+            )
+        )
+        self.session.execute(
+            self._get_rollup_upsert_query(
+                FootfallDailyWallORM,
+                wall_rollup,
+                sa.exists().where(
+                    ranges.c.wall_id == FootfallDailyWallORM.wall_id,
+                    FootfallDailyWallORM.start_datetime >= first_day,
+                    FootfallDailyWallORM.start_datetime <= ranges.c.end_datetime,
+                ),
+            )
+        )
+        touched_walls = sa.orm.aliased(WallORM)
+        self.session.execute(
+            self._get_rollup_upsert_query(
+                FootfallDailyMallORM,
+                get_mall_rollup_query().where(
+                    sa.exists().where(
+                        ranges.c.wall_id == touched_walls.id,
+                        touched_walls.mall_id == WallORM.mall_id,
+                        FootfallDailyWallORM.start_datetime >= first_day,
+                        FootfallDailyWallORM.start_datetime <= ranges.c.end_datetime,
+                    )
+                ),
+                sa.exists().where(
+                    ranges.c.wall_id == touched_walls.id,
+                    touched_walls.mall_id == FootfallDailyMallORM.mall_id,
+                    FootfallDailyMallORM.start_datetime >= first_day,
+                    FootfallDailyMallORM.start_datetime <= ranges.c.end_datetime,
+                ),
+            )
+        )
+
+    @staticmethod
+    def _get_rollup_upsert_query(
+        rollup: type[FootfallDailyWallORM] | type[FootfallDailyMallORM],
+        values: sa.Select[Any],
+        touched: sa.Exists,
+    ) -> postgresql.Insert:
+        # Touched rollup rows are upserted from the fresh values, those without
+        # any active footfall left are deleted in the same statement.
+        fresh = values.cte("fresh")
+        key_columns = [column.key for column in rollup.__table__.primary_key]
+        stale = (
+            sa.delete(rollup)
+            .where(
+                touched,
+                ~sa.exists().where(
+                    *(fresh.c[key] == getattr(rollup, key) for key in key_columns)
+                ),
+            )
+            .cte("stale")
+        )
+        query = postgresql.insert(rollup).from_select(
+            list(fresh.c.keys()), sa.select(fresh)
+        )
+        excluded = query.excluded
+        return query.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={
+                "people_in": excluded.people_in,
+                "people_out": excluded.people_out,
+            },
+            where=sa.or_(
+                query.table.c.people_in.is_distinct_from(excluded.people_in),
+                query.table.c.people_out.is_distinct_from(excluded.people_out),
+            ),
+        ).add_cte(stale)
+
+    @classmethod
+    def _get_aggregate_query(
+        cls, bucket: FootfallBucket, group_by: FootfallGroup, filters: dict[str, Any]
+    ) -> sa.Select[Any]:
+        source: (
+            type[FootfallORM] | type[FootfallDailyWallORM] | type[FootfallDailyMallORM]
+        )
+        wall_column: sa.orm.InstrumentedAttribute[int] | None
+        if not cls._can_use_rollups(bucket, filters):
+            source, wall_column = FootfallORM, FootfallORM.wall_id
+            filter_expressions = cls._get_filter_expressions(filters)
+        elif group_by == FootfallGroup.mall and not filters.get("wall_id_filter"):
+            source, wall_column = FootfallDailyMallORM, None
+            filter_expressions = cls._get_rollup_filter_expressions(source, filters)
+        else:
+            source, wall_column = FootfallDailyWallORM, FootfallDailyWallORM.wall_id
+            filter_expressions = cls._get_rollup_filter_expressions(source, filters)
+        if wall_column is None:
+            group_column = FootfallDailyMallORM.mall_id
+        elif group_by == FootfallGroup.mall:
+            group_column = WallORM.mall_id
+        else:
+            group_column = wall_column
+        # The unit is inlined so that the select and group by expressions match.
+        bucket_column = sa.func.date_trunc(
+            sa.literal_column(f"'{bucket}'"), source.start_datetime
+        )
+        query = (
+            sa.select(
+                group_column,
+                bucket_column,
+                sa.func.sum(source.people_in),
+                sa.func.sum(source.people_out),
+            )
+            .where(*filter_expressions)
+            .group_by(group_column, bucket_column)
+            .order_by(group_column, bucket_column)
+        )
+        if group_by == FootfallGroup.mall and wall_column is not None:
+            query = query.join(WallORM, WallORM.id == wall_column)
+        return query
+
+    @classmethod
+    def _get_wall_ranking_query(
+        cls, limit: int, filters: dict[str, Any]
+    ) -> sa.Select[Any]:
+        # Day aligned ranges are summed from the daily rollups.
+        if cls._can_use_rollups(FootfallBucket.day, filters):
+            wall_column = FootfallDailyWallORM.wall_id
+            people = FootfallDailyWallORM.people_in + FootfallDailyWallORM.people_out
+            filter_expressions = cls._get_rollup_filter_expressions(
+                FootfallDailyWallORM, filters
+            )
+        else:
+            wall_column = FootfallORM.wall_id
+            people = FootfallORM.people_in + FootfallORM.people_out
+            filter_expressions = cls._get_filter_expressions(filters)
+        traffic = sa.func.sum(people)
+        return (
+            sa.select(wall_column, traffic)
+            .where(*filter_expressions)
+            .group_by(wall_column)
+            .order_by(traffic.desc(), wall_column)
+            .limit(limit)
+        )
+
+    @classmethod
+    def _get_peak_hours_query(
+        cls, limit: int, filters: dict[str, Any]
+    ) -> sa.Select[Any]:
+        traffic = sa.func.sum(FootfallORM.people_in + FootfallORM.people_out)
+        rank = sa.func.rank().over(
+            partition_by=WallORM.mall_id, order_by=traffic.desc()
+        )
+        hours = (
+            sa.select(
+                WallORM.mall_id,
+                FootfallORM.start_datetime,
+                traffic.label("traffic"),
+                rank.label("rank"),
+            )
+            .join(WallORM, WallORM.id == FootfallORM.wall_id)
+            .where(*cls._get_filter_expressions(filters))
+            .group_by(WallORM.mall_id, FootfallORM.start_datetime)
+            .subquery("hours")
+        )
+        return (
+            sa.select(hours.c.mall_id, hours.c.start_datetime, hours.c.traffic)
+            .where(hours.c.rank <= limit)
+            .order_by(hours.c.mall_id, hours.c.rank, hours.c.start_datetime)
+        )
+
+    @staticmethod
+    def _can_use_rollups(bucket: FootfallBucket, filters: dict[str, Any]) -> bool:
+        if bucket == FootfallBucket.hour or filters.get("is_active_filter") is not True:
+            return False
+        if any(filters[key] for key in filters.keys() - ROLLUP_FILTERS):
+            return False
+        bounds = (
+            filters.get("start_datetime_from_filter"),
+            filters.get("start_datetime_to_filter"),
+        )
+        return all(bound is None or bound.time() == time() for bound in bounds)
+
+    @staticmethod
+    def _get_rollup_filter_expressions(
+        rollup: type[FootfallDailyWallORM] | type[FootfallDailyMallORM],
+        filters: dict[str, Any],
+    ) -> list[ColumnElement[bool]]:
+        filter_expressions = []
+        if issubclass(rollup, FootfallDailyWallORM):
+            if f := filters.get("wall_id_filter"):
+                filter_expressions.append(rollup.wall_id == f)
+            if f := filters.get("mall_id_filter"):
+                walls = sa.select(WallORM.id).where(WallORM.mall_id == f)
+                filter_expressions.append(rollup.wall_id.in_(walls))
+        elif f := filters.get("mall_id_filter"):
+            filter_expressions.append(rollup.mall_id == f)
+        if f := filters.get("origin_filter"):
+            filter_expressions.append(rollup.origin == f)
+        if f := filters.get("start_datetime_from_filter"):
+            filter_expressions.append(rollup.start_datetime >= f)
+        if f := filters.get("start_datetime_to_filter"):
+            filter_expressions.append(rollup.start_datetime < f)
+        return filter_expressions
+
+    @staticmethod
+    def _get_day(value: datetime) -> datetime:
+        return datetime.combine(value.date(), time())
+
+    @staticmethod
+    def _get_page_query(
+        page: int,
+        limit: int,
+        cursor: tuple[Any, ...] | None,
+        filter_expressions: list[ColumnElement[bool]],
+    ) -> sa.Select[tuple[FootfallORM]]:
+        query = (
+            sa.select(FootfallORM)
+            .where(*filter_expressions)
+            .order_by(FootfallORM.start_datetime, FootfallORM.id)
+            .limit(limit)
+        )
+        if cursor:
+            return query.where(
+                sa.tuple_(FootfallORM.start_datetime, FootfallORM.id)
+                > sa.tuple_(*cursor)
+            )
+        return query.offset((page - 1) * limit)
+
+    def add_batch(self, footfalls: list[Footfall] | FootfallBatch) -> None:
+        self.replace_batch(footfalls, ranges=[])
+
+    def replace_batch(
+        self, footfalls: list[Footfall] | FootfallBatch, ranges: list[FootfallRange]
+    ) -> None:
+        if isinstance(footfalls, list):
+            footfalls = FootfallBatch.from_footfalls(footfalls)
+        footfalls = self._deactivate_duplicates(footfalls)
+        try:
+            if ranges:
+                self.session.execute(self._get_invalidate_query(ranges))
+            self._insert_batch(footfalls)
+            touched = self._get_touched_ranges(footfalls, ranges)
+            if touched:
+                self._refresh_rollups(sa.select(self._get_ranges_values(touched)))
+            self._commit()
+        except psycopg2.errors.IntegrityError as e:
+            logger.exception(e)
+            self.session.rollback()
+            constraint_name = self._get_constraint_name(e)
+            if constraint_name == WALL_FOREIGN_KEY:
+                raise WallNotFoundException({"id_filter": "batch_add"})
+            if ACTIVE_KEY_COLUMNS in constraint_name:
+                raise FootfallAlreadyExistsException({"id_filter": "batch_add"})
+            raise DatabaseException
+        except (psycopg2.Error, sa.exc.SQLAlchemyError) as e:
+            logger.exception(e)
+            self.session.rollback()
+            raise DatabaseException
+
+    def _insert_batch(self, footfalls: FootfallBatch) -> None:
+        cursor = self.session.connection().connection.cursor()
+        cursor.copy_expert(COPY_FOOTFALLS_SQL, _CopyBuffer(self._to_rows(footfalls)))
+
+    def get_active_in_ranges(self, ranges: list[FootfallRange]) -> FootfallBatch:
+        batch = FootfallBatch([], [], [], [], [], [], [])
+        if not ranges:
+            return batch
+        ranges_values = self._get_ranges_values(ranges)
+        try:
+            query = sa.select(
+                *(getattr(FootfallORM, column) for column in STAGED_COLUMNS)
+            ).where(
+                FootfallORM.wall_id == ranges_values.c.wall_id,
+                FootfallORM.start_datetime >= ranges_values.c.start_datetime,
+                FootfallORM.start_datetime <= ranges_values.c.end_datetime,
+                FootfallORM.is_active.is_(True),
+            )
+            for row in self.session.execute(query):
+                batch.start_datetimes.append(row.start_datetime)
+                batch.end_datetimes.append(row.end_datetime)
+                batch.people_in.append(row.people_in)
+                batch.people_out.append(row.people_out)
+                batch.is_active.append(row.is_active)
+                batch.origins.append(row.origin)
+                batch.wall_ids.append(row.wall_id)
+            return batch
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            raise DatabaseException
+
+    def count_active_in_ranges(self, ranges: list[FootfallRange]) -> int:
+        if not ranges:
+            return 0
+        ranges_values = self._get_ranges_values(ranges)
+        try:
+            query = (
+                sa.select(sa.func.count())
+                .select_from(FootfallORM)
+                .where(
+                    FootfallORM.wall_id == ranges_values.c.wall_id,
+                    FootfallORM.start_datetime >= ranges_values.c.start_datetime,
+                    FootfallORM.start_datetime <= ranges_values.c.end_datetime,
+                    FootfallORM.is_active.is_(True),
+                )
+            )
+            return self.session.scalar(query) or 0
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            raise DatabaseException
+
+    def stage_batch(
+        self,
+        staging_key: str,
+        footfalls: FootfallBatch,
+        import_job_id: int | None = None,
+    ) -> None:
+        try:
+            self._copy_staged(staging_key, footfalls, import_job_id)
+            self.session.commit()
+        except (psycopg2.Error, sa.exc.SQLAlchemyError) as e:
+            logger.exception(e)
+            self.session.rollback()
+            raise DatabaseException
+
+    def upsert_batch(self, footfalls: FootfallBatch) -> None:
+        staging_key = uuid.uuid4().hex
+        try:
+            self._copy_staged(staging_key, footfalls)
+            self._apply_staged(staging_key, ImportStrategy.upsert)
+            self._commit()
         except sa.exc.IntegrityError as e:
             logger.exception(e)
             self.session.rollback()
-            if "footfall_wall_id_fkey" in e.args[0]:
+            if self._get_constraint_name(e) == WALL_FOREIGN_KEY:
                 raise WallNotFoundException({"id_filter": "batch_add"})
             raise DatabaseException
+        except (psycopg2.Error, sa.exc.SQLAlchemyError) as e:
+            logger.exception(e)
+            self.session.rollback()
+            raise DatabaseException
+
+    def apply_staged(
+        self, staging_key: str, strategy: ImportStrategy = ImportStrategy.history
+    ) -> None:
+        try:
+            self._apply_staged(staging_key, strategy)
+            self._commit()
+        except sa.exc.IntegrityError as e:
+            logger.exception(e)
+            self.session.rollback()
+            if self._get_constraint_name(e) == WALL_FOREIGN_KEY:
+                raise WallNotFoundException({"id_filter": "batch_add"})
+            raise DatabaseException
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            self.session.rollback()
+            raise DatabaseException
+
+    def _copy_staged(
+        self,
+        staging_key: str,
+        footfalls: FootfallBatch,
+        import_job_id: int | None = None,
+    ) -> None:
+        cursor = self.session.connection().connection.cursor()
+        import_job_value = COPY_NULL if import_job_id is None else str(import_job_id)
+        cursor.copy_expert(
+            COPY_FOOTFALL_STAGING_SQL,
+            _CopyBuffer(self._to_rows(footfalls, staging_key, import_job_value)),
+        )
+
+    def _apply_staged(self, staging_key: str, strategy: ImportStrategy) -> None:
+        staged = sa.select(
+            *(getattr(FootfallStagingORM, column) for column in STAGED_COLUMNS)
+        ).where(FootfallStagingORM.staging_key == staging_key)
+        if strategy == ImportStrategy.upsert:
+            self.session.execute(self._get_upsert_query(staged))
+        else:
+            self.session.execute(self._get_invalidate_staged_query(staging_key))
+            self.session.execute(
+                sa.insert(FootfallORM).from_select(STAGED_COLUMNS, staged)
+            )
+        self._refresh_rollups(self._get_staged_ranges_query(staging_key))
+        self.session.execute(
+            sa.delete(FootfallStagingORM).where(
+                FootfallStagingORM.staging_key == staging_key
+            )
+        )
+
+    @staticmethod
+    def _get_touched_ranges(
+        batch: FootfallBatch, ranges: list[FootfallRange]
+    ) -> list[FootfallRange]:
+        firsts: dict[int, datetime] = {}
+        lasts: dict[int, datetime] = {}
+        values = chain(
+            zip(batch.wall_ids, batch.start_datetimes),
+            ((r.wall_id, r.start_datetime) for r in ranges),
+            ((r.wall_id, r.end_datetime) for r in ranges),
+        )
+        for wall_id, value in values:
+            if value < firsts.setdefault(wall_id, value):
+                firsts[wall_id] = value
+            if value > lasts.setdefault(wall_id, value):
+                lasts[wall_id] = value
+        return [
+            FootfallRange(
+                wall_id=wall_id, start_datetime=first, end_datetime=lasts[wall_id]
+            )
+            for wall_id, first in firsts.items()
+        ]
+
+    @staticmethod
+    def _get_upsert_query(staged: sa.Select[Any]) -> postgresql.Insert:
+        query = postgresql.insert(FootfallORM).from_select(STAGED_COLUMNS, staged)
+        excluded = query.excluded
+        return query.on_conflict_do_update(
+            index_elements=["wall_id", "start_datetime", "origin"],
+            index_where=sa.text("is_active"),
+            set_={
+                "end_datetime": excluded.end_datetime,
+                "people_in": excluded.people_in,
+                "people_out": excluded.people_out,
+            },
+            where=sa.or_(
+                FootfallORM.end_datetime.is_distinct_from(excluded.end_datetime),
+                FootfallORM.people_in.is_distinct_from(excluded.people_in),
+                FootfallORM.people_out.is_distinct_from(excluded.people_out),
+            ),
+        )
+
+    def discard_staged(self, staging_key: str) -> None:
+        try:
+            self.session.execute(
+                sa.delete(FootfallStagingORM).where(
+                    FootfallStagingORM.staging_key == staging_key
+                )
+            )
+            self.session.commit()
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            self.session.rollback()
+            raise DatabaseException
+
+    def purge_staged(self, import_job_id: int | None = None) -> int:
+        # Staged rows are only discarded by the process that staged them, a
+        # killed worker leaves them behind. They are purged for a job that
+        # starts again, or for every job that is no longer running.
+        if import_job_id is None:
+            condition = ~sa.exists().where(
+                ImportJobORM.id == FootfallStagingORM.import_job_id,
+                ImportJobORM.status == ImportJobStatus.running,
+            )
+        else:
+            condition = FootfallStagingORM.import_job_id == import_job_id
+        try:
+            result = self.session.execute(
+                sa.delete(FootfallStagingORM).where(
+                    FootfallStagingORM.import_job_id.is_not(None), condition
+                )
+            )
+            self._commit()
+            return result.rowcount
         except sa.exc.SQLAlchemyError as e:
             logger.exception(e)
             self.session.rollback()
             raise DatabaseException
 
+    @staticmethod
+    def _get_staged_ranges_query(staging_key: str) -> sa.Select[Any]:
+        return (
+            sa.select(
+                FootfallStagingORM.wall_id,
+                sa.func.min(FootfallStagingORM.start_datetime).label("start_datetime"),
+                sa.func.max(FootfallStagingORM.start_datetime).label("end_datetime"),
+            )
+            .where(FootfallStagingORM.staging_key == staging_key)
+            .group_by(FootfallStagingORM.wall_id)
+        )
+
+    @classmethod
+    def _get_invalidate_staged_query(cls, staging_key: str) -> sa.Update:
+        ranges = cls._get_staged_ranges_query(staging_key).subquery("ranges")
+        return (
+            sa.update(FootfallORM)
+            .where(
+                FootfallORM.wall_id == ranges.c.wall_id,
+                FootfallORM.start_datetime >= ranges.c.start_datetime,
+                FootfallORM.start_datetime <= ranges.c.end_datetime,
+                FootfallORM.is_active.is_(True),
+            )
+            .values(is_active=False)
+        )
+
+    @staticmethod
+    def _get_ranges_values(ranges: list[FootfallRange]) -> sa.Values:
+        return sa.values(
+            sa.column("wall_id", sa.Integer),
+            sa.column("start_datetime", sa.DateTime),
+            sa.column("end_datetime", sa.DateTime),
+            name="ranges",
+        ).data([(r.wall_id, r.start_datetime, r.end_datetime) for r in ranges])
+
+    @classmethod
+    def _get_invalidate_query(cls, ranges: list[FootfallRange]) -> sa.Update:
+        ranges_values = cls._get_ranges_values(ranges)
+        return (
+            sa.update(FootfallORM)
+            .where(
+                FootfallORM.wall_id == ranges_values.c.wall_id,
+                FootfallORM.start_datetime >= ranges_values.c.start_datetime,
+                FootfallORM.start_datetime <= ranges_values.c.end_datetime,
+                FootfallORM.is_active.is_(True),
+            )
+            .values(is_active=False)
+        )
+
     @staticmethod
     def _get_filter_expressions(filters: dict[str, Any]) -> list[ColumnElement[bool]]:
         filter_expressions = []
@@ -134,6 +923,9 @@ class SQLAlchemyFootfallRepository(FootfallRepository):
             filter_expressions.append(FootfallORM.id == f)
         if f := filters.get("wall_id_filter"):
             filter_expressions.append(FootfallORM.wall_id == f)
+        if f := filters.get("mall_id_filter"):
+            walls = sa.select(WallORM.id).where(WallORM.mall_id == f)
+            filter_expressions.append(FootfallORM.wall_id.in_(walls))
         if (f := filters.get("is_active_filter")) is not None:
             filter_expressions.append(FootfallORM.is_active == f)
         if f := filters.get("origin_filter"):
@@ -144,6 +936,10 @@ class SQLAlchemyFootfallRepository(FootfallRepository):
                 FootfallORM.start_datetime <= f[1],
             )
             filter_expressions.append(condition)
+        if f := filters.get("start_datetime_from_filter"):
+            filter_expressions.append(FootfallORM.start_datetime >= f)
+        if f := filters.get("start_datetime_to_filter"):
+            filter_expressions.append(FootfallORM.start_datetime < f)
         return filter_expressions
 
     @staticmethod
@@ -178,3 +974,72 @@ class SQLAlchemyFootfallRepository(FootfallRepository):
             origin=footfall.origin,
             wall_id=footfall.wall_id,
         )
+
+    @staticmethod
+    def _deactivate_duplicates(batch: FootfallBatch) -> FootfallBatch:
+        # Only the last active version of a wall, hour and origin stays active, as
+        # a history import of the rows one after the other would leave them.
+        last_active = {
+            key: index
+            for index, (key, is_active) in enumerate(
+                zip(
+                    zip(batch.wall_ids, batch.start_datetimes, batch.origins),
+                    batch.is_active,
+                )
+            )
+            if is_active
+        }
+        if len(last_active) == sum(batch.is_active):
+            return batch
+        active_indexes = set(last_active.values())
+        return replace(
+            batch,
+            is_active=[index in active_indexes for index in range(len(batch))],
+        )
+
+    @staticmethod
+    def _get_constraint_name(error: sa.exc.DBAPIError | psycopg2.Error) -> str:
+        if isinstance(error, sa.exc.DBAPIError):
+            if not isinstance(error.orig, psycopg2.Error):
+                return ""
+            error = error.orig
+        return error.diag.constraint_name or ""
+
+    @staticmethod
+    def _to_rows(batch: FootfallBatch, *extra_values: str) -> Iterator[str]:
+        columns = zip(
+            batch.start_datetimes,
+            batch.end_datetimes,
+            batch.people_in,
+            batch.people_out,
+            batch.is_active,
+            batch.origins,
+            batch.wall_ids,
+        )
+        extra = "".join(f"\t{value}" for value in extra_values)
+        for start, end, people_in, people_out, is_active, origin, wall_id in columns:
+            yield (
+                f"{start.isoformat()}\t{end.isoformat()}\t{people_in}\t{people_out}\t"
+                f"{'t' if is_active else 'f'}\t{origin}\t{wall_id}{extra}\n"
+            )
+
+
+class _CopyBuffer:
+    def __init__(self, rows: Iterable[str]):
+        self._rows = iter(rows)
+        self._buffer = ""
+
+    def read(self, size: int = -1) -> str:
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        for row in self._rows:
+            chunks.append(row)
+            length += len(row)
+            if 0 <= size <= length:
+                break
+        data = "".join(chunks)
+        if size < 0:
+            self._buffer = ""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
@@ -0,0 +1,53 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Iterator
+
+from adapters.exceptions import ImportJobNotFoundException
+from domain.entities.import_job import ImportJob, ImportJobStatus
+from ports.repositories.import_job_repository import ImportJobRepository
+
+
+class MockImportJobRepository(ImportJobRepository):
+    def __init__(self, import_jobs: list[ImportJob] | None = None):
+        self.import_jobs = {
+            import_job.id: import_job for import_job in import_jobs or []
+        }
+
+    @contextmanager
+    def atomic(self) -> Iterator[None]:
+        yield
+
+    def add(self, import_job: ImportJob) -> ImportJob:
+        import_job.id = len(self.import_jobs) + 1
+        self.import_jobs[import_job.id] = import_job
+        return import_job
+
+    def get(self, **filters: Any) -> ImportJob:
+        return self.import_jobs[filters["id_filter"]]
+
+    def update(self, fields_to_update: dict[str, Any], **filters: Any) -> None:
+        import_job = self.import_jobs[filters["id_filter"]]
+        if (f := filters.get("status_filter")) and import_job.status != f:
+            raise ImportJobNotFoundException(filters)
+        if (f := filters.get("claimed_before_filter")) and not (
+            import_job.claimed_at and import_job.claimed_at < f
+        ):
+            raise ImportJobNotFoundException(filters)
+        if (f := filters.get("started_at_filter")) and import_job.started_at != f:
+            raise ImportJobNotFoundException(filters)
+        for key, value in fields_to_update.items():
+            setattr(import_job, key, value)
+
+    def claim_next(self, lease: timedelta) -> ImportJob | None:
+        now = datetime.now()
+        for import_job in self.import_jobs.values():
+            if import_job.status == ImportJobStatus.pending or (
+                import_job.status == ImportJobStatus.running
+                and import_job.claimed_at is not None
+                and import_job.claimed_at < now - lease
+            ):
+                import_job.status = ImportJobStatus.running
+                import_job.started_at = now
+                import_job.claimed_at = now
+                return import_job
+        return None
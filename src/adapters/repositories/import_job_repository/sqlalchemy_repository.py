@@ -0,0 +1,182 @@
+import logging
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.sql.expression import ColumnElement
+
+from adapters.exceptions import DatabaseException, ImportJobNotFoundException
+from adapters.repositories.models import ImportJobORM
+from adapters.repositories.sqlalchemy_repository import SQLAlchemyRepository
+from domain.entities.footfall_import import (
+    FootfallImportError,
+    FootfallImportStage,
+    FootfallImportStats,
+)
+from domain.entities.import_job import ImportJob, ImportJobStatus
+from ports.repositories.import_job_repository import ImportJobRepository
+
+logger = logging.getLogger()
+
+
+class SQLAlchemyImportJobRepository(SQLAlchemyRepository, ImportJobRepository):
+    def add(self, import_job: ImportJob) -> ImportJob:
+        try:
+            import_job_orm = self._to_orm(import_job)
+            self.session.add(import_job_orm)
+            self.session.flush()
+            self._commit()
+            return self._to_entity(import_job_orm)
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            self.session.rollback()
+            raise DatabaseException
+
+    def get(self, **filters: Any) -> ImportJob:
+        filter_expressions = self._get_filter_expressions(filters)
+        try:
+            query = sa.select(ImportJobORM).where(*filter_expressions)
+            import_job_orm = self.session.scalar(query)
+            if not import_job_orm:
+                raise ImportJobNotFoundException(filters)
+            return self._to_entity(import_job_orm)
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            raise DatabaseException
+
+    def update(self, fields_to_update: dict[str, Any], **filters: Any) -> None:
+        filter_expressions = self._get_filter_expressions(filters)
+        if "errors" in fields_to_update:
+            fields_to_update = {
+                **fields_to_update,
+                "errors": [asdict(error) for error in fields_to_update["errors"]],
+            }
+        if fields_to_update.get("stats") is not None:
+            fields_to_update = {
+                **fields_to_update,
+                "stats": asdict(fields_to_update["stats"]),
+            }
+        try:
+            query = (
+                sa.update(ImportJobORM)
+                .where(*filter_expressions)
+                .values(fields_to_update)
+            )
+            result = self.session.execute(query)
+            self._commit()
+            if not result.rowcount:
+                raise ImportJobNotFoundException(filters)
+        except sa.exc.SQLAlchemyError as e:
+            self.session.rollback()
+            logger.error(e)
+            raise DatabaseException
+
+    def claim_next(self, lease: timedelta) -> ImportJob | None:
+        now = datetime.now()
+        try:
+            # A running job whose claim was not renewed within the lease belongs
+            # to a worker that died, it is claimed again.
+            query = (
+                sa.select(ImportJobORM)
+                .where(
+                    sa.or_(
+                        ImportJobORM.status == ImportJobStatus.pending,
+                        sa.and_(
+                            ImportJobORM.status == ImportJobStatus.running,
+                            ImportJobORM.claimed_at < now - lease,
+                        ),
+                    )
+                )
+                .order_by(ImportJobORM.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            import_job_orm = self.session.scalar(query)
+            if not import_job_orm:
+                self.session.rollback()
+                return None
+            if import_job_orm.status == ImportJobStatus.running:
+                logger.warning("Reclaiming import job %s", import_job_orm.id)
+            import_job_orm.status = ImportJobStatus.running
+            import_job_orm.started_at = now
+            import_job_orm.claimed_at = now
+            self.session.commit()
+            return self._to_entity(import_job_orm)
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            self.session.rollback()
+            raise DatabaseException
+
+    @staticmethod
+    def _get_filter_expressions(filters: dict[str, Any]) -> list[ColumnElement[bool]]:
+        filter_expressions = []
+        if f := filters.get("id_filter"):
+            filter_expressions.append(ImportJobORM.id == f)
+        if f := filters.get("status_filter"):
+            filter_expressions.append(ImportJobORM.status == f)
+        if f := filters.get("claimed_before_filter"):
+            filter_expressions.append(ImportJobORM.claimed_at < f)
+        if f := filters.get("started_at_filter"):
+            filter_expressions.append(ImportJobORM.started_at == f)
+        return filter_expressions
+
+    @staticmethod
+    def _to_entity(import_job_orm: ImportJobORM) -> ImportJob:
+        return ImportJob(
+            id=import_job_orm.id,
+            file_path=import_job_orm.file_path,
+            file_format=import_job_orm.file_format,
+            compression=import_job_orm.compression,
+            dry_run=import_job_orm.dry_run,
+            strategy=import_job_orm.strategy,
+            status=import_job_orm.status,
+            rows_processed=import_job_orm.rows_processed,
+            walls_processed=import_job_orm.walls_processed,
+            rows_superseded=import_job_orm.rows_superseded,
+            rows_unchanged=import_job_orm.rows_unchanged,
+            rows_changed=import_job_orm.rows_changed,
+            rows_new=import_job_orm.rows_new,
+            details=import_job_orm.details,
+            errors=[FootfallImportError(**error) for error in import_job_orm.errors],
+            stats=SQLAlchemyImportJobRepository._to_stats(import_job_orm.stats),
+            created_at=import_job_orm.created_at,
+            started_at=import_job_orm.started_at,
+            claimed_at=import_job_orm.claimed_at,
+            finished_at=import_job_orm.finished_at,
+        )
+
+    @staticmethod
+    def _to_orm(import_job: ImportJob) -> ImportJobORM:
+        return ImportJobORM(
+            id=import_job.id,
+            file_path=import_job.file_path,
+            file_format=import_job.file_format,
+            compression=import_job.compression,
+            dry_run=import_job.dry_run,
+            strategy=import_job.strategy,
+            status=import_job.status,
+            rows_processed=import_job.rows_processed,
+            walls_processed=import_job.walls_processed,
+            rows_superseded=import_job.rows_superseded,
+            rows_unchanged=import_job.rows_unchanged,
+            rows_changed=import_job.rows_changed,
+            rows_new=import_job.rows_new,
+            details=import_job.details,
+            errors=[asdict(error) for error in import_job.errors],
+            stats=asdict(import_job.stats) if import_job.stats else None,
+            created_at=import_job.created_at,
+            started_at=import_job.started_at,
+            claimed_at=import_job.claimed_at,
+            finished_at=import_job.finished_at,
+        )
+
+    @staticmethod
+    def _to_stats(stats: dict[str, Any] | None) -> FootfallImportStats | None:
+        if stats is None:
+            return None
+        stages = {
+            name: FootfallImportStage(**stage)
+            for name, stage in stats["stages"].items()
+        }
+        return FootfallImportStats(**{**stats, "stages": stages})
@@ -0,0 +1,45 @@
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from adapters.exceptions import ImportLedgerEntryNotFoundException
+from domain.entities.import_ledger import ImportLedgerEntry
+from ports.repositories.import_ledger_repository import ImportLedgerRepository
+
+
+class MockImportLedgerRepository(ImportLedgerRepository):
+    def __init__(self, entries: list[ImportLedgerEntry] | None = None):
+        self.entries = {entry.id: entry for entry in entries or []}
+
+    @contextmanager
+    def atomic(self) -> Iterator[None]:
+        yield
+
+    def add(self, entry: ImportLedgerEntry) -> ImportLedgerEntry:
+        entry.id = len(self.entries) + 1
+        self.entries[entry.id] = entry
+        return entry
+
+    def get(self, **filters: Any) -> ImportLedgerEntry:
+        for entry in self.entries.values():
+            if self._matches(entry, filters):
+                return entry
+        raise ImportLedgerEntryNotFoundException(filters)
+
+    def update(self, fields_to_update: dict[str, Any], **filters: Any) -> None:
+        entry = self.entries[filters["id_filter"]]
+        if not self._matches(entry, filters):
+            raise ImportLedgerEntryNotFoundException(filters)
+        for key, value in fields_to_update.items():
+            setattr(entry, key, value)
+
+    @staticmethod
+    def _matches(entry: ImportLedgerEntry, filters: dict[str, Any]) -> bool:
+        if (f := filters.get("id_filter")) and entry.id != f:
+            return False
+        if (f := filters.get("content_hash_filter")) and entry.content_hash != f:
+            return False
+        if (f := filters.get("idempotency_key_filter")) and entry.idempotency_key != f:
+            return False
+        if (f := filters.get("import_job_id_filter")) and entry.import_job_id != f:
+            return False
+        return True
@@ -0,0 +1,99 @@
+import logging
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.sql.expression import ColumnElement
+
+from adapters.exceptions import (
+    DatabaseException,
+    ImportLedgerEntryAlreadyExistsException,
+    ImportLedgerEntryNotFoundException,
+)
+from adapters.repositories.models import ImportLedgerORM
+from adapters.repositories.sqlalchemy_repository import SQLAlchemyRepository
+from domain.entities.import_ledger import ImportLedgerEntry
+from ports.repositories.import_ledger_repository import ImportLedgerRepository
+
+logger = logging.getLogger()
+
+
+class SQLAlchemyImportLedgerRepository(SQLAlchemyRepository, ImportLedgerRepository):
+    def add(self, entry: ImportLedgerEntry) -> ImportLedgerEntry:
+        try:
+            entry_orm = self._to_orm(entry)
+            self.session.add(entry_orm)
+            self.session.flush()
+            self._commit()
+            return self._to_entity(entry_orm)
+        except sa.exc.IntegrityError as e:
+            logger.exception(e)
+            self.session.rollback()
+            raise ImportLedgerEntryAlreadyExistsException(
+                {"content_hash": entry.content_hash}
+            )
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            self.session.rollback()
+            raise DatabaseException
+
+    def get(self, **filters: Any) -> ImportLedgerEntry:
+        filter_expressions = self._get_filter_expressions(filters)
+        try:
+            query = sa.select(ImportLedgerORM).where(*filter_expressions)
+            entry_orm = self.session.scalar(query)
+            if not entry_orm:
+                raise ImportLedgerEntryNotFoundException(filters)
+            return self._to_entity(entry_orm)
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            raise DatabaseException
+
+    def update(self, fields_to_update: dict[str, Any], **filters: Any) -> None:
+        filter_expressions = self._get_filter_expressions(filters)
+        try:
+            query = (
+                sa.update(ImportLedgerORM)
+                .where(*filter_expressions)
+                .values(fields_to_update)
+            )
+            result = self.session.execute(query)
+            self._commit()
+            if not result.rowcount:
+                raise ImportLedgerEntryNotFoundException(filters)
+        except sa.exc.SQLAlchemyError as e:
+            self.session.rollback()
+            logger.error(e)
+            raise DatabaseException
+
+    @staticmethod
+    def _get_filter_expressions(filters: dict[str, Any]) -> list[ColumnElement[bool]]:
+        filter_expressions = []
+        if f := filters.get("id_filter"):
+            filter_expressions.append(ImportLedgerORM.id == f)
+        if f := filters.get("content_hash_filter"):
+            filter_expressions.append(ImportLedgerORM.content_hash == f)
+        if f := filters.get("idempotency_key_filter"):
+            filter_expressions.append(ImportLedgerORM.idempotency_key == f)
+        if f := filters.get("import_job_id_filter"):
+            filter_expressions.append(ImportLedgerORM.import_job_id == f)
+        return filter_expressions
+
+    @staticmethod
+    def _to_entity(entry_orm: ImportLedgerORM) -> ImportLedgerEntry:
+        return ImportLedgerEntry(
+            id=entry_orm.id,
+            content_hash=entry_orm.content_hash,
+            import_job_id=entry_orm.import_job_id,
+            idempotency_key=entry_orm.idempotency_key,
+            created_at=entry_orm.created_at,
+        )
+
+    @staticmethod
+    def _to_orm(entry: ImportLedgerEntry) -> ImportLedgerORM:
+        return ImportLedgerORM(
+            id=entry.id,
+            content_hash=entry.content_hash,
+            import_job_id=entry.import_job_id,
+            idempotency_key=entry.idempotency_key,
+            created_at=entry.created_at,
+        )
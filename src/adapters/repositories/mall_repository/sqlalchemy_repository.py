@@ -6,6 +6,7 @@ from sqlalchemy.sql.expression import ColumnElement
 
 from adapters.exceptions import DatabaseException, MallNotFoundException
 from adapters.repositories.models import MallORM
+from adapters.repositories.utils import estimate_count
 from domain.entities.mall import Mall
 from ports.repositories.mall_repository import MallRepository
 
@@ -67,22 +68,48 @@ class SQLAlchemyMallRepository(MallRepository):
             logger.error(e)
             raise DatabaseException
 
-    def get_all(self, page: int = 1, limit: int = 50, **filters: Any) -> list[Mall]:
-        offset = (page - 1) * limit
+    def get_all(
+        self,
+        page: int = 1,
+        limit: int = 50,
+        cursor: tuple[Any, ...] | None = None,
+        **filters: Any,
+    ) -> list[Mall]:
         filter_expressions = self._get_filter_expressions(filters)
         try:
-            query = (
-                sa.select(MallORM)
-                .where(*filter_expressions)
-                .offset(offset)
-                .limit(limit)
-            )
+            query = self._get_page_query(page, limit, cursor, filter_expressions)
             result = self.session.scalars(query)
             return [Mall(id=mall_orm.id, name=mall_orm.name) for mall_orm in result]
         except sa.exc.SQLAlchemyError as e:
             logger.exception(e)
             raise DatabaseException
 
+    def get_all_with_count(
+        self,
+        page: int = 1,
+        limit: int = 50,
+        cursor: tuple[Any, ...] | None = None,
+        **filters: Any,
+    ) -> tuple[list[Mall], int]:
+        filter_expressions = self._get_filter_expressions(filters)
+        total_count = (
+            sa.select(sa.func.count())
+            .select_from(MallORM)
+            .where(*filter_expressions)
+            .scalar_subquery()
+        )
+        try:
+            query = self._get_page_query(
+                page, limit, cursor, filter_expressions
+            ).add_columns(total_count)
+            rows = self.session.execute(query).all()
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            raise DatabaseException
+        if not rows:
+            return [], self.count(**filters) if cursor or page > 1 else 0
+        return [Mall(id=row[0].id, name=row[0].name) for row in rows], rows[0][1]
+
     def count(self, **filters: Any) -> int:
         filter_expressions = self._get_filter_expressions(filters)
         try:
@@ -96,6 +123,32 @@ class SQLAlchemyMallRepository(MallRepository):
             logger.error(e)
             raise DatabaseException
 
+    def estimate_count(self, **filters: Any) -> int:
+        filter_expressions = self._get_filter_expressions(filters)
+        try:
+            query = sa.select(MallORM.id).where(*filter_expressions)
+            return estimate_count(self.session, query)
+        except sa.exc.SQLAlchemyError as e:
+            logger.error(e)
+            raise DatabaseException
+
+    @staticmethod
+    def _get_page_query(
+        page: int,
+        limit: int,
+        cursor: tuple[Any, ...] | None,
+        filter_expressions: list[ColumnElement[bool]],
+    ) -> sa.Select[tuple[MallORM]]:
+        query = (
+            sa.select(MallORM)
+            .where(*filter_expressions)
+            .order_by(MallORM.id)
+            .limit(limit)
+        )
+        if cursor:
+            return query.where(MallORM.id > cursor[0])
+        return query.offset((page - 1) * limit)
+
     @staticmethod
     def _get_filter_expressions(filters: dict[str, Any]) -> list[ColumnElement[bool]]:
         filter_expressions = []
@@ -1,9 +1,13 @@
+import re
 from datetime import datetime
+from typing import Any
 
 import sqlalchemy as sa
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 from domain.entities.footfall import OriginType
+from domain.entities.footfall_import import Compression, FileFormat, ImportStrategy
+from domain.entities.import_job import ImportJobStatus
 
 
 class Base(DeclarativeBase):
@@ -19,6 +23,7 @@ class MallORM(Base):
 
 class WallORM(Base):
     __tablename__ = "wall"
+    __table_args__ = (sa.Index("ix_wall_mall_id", "mall_id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str]
@@ -28,9 +33,30 @@ class WallORM(Base):
 
 class FootfallORM(Base):
     __tablename__ = "footfall"
+    __table_args__ = (
+        sa.Index(
+            "uq_footfall_active_wall_id_start_datetime_origin",
+            "wall_id",
+            "start_datetime",
+            "origin",
+            unique=True,
+            postgresql_where=sa.text("is_active"),
+        ),
+        sa.Index("ix_footfall_start_datetime_id", "start_datetime", "id"),
+        sa.Index(
+            "ix_footfall_wall_id_start_datetime_id", "wall_id", "start_datetime", "id"
+        ),
+        sa.Index(
+            "ix_footfall_active_start_datetime_id",
+            "start_datetime",
+            "id",
+            postgresql_where=sa.text("is_active"),
+        ),
+        {"postgresql_partition_by": "RANGE (start_datetime)"},
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    start_datetime: Mapped[datetime]
+    start_datetime: Mapped[datetime] = mapped_column(primary_key=True)
     end_datetime: Mapped[datetime]
     people_in: Mapped[int]
     people_out: Mapped[int]
@@ -38,3 +64,97 @@ class FootfallORM(Base):
     origin: Mapped[OriginType]
     wall_id: Mapped[int] = mapped_column(sa.ForeignKey("wall.id", ondelete="CASCADE"))
     wall: Mapped["WallORM"] = relationship(lazy="joined")
+
+
+# Monthly partitions are managed by the footfall partition maintenance; rows
+# outside of them land in the default partition.
+FOOTFALL_PARTITION_PATTERN = re.compile(r"footfall_(\d{4}_\d{2}|default)")
+sa.event.listen(
+    FootfallORM.__table__,
+    "after_create",
+    sa.DDL("CREATE TABLE footfall_default PARTITION OF footfall DEFAULT"),  # type: ignore[no-untyped-call]
+)
+
+
+class FootfallDailyWallORM(Base):
+    __tablename__ = "footfall_daily_wall"
+
+    wall_id: Mapped[int] = mapped_column(
+        sa.ForeignKey("wall.id", ondelete="CASCADE"), primary_key=True
+    )
+    start_datetime: Mapped[datetime] = mapped_column(primary_key=True)
+    origin: Mapped[OriginType] = mapped_column(primary_key=True)
+    people_in: Mapped[int]
+    people_out: Mapped[int]
+
+
+class FootfallDailyMallORM(Base):
+    __tablename__ = "footfall_daily_mall"
+
+    mall_id: Mapped[int] = mapped_column(
+        sa.ForeignKey("mall.id", ondelete="CASCADE"), primary_key=True
+    )
+    start_datetime: Mapped[datetime] = mapped_column(primary_key=True)
+    origin: Mapped[OriginType] = mapped_column(primary_key=True)
+    people_in: Mapped[int]
+    people_out: Mapped[int]
+
+
+class FootfallStagingORM(Base):
+    __tablename__ = "footfall_staging"
+    __table_args__ = (
+        sa.Index("ix_footfall_staging_staging_key", "staging_key"),
+        sa.Index("ix_footfall_staging_import_job_id", "import_job_id"),
+        {"prefixes": ["UNLOGGED"]},
+    )
+
+    id: Mapped[int] = mapped_column(sa.BigInteger, primary_key=True)
+    staging_key: Mapped[str] = mapped_column(sa.String(32))
+    # Not a foreign key, so staging COPYs do not check every row against it.
+    import_job_id: Mapped[int | None]
+    start_datetime: Mapped[datetime]
+    end_datetime: Mapped[datetime]
+    people_in: Mapped[int]
+    people_out: Mapped[int]
+    is_active: Mapped[bool]
+    origin: Mapped[OriginType]
+    wall_id: Mapped[int]
+
+
+class ImportJobORM(Base):
+    __tablename__ = "import_job"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    file_path: Mapped[str]
+    file_format: Mapped[FileFormat] = mapped_column(server_default=FileFormat.csv)
+    compression: Mapped[Compression | None]
+    dry_run: Mapped[bool] = mapped_column(server_default=sa.false())
+    strategy: Mapped[ImportStrategy] = mapped_column(
+        server_default=ImportStrategy.history
+    )
+    status: Mapped[ImportJobStatus]
+    rows_processed: Mapped[int]
+    walls_processed: Mapped[int]
+    rows_superseded: Mapped[int] = mapped_column(server_default="0")
+    rows_unchanged: Mapped[int] = mapped_column(server_default="0")
+    rows_changed: Mapped[int] = mapped_column(server_default="0")
+    rows_new: Mapped[int] = mapped_column(server_default="0")
+    details: Mapped[str | None]
+    errors: Mapped[list[dict[str, Any]]] = mapped_column(sa.JSON)
+    stats: Mapped[dict[str, Any] | None] = mapped_column(sa.JSON)
+    created_at: Mapped[datetime] = mapped_column(server_default=sa.func.now())
+    started_at: Mapped[datetime | None]
+    claimed_at: Mapped[datetime | None]
+    finished_at: Mapped[datetime | None]
+
+
+class ImportLedgerORM(Base):
+    __tablename__ = "import_ledger"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    content_hash: Mapped[str] = mapped_column(sa.String(64), unique=True)
+    idempotency_key: Mapped[str | None] = mapped_column(sa.String(255), unique=True)
+    import_job_id: Mapped[int] = mapped_column(
+        sa.ForeignKey("import_job.id", ondelete="CASCADE")
+    )
+    created_at: Mapped[datetime] = mapped_column(server_default=sa.func.now())
@@ -0,0 +1,43 @@
+import logging
+from contextlib import contextmanager
+from typing import Iterator
+
+import sqlalchemy as sa
+
+from adapters.exceptions import DatabaseException
+
+logger = logging.getLogger()
+
+ATOMIC_KEY = "atomic"
+
+
+class SQLAlchemyRepository:
+    def __init__(self, session: sa.orm.Session):
+        self.session = session
+
+    @contextmanager
+    def atomic(self) -> Iterator[None]:
+        # Outside a block every write commits on its own. Inside it, writes are
+        # flushed to the open transaction and the outermost block on the session
+        # commits them on exit. Any error, including one a method already rolled
+        # back, discards the whole transaction.
+        if self.session.info.get(ATOMIC_KEY):
+            yield
+            return
+        self.session.info[ATOMIC_KEY] = True
+        try:
+            yield
+            self.session.commit()
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            self.session.rollback()
+            raise DatabaseException
+        except Exception:
+            self.session.rollback()
+            raise
+        finally:
+            self.session.info[ATOMIC_KEY] = False
+
+    def _commit(self) -> None:
+        if not self.session.info.get(ATOMIC_KEY):
+            self.session.commit()
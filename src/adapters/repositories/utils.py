@@ -0,0 +1,67 @@
+from typing import Any, Iterable
+
+import sqlalchemy as sa
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from adapters.repositories.models import (
+    FootfallDailyMallORM,
+    FootfallDailyWallORM,
+    WallORM,
+)
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+    _inline = False
+
+    def __init__(self, statement: ClauseElement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")  # type: ignore[misc, no-untyped-call]
+def _compile_explain(element: Explain, compiler: SQLCompiler, **kw: Any) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
+
+def estimate_count(session: Session, query: sa.Select[Any]) -> int:
+    plan = session.scalar(Explain(query))
+    return int(plan[0]["Plan"]["Plan Rows"]) if plan else 0
+
+
+def get_mall_rollup_query() -> sa.Select[Any]:
+    return (
+        sa.select(
+            WallORM.mall_id,
+            FootfallDailyWallORM.start_datetime,
+            FootfallDailyWallORM.origin,
+            sa.func.sum(FootfallDailyWallORM.people_in).label("people_in"),
+            sa.func.sum(FootfallDailyWallORM.people_out).label("people_out"),
+        )
+        .join(WallORM, WallORM.id == FootfallDailyWallORM.wall_id)
+        .group_by(
+            WallORM.mall_id,
+            FootfallDailyWallORM.start_datetime,
+            FootfallDailyWallORM.origin,
+        )
+    )
+
+
+def rebuild_mall_rollups(session: Session, mall_ids: Iterable[int]) -> None:
+    # Rollups of the given malls are recomputed from their current walls.
+    mall_ids = set(mall_ids)
+    if not mall_ids:
+        return
+    query = get_mall_rollup_query().where(WallORM.mall_id.in_(mall_ids))
+    session.execute(
+        sa.delete(FootfallDailyMallORM).where(
+            FootfallDailyMallORM.mall_id.in_(mall_ids)
+        )
+    )
+    session.execute(
+        sa.insert(FootfallDailyMallORM).from_select(
+            list(query.selected_columns.keys()), query
+        )
+    )
@@ -0,0 +1,32 @@
+from typing import Any
+
+from domain.entities.mall import Mall
+from domain.entities.wall import Wall
+from ports.repositories.wall_repository import WallRepository
+
+
+class MockWallRepository(WallRepository):
+    def __init__(self, wall_ids: set[int] | None = None):
+        self.wall_ids = wall_ids if wall_ids is not None else {1, 2}
+
+    def add(self, wall: Wall) -> Wall:
+        return wall
+
+    def get(self, **filters: Any) -> Wall:
+        mall = Mall(id=1, name="Test Mall")
+        return Wall(id=filters.get("id_filter"), name="Test Wall", mall_id=1, mall=mall)
+
+    def update(self, fields_to_update: dict[str, Any], **filters: Any) -> None:
+        return None
+
+    def delete(self, **filters: Any) -> None:
+        return None
+
+    def get_all(self, page: int = 1, limit: int = 50, **filters: Any) -> list[Wall]:
+        return []
+
+    def count(self, **filters: Any) -> int:
+        return 0
+
+    def get_existing_ids(self, ids: list[int]) -> set[int]:
+        return self.wall_ids.intersection(ids)
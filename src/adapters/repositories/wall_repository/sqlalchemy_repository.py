@@ -1,7 +1,8 @@
 import logging
-from typing import Any
+from typing import Any, Sequence
 
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.sql.expression import ColumnElement
 
 from adapters.exceptions import (
@@ -10,6 +11,7 @@ from adapters.exceptions import (
     WallNotFoundException,
 )
 from adapters.repositories.models import WallORM
+from adapters.repositories.utils import estimate_count, rebuild_mall_rollups
 from domain.entities.mall import Mall
 from domain.entities.wall import Wall
 from ports.repositories.wall_repository import WallRepository
@@ -53,12 +55,23 @@ class SQLAlchemyWallRepository(WallRepository):
     def update(self, fields_to_update: dict[str, Any], **filters: Any) -> None:
         filter_expressions = self._get_filter_expressions(filters)
         try:
+            previous: Sequence[int] = []
+            if "mall_id" in fields_to_update:
+                # Walls moved to another mall leave their previous mall rollup stale.
+                previous = self.session.scalars(
+                    sa.select(WallORM.mall_id).where(*filter_expressions)
+                ).all()
             query = (
-                sa.update(WallORM).where(*filter_expressions).values(fields_to_update)
+                sa.update(WallORM)
+                .where(*filter_expressions)
+                .values(fields_to_update)
+                .returning(WallORM.mall_id)
             )
-            result = self.session.execute(query)
+            updated = self.session.scalars(query).all()
+            if previous:
+                rebuild_mall_rollups(self.session, [*previous, *updated])
             self.session.commit()
-            if not result.rowcount:
+            if not updated:
                 raise WallNotFoundException(filters)
         except sa.exc.SQLAlchemyError as e:
             self.session.rollback()
@@ -68,32 +81,62 @@ class SQLAlchemyWallRepository(WallRepository):
     def delete(self, **filters: Any) -> None:
         filter_expressions = self._get_filter_expressions(filters)
         try:
-            query = sa.delete(WallORM).where(*filter_expressions)
-            result = self.session.execute(query)
+            # Wall rollups go away with the wall, its malls are recomputed without it.
+            query = (
+                sa.delete(WallORM).where(*filter_expressions).returning(WallORM.mall_id)
+            )
+            deleted = self.session.scalars(query).all()
+            rebuild_mall_rollups(self.session, deleted)
             self.session.commit()
-            if not result.rowcount:
+            if not deleted:
                 raise MallNotFoundException(filters)
         except sa.exc.SQLAlchemyError as e:
             self.session.rollback()
             logger.error(e)
             raise DatabaseException
 
-    def get_all(self, page: int = 1, limit: int = 50, **filters: Any) -> list[Wall]:
-        offset = (page - 1) * limit
+    def get_all(
+        self,
+        page: int = 1,
+        limit: int = 50,
+        cursor: tuple[Any, ...] | None = None,
+        **filters: Any,
+    ) -> list[Wall]:
         filter_expressions = self._get_filter_expressions(filters)
         try:
-            query = (
-                sa.select(WallORM)
-                .where(*filter_expressions)
-                .offset(offset)
-                .limit(limit)
-            )
+            query = self._get_page_query(page, limit, cursor, filter_expressions)
             result = self.session.scalars(query)
             return [self._to_entity(wall_orm) for wall_orm in result]
         except sa.exc.SQLAlchemyError as e:
             logger.exception(e)
             raise DatabaseException
 
+    def get_all_with_count(
+        self,
+        page: int = 1,
+        limit: int = 50,
+        cursor: tuple[Any, ...] | None = None,
+        **filters: Any,
+    ) -> tuple[list[Wall], int]:
+        filter_expressions = self._get_filter_expressions(filters)
+        total_count = (
+            sa.select(sa.func.count())
+            .select_from(WallORM)
+            .where(*filter_expressions)
+            .scalar_subquery()
+        )
+        try:
+            query = self._get_page_query(
+                page, limit, cursor, filter_expressions
+            ).add_columns(total_count)
+            rows = self.session.execute(query).all()
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            raise DatabaseException
+        if not rows:
+            return [], self.count(**filters) if cursor or page > 1 else 0
+        return [self._to_entity(row[0]) for row in rows], rows[0][1]
+
     def count(self, **filters: Any) -> int:
         filter_expressions = self._get_filter_expressions(filters)
         try:
@@ -107,6 +150,42 @@ class SQLAlchemyWallRepository(WallRepository):
             logger.error(e)
             raise DatabaseException
 
+    def estimate_count(self, **filters: Any) -> int:
+        filter_expressions = self._get_filter_expressions(filters)
+        try:
+            query = sa.select(WallORM.id).where(*filter_expressions)
+            return estimate_count(self.session, query)
+        except sa.exc.SQLAlchemyError as e:
+            logger.error(e)
+            raise DatabaseException
+
+    @staticmethod
+    def _get_page_query(
+        page: int,
+        limit: int,
+        cursor: tuple[Any, ...] | None,
+        filter_expressions: list[ColumnElement[bool]],
+    ) -> sa.Select[tuple[WallORM]]:
+        query = (
+            sa.select(WallORM)
+            .where(*filter_expressions)
+            .order_by(WallORM.id)
+            .limit(limit)
+        )
+        if cursor:
+            return query.where(WallORM.id > cursor[0])
+        return query.offset((page - 1) * limit)
+
+    def get_existing_ids(self, ids: list[int]) -> set[int]:
+        try:
+            query = sa.select(WallORM.id).where(
+                WallORM.id == sa.any_(sa.bindparam("ids", ids, type_=ARRAY(sa.Integer)))
+            )
+            return set(self.session.scalars(query))
+        except sa.exc.SQLAlchemyError as e:
+            logger.exception(e)
+            raise DatabaseException
+
     @staticmethod
     def _get_filter_expressions(filters: dict[str, Any]) -> list[ColumnElement[bool]]:
         filter_expressions = []
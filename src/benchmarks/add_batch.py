@@ -0,0 +1,126 @@
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from adapters.repositories.footfall_repository.sqlalchemy_repository import (
+    SQLAlchemyFootfallRepository,
+)
+from adapters.repositories.models import (
+    FootfallDailyMallORM,
+    FootfallDailyWallORM,
+    FootfallORM,
+    MallORM,
+    WallORM,
+)
+from domain.entities.footfall import Footfall, FootfallBatch, OriginType
+from drivers.infrastructure.database import create_session_maker
+from drivers.rest.config import get_config_cls
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+def generate_footfalls(size: int, wall_id: int) -> list[Footfall]:
+    start = datetime(year=2024, month=1, day=1)
+    return [
+        Footfall(
+            start_datetime=start + timedelta(hours=hour),
+            end_datetime=start + timedelta(hours=hour + 1),
+            people_in=hour % 100,
+            people_out=hour % 90,
+            is_active=True,
+            origin=OriginType.reconstruction,
+            wall_id=wall_id,
+        )
+        for hour in range(size)
+    ]
+
+
+class ORMFootfallRepository(SQLAlchemyFootfallRepository):
+    # Only the row inserts differ from add_batch, the rollups are refreshed and
+    # committed the same way.
+    def _insert_batch(self, footfalls: FootfallBatch) -> None:
+        columns = zip(
+            footfalls.start_datetimes,
+            footfalls.end_datetimes,
+            footfalls.people_in,
+            footfalls.people_out,
+            footfalls.is_active,
+            footfalls.origins,
+            footfalls.wall_ids,
+        )
+        for start, end, people_in, people_out, is_active, origin, wall_id in columns:
+            self.session.add(
+                FootfallORM(
+                    start_datetime=start,
+                    end_datetime=end,
+                    people_in=people_in,
+                    people_out=people_out,
+                    is_active=is_active,
+                    origin=origin,
+                    wall_id=wall_id,
+                )
+            )
+        self.session.flush()
+
+
+def add_batch_orm(session: Session, footfalls: list[Footfall]) -> None:
+    ORMFootfallRepository(session).add_batch(footfalls)
+
+
+def add_batch_copy(session: Session, footfalls: list[Footfall]) -> None:
+    SQLAlchemyFootfallRepository(session).add_batch(footfalls)
+
+
+def measure(
+    session: Session,
+    loader: Callable[[Session, list[Footfall]], None],
+    footfalls: list[Footfall],
+    wall: WallORM,
+) -> float:
+    started_at = time.perf_counter()
+    loader(session, footfalls)
+    elapsed = time.perf_counter() - started_at
+    session.execute(sa.delete(FootfallORM).where(FootfallORM.wall_id == wall.id))
+    session.execute(
+        sa.delete(FootfallDailyWallORM).where(FootfallDailyWallORM.wall_id == wall.id)
+    )
+    session.execute(
+        sa.delete(FootfallDailyMallORM).where(
+            FootfallDailyMallORM.mall_id == wall.mall_id
+        )
+    )
+    session.commit()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare ORM and COPY footfall batch inserts."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    args = parser.parse_args()
+
+    session_maker = create_session_maker(get_config_cls()().database_url)
+    with session_maker() as session:
+        mall = MallORM(name="Benchmark Mall")
+        wall = WallORM(name="Benchmark Wall", mall=mall)
+        session.add(wall)
+        session.commit()
+        try:
+            print(f"{'rows':>10} {'orm, s':>10} {'copy, s':>10} {'speedup':>8}")
+            for size in args.sizes:
+                footfalls = generate_footfalls(size, wall.id)
+                orm = measure(session, add_batch_orm, footfalls, wall)
+                copy = measure(session, add_batch_copy, footfalls, wall)
+                print(f"{size:>10} {orm:>10.2f} {copy:>10.2f} {orm / copy:>7.1f}x")
+        finally:
+            session.execute(sa.delete(MallORM).where(MallORM.id == mall.id))
+            session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+import argparse
+import json
+import subprocess
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from adapters.repositories.footfall_repository.mock_repository import (
+    MockFootfallRepository,
+)
+from adapters.repositories.footfall_repository.sqlalchemy_repository import (
+    SQLAlchemyFootfallRepository,
+)
+from adapters.repositories.models import MallORM, WallORM
+from adapters.repositories.wall_repository.mock_repository import MockWallRepository
+from adapters.repositories.wall_repository.sqlalchemy_repository import (
+    SQLAlchemyWallRepository,
+)
+from domain.entities.footfall_import import ImportStrategy
+from drivers.infrastructure.database import (
+    create_footfall_repository,
+    create_session_maker,
+    get_round_trips,
+)
+from drivers.rest.config import get_config_cls
+from use_cases.exceptions import NotValidFileException
+from use_cases.process_footfalls_use_case import ProcessFootfallsUseCase
+
+DEFAULT_WALLS = (10, 100)
+DEFAULT_HOURS = (24 * 90,)
+RESULTS_DIR = Path(__file__).parent / "results"
+OPENING_HOUR = 8
+CLOSING_HOUR = 22
+
+
+def generate_footfalls_csv(
+    path: Path,
+    wall_ids: list[int],
+    hours: int,
+    gap_rate: float = 0.0,
+    duplicate_rate: float = 0.0,
+    seed: int = 0,
+) -> int:
+    rng = np.random.default_rng(seed)
+    from_dates = pd.Timestamp(2024, 1, 1) + pd.to_timedelta(
+        np.tile(np.arange(hours), len(wall_ids)), unit="h"
+    )
+    # Traffic follows the opening hours with a peak in the afternoon, each wall
+    # having its own scale.
+    opening_hours = (from_dates.hour - OPENING_HOUR) / (CLOSING_HOUR - OPENING_HOUR)
+    curve = np.clip(np.sin(np.pi * opening_hours), 0, None)
+    scale = np.repeat(rng.uniform(20, 200, len(wall_ids)), hours)
+    df = pd.DataFrame(
+        {
+            "from_date": from_dates,
+            "to_date": from_dates + pd.Timedelta(hours=1),
+            "people_in": rng.poisson(scale * curve),
+            "people_out": rng.poisson(scale * curve),
+            "wall_id": np.repeat(wall_ids, hours),
+        }
+    )
+    if gap_rate:
+        df = df[rng.random(len(df)) >= gap_rate]
+    if duplicate_rate:
+        duplicates = df[rng.random(len(df)) < duplicate_rate]
+        df = pd.concat([df, duplicates]).sort_index(kind="stable")
+    df.to_csv(path, index=False, date_format="%Y-%m-%d %H:%M:%S")
+    return len(df)
+
+
+def run_import(
+    use_case: ProcessFootfallsUseCase, path: Path, strategy: ImportStrategy
+) -> dict[str, Any]:
+    started_at = time.perf_counter()
+    try:
+        with open(path, "rb") as file:
+            summary = use_case(file, strategy=strategy)
+    except NotValidFileException as e:
+        return {
+            "status": "invalid",
+            "errors": len(e.errors),
+            "seconds": time.perf_counter() - started_at,
+        }
+    return {"status": "succeeded", **asdict(summary.stats)}
+
+
+def create_walls(session: Session, count: int) -> tuple[int, list[int]]:
+    mall = MallORM(name="Benchmark Mall")
+    walls = [WallORM(name=f"Benchmark Wall {i}", mall=mall) for i in range(count)]
+    session.add_all(walls)
+    session.commit()
+    return mall.id, [wall.id for wall in walls]
+
+
+def delete_mall(session: Session, mall_id: int) -> None:
+    session.execute(sa.delete(MallORM).where(MallORM.id == mall_id))
+    session.commit()
+
+
+def benchmark_postgres(
+    args: argparse.Namespace, walls: int, hours: int, path: Path
+) -> dict[str, Any]:
+    database_url = get_config_cls()().database_url
+    session_maker = create_session_maker(database_url)
+    with session_maker() as session:
+        mall_id, wall_ids = create_walls(session, walls)
+        try:
+            rows = generate_footfalls_csv(
+                path, wall_ids, hours, args.gap_rate, args.duplicate_rate, args.seed
+            )
+            use_case = ProcessFootfallsUseCase(
+                SQLAlchemyFootfallRepository(session),
+                chunk_size=args.chunk_size,
+                workers=args.workers,
+                shard_repository_factory=partial(
+                    create_footfall_repository, database_url
+                ),
+                wall_repository=SQLAlchemyWallRepository(session),
+                round_trips=partial(get_round_trips, session),
+            )
+            return {"rows": rows, **run_import(use_case, path, args.strategy)}
+        finally:
+            delete_mall(session, mall_id)
+
+
+def benchmark_memory(
+    args: argparse.Namespace, walls: int, hours: int, path: Path
+) -> dict[str, Any]:
+    wall_ids = list(range(1, walls + 1))
+    rows = generate_footfalls_csv(
+        path, wall_ids, hours, args.gap_rate, args.duplicate_rate, args.seed
+    )
+    use_case = ProcessFootfallsUseCase(
+        MockFootfallRepository(),
+        chunk_size=args.chunk_size,
+        wall_repository=MockWallRepository(set(wall_ids)),
+    )
+    return {"rows": rows, **run_import(use_case, path, args.strategy)}
+
+
+def get_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure footfall import throughput on generated CSV files."
+    )
+    parser.add_argument("--walls", type=int, nargs="+", default=DEFAULT_WALLS)
+    parser.add_argument("--hours", type=int, nargs="+", default=DEFAULT_HOURS)
+    parser.add_argument("--gap-rate", type=float, default=0.0)
+    parser.add_argument("--duplicate-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--repository", choices=("postgres", "memory"), default="postgres"
+    )
+    parser.add_argument(
+        "--strategy", type=ImportStrategy, default=ImportStrategy.history
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=get_config_cls().IMPORT_CHUNK_SIZE
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+    benchmark: Callable[[argparse.Namespace, int, int, Path], dict[str, Any]] = (
+        benchmark_postgres if args.repository == "postgres" else benchmark_memory
+    )
+
+    results = []
+    print(
+        f"{'walls':>6} {'hours':>6} {'rows':>10} {'seconds':>8} {'rows/s':>10} "
+        f"{'peak MiB':>9} {'trips':>6} {'status':>9}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for walls in args.walls:
+            for hours in args.hours:
+                path = Path(directory) / f"footfalls_{walls}x{hours}.csv"
+                result = {
+                    "walls": walls,
+                    "hours": hours,
+                    **benchmark(args, walls, hours, path),
+                }
+                path.unlink()
+                results.append(result)
+                print(
+                    f"{walls:>6} {hours:>6} {result['rows']:>10} "
+                    f"{result['seconds']:>8.2f} "
+                    f"{result.get('rows_per_second', 0):>10.0f} "
+                    f"{result.get('peak_memory_delta', 0) / 2**20:>9.0f} "
+                    f"{result.get('round_trips') or '-':>6} {result['status']:>9}"
+                )
+
+    output = args.output or RESULTS_DIR / f"import-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    arguments = {key: value for key, value in vars(args).items() if key != "output"}
+    output.write_text(
+        json.dumps(
+            {
+                "created_at": datetime.now().isoformat(),
+                "revision": get_revision(),
+                "arguments": arguments,
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+    print(f"Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
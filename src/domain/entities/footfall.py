@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import StrEnum
 
@@ -21,3 +21,50 @@ class Footfall:
     wall_id: int
     wall: Wall | None = None
     id: int | None = None
+
+
+@dataclass
+class FootfallRange:
+    wall_id: int
+    start_datetime: datetime
+    end_datetime: datetime
+
+
+@dataclass
+class FootfallBatch:
+    start_datetimes: list[datetime]
+    end_datetimes: list[datetime]
+    people_in: list[int]
+    people_out: list[int]
+    is_active: list[bool]
+    origins: list[OriginType]
+    wall_ids: list[int]
+
+    def __len__(self) -> int:
+        return len(self.wall_ids)
+
+    @classmethod
+    def from_footfalls(cls, footfalls: list[Footfall]) -> "FootfallBatch":
+        return cls(
+            start_datetimes=[footfall.start_datetime for footfall in footfalls],
+            end_datetimes=[footfall.end_datetime for footfall in footfalls],
+            people_in=[footfall.people_in for footfall in footfalls],
+            people_out=[footfall.people_out for footfall in footfalls],
+            is_active=[footfall.is_active for footfall in footfalls],
+            origins=[footfall.origin for footfall in footfalls],
+            wall_ids=[footfall.wall_id for footfall in footfalls],
+        )
+
+
+@dataclass
+class FootfallPartition:
+    name: str
+    start_datetime: datetime
+    end_datetime: datetime
+
+
+@dataclass
+class FootfallPartitionSummary:
+    created: list[str] = field(default_factory=list)
+    detached: list[str] = field(default_factory=list)
+    dropped: list[str] = field(default_factory=list)
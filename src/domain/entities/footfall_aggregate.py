@@ -0,0 +1,44 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import StrEnum
+
+
+class FootfallBucket(StrEnum):
+    hour = "hour"
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+class FootfallGroup(StrEnum):
+    wall = "wall"
+    mall = "mall"
+
+
+@dataclass
+class FootfallSeries:
+    id: int
+    start_datetimes: list[datetime] = field(default_factory=list)
+    people_in: list[int] = field(default_factory=list)
+    people_out: list[int] = field(default_factory=list)
+
+
+@dataclass
+class FootfallOccupancy:
+    id: int
+    start_datetimes: list[datetime] = field(default_factory=list)
+    occupancy: list[int] = field(default_factory=list)
+
+
+@dataclass
+class FootfallPeakHours:
+    id: int
+    start_datetimes: list[datetime] = field(default_factory=list)
+    traffic: list[int] = field(default_factory=list)
+
+
+@dataclass
+class FootfallRanking:
+    wall_ids: list[int] = field(default_factory=list)
+    wall_traffic: list[int] = field(default_factory=list)
+    peak_hours: list[FootfallPeakHours] = field(default_factory=list)
@@ -0,0 +1,57 @@
+from dataclasses import dataclass, field
+from enum import StrEnum
+
+
+class FileFormat(StrEnum):
+    csv = "csv"
+    parquet = "parquet"
+    arrow = "arrow"
+
+
+class ImportStrategy(StrEnum):
+    history = "history"
+    upsert = "upsert"
+    diff = "diff"
+
+
+class Compression(StrEnum):
+    gzip = "gzip"
+    zstd = "zstd"
+
+
+@dataclass
+class FootfallImportError:
+    message: str
+    row: int | None = None
+    wall_id: int | None = None
+
+
+@dataclass
+class FootfallImportStage:
+    seconds: float = 0.0
+    rows: int = 0
+    peak_memory_delta: int = 0
+    round_trips: int | None = None
+
+
+@dataclass
+class FootfallImportStats:
+    seconds: float = 0.0
+    rows_per_second: float = 0.0
+    peak_memory_delta: int = 0
+    round_trips: int | None = None
+    stages: dict[str, FootfallImportStage] = field(default_factory=dict)
+
+
+@dataclass
+class FootfallImportSummary:
+    rows: int = 0
+    walls: int = 0
+    chunks: int = 0
+    superseded: int = 0
+    unchanged: int = 0
+    changed: int = 0
+    new: int = 0
+    stats: FootfallImportStats = field(
+        default_factory=FootfallImportStats, compare=False
+    )
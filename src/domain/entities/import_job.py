@@ -0,0 +1,42 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import StrEnum
+
+from domain.entities.footfall_import import (
+    Compression,
+    FileFormat,
+    FootfallImportError,
+    FootfallImportStats,
+    ImportStrategy,
+)
+
+
+class ImportJobStatus(StrEnum):
+    pending = "pending"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+@dataclass
+class ImportJob:
+    file_path: str
+    file_format: FileFormat = FileFormat.csv
+    compression: Compression | None = None
+    dry_run: bool = False
+    strategy: ImportStrategy = ImportStrategy.history
+    status: ImportJobStatus = ImportJobStatus.pending
+    rows_processed: int = 0
+    walls_processed: int = 0
+    rows_superseded: int = 0
+    rows_unchanged: int = 0
+    rows_changed: int = 0
+    rows_new: int = 0
+    details: str | None = None
+    errors: list[FootfallImportError] = field(default_factory=list)
+    stats: FootfallImportStats | None = None
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    claimed_at: datetime | None = None
+    finished_at: datetime | None = None
+    id: int | None = None
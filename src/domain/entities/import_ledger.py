@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass
+class ImportLedgerEntry:
+    content_hash: str
+    import_job_id: int
+    idempotency_key: str | None = None
+    created_at: datetime | None = None
+    id: int | None = None
@@ -0,0 +1,7 @@
+from enum import StrEnum
+
+
+class CountMode(StrEnum):
+    exact = "exact"
+    estimate = "estimate"
+    none = "none"
@@ -1,12 +1,99 @@
-from sqlalchemy import URL, create_engine
-from sqlalchemy.orm import Session
+from typing import Any
+
+import psycopg2.extensions
+from sqlalchemy import URL, Connection, create_engine, event
+from sqlalchemy.orm import Session, SessionTransaction
 from sqlalchemy.orm.session import sessionmaker
 
+from adapters.repositories.footfall_repository.sqlalchemy_repository import (
+    SQLAlchemyFootfallRepository,
+)
+
+ROUND_TRIPS_KEY = "round_trips"
+
+
+class RoundTripCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+
+class RoundTripCountingConnection(psycopg2.extensions.connection):
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.cursor_factory = _RoundTripCountingCursor
+        self.round_trips: RoundTripCounter | None = None
+
+    def count(self) -> None:
+        if self.round_trips is not None:
+            self.round_trips.count += 1
+
+    def commit(self) -> None:
+        if self.status != psycopg2.extensions.STATUS_READY:
+            self.count()
+        super().commit()
+
+    def rollback(self) -> None:
+        if self.status != psycopg2.extensions.STATUS_READY:
+            self.count()
+        super().rollback()
+
+
+class _RoundTripCountingCursor(psycopg2.extensions.cursor):
+    def execute(self, *args: Any, **kwargs: Any) -> None:
+        self._count()
+        super().execute(*args, **kwargs)
+
+    def executemany(self, *args: Any, **kwargs: Any) -> None:
+        self._count()
+        super().executemany(*args, **kwargs)
 
-def create_session_maker(database_url: URL) -> sessionmaker[Session]:
+    def copy_expert(self, *args: Any, **kwargs: Any) -> None:
+        self._count()
+        super().copy_expert(*args, **kwargs)
+
+    def _count(self) -> None:
+        if isinstance(self.connection, RoundTripCountingConnection):
+            self.connection.count()
+
+
+def get_round_trips(session: Session) -> int:
+    counter: RoundTripCounter | None = session.info.get(ROUND_TRIPS_KEY)
+    return counter.count if counter else 0
+
+
+def _count_session_round_trips(
+    session: Session, transaction: SessionTransaction, connection: Connection
+) -> None:
+    # A pooled connection counts into the session it is checked out for.
+    dbapi_connection = connection.connection.dbapi_connection
+    if isinstance(dbapi_connection, RoundTripCountingConnection):
+        dbapi_connection.round_trips = session.info.setdefault(
+            ROUND_TRIPS_KEY, RoundTripCounter()
+        )
+
+
+def _stop_counting_round_trips(dbapi_connection: Any, connection_record: Any) -> None:
+    if isinstance(dbapi_connection, RoundTripCountingConnection):
+        dbapi_connection.round_trips = None
+
+
+def create_session_maker(
+    database_url: URL, read_only: bool = False
+) -> sessionmaker[Session]:
     engine = create_engine(
         database_url,
         pool_size=15,
         max_overflow=15,
+        connect_args={"connection_factory": RoundTripCountingConnection},
     )
-    return sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    event.listen(engine, "checkin", _stop_counting_round_trips)
+    if read_only:
+        engine = engine.execution_options(postgresql_readonly=True)
+    session_maker = sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    event.listen(session_maker, "after_begin", _count_session_round_trips)
+    return session_maker
+
+
+def create_footfall_repository(database_url: URL) -> SQLAlchemyFootfallRepository:
+    session_maker = create_session_maker(database_url)
+    return SQLAlchemyFootfallRepository(session_maker())
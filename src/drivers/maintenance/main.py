@@ -0,0 +1,59 @@
+import argparse
+import logging
+
+from adapters.repositories.footfall_partition_repository.sqlalchemy_repository import (
+    SQLAlchemyFootfallPartitionRepository,
+)
+from adapters.repositories.footfall_repository.sqlalchemy_repository import (
+    SQLAlchemyFootfallRepository,
+)
+from drivers.infrastructure.database import create_session_maker
+from drivers.rest.config import get_config_cls
+from logger import configure_logging
+from use_cases.maintain_footfall_partitions_use_case import (
+    MaintainFootfallPartitionsUseCase,
+)
+
+logger = logging.getLogger()
+
+
+def main() -> None:
+    config = get_config_cls()()
+    parser = argparse.ArgumentParser(
+        description="Create upcoming monthly footfall partitions and expire old ones."
+    )
+    parser.add_argument(
+        "--months-ahead", type=int, default=config.FOOTFALL_PARTITION_MONTHS_AHEAD
+    )
+    parser.add_argument(
+        "--retention-months", type=int, default=config.FOOTFALL_RETENTION_MONTHS
+    )
+    parser.add_argument(
+        "--drop",
+        action="store_true",
+        help="Drop expired partitions instead of detaching them.",
+    )
+    args = parser.parse_args()
+    configure_logging(config)
+
+    session_maker = create_session_maker(config.database_url)
+    with session_maker() as session:
+        use_case = MaintainFootfallPartitionsUseCase(
+            SQLAlchemyFootfallPartitionRepository(session),
+            months_ahead=args.months_ahead,
+            retention_months=args.retention_months,
+            drop_expired=args.drop,
+        )
+        summary = use_case()
+        purged = SQLAlchemyFootfallRepository(session).purge_staged()
+    logger.info(
+        "Footfall partitions created %s, detached %s, dropped %s",
+        summary.created,
+        summary.detached,
+        summary.dropped,
+    )
+    logger.info("Purged %s staged footfalls of finished import jobs", purged)
+
+
+if __name__ == "__main__":
+    main()
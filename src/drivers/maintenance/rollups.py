@@ -0,0 +1,28 @@
+import argparse
+import logging
+
+from adapters.repositories.footfall_repository.sqlalchemy_repository import (
+    SQLAlchemyFootfallRepository,
+)
+from drivers.infrastructure.database import create_session_maker
+from drivers.rest.config import get_config_cls
+from logger import configure_logging
+
+logger = logging.getLogger()
+
+
+def main() -> None:
+    config = get_config_cls()()
+    argparse.ArgumentParser(
+        description="Rebuild the daily footfall rollups from the active footfalls."
+    ).parse_args()
+    configure_logging(config)
+
+    session_maker = create_session_maker(config.database_url)
+    with session_maker() as session:
+        SQLAlchemyFootfallRepository(session).rebuild_rollups()
+    logger.info("Footfall daily rollups rebuilt")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from enum import StrEnum
 from typing import Type
 
@@ -29,6 +30,22 @@ class BaseConfig:
     DB_USERNAME = os.environ.get("DB_USERNAME")
     DB_PASSWORD = os.environ.get("DB_PASSWORD")
     DB_NAME = os.environ.get("DB_NAME")
+    IMPORT_CHUNK_SIZE = int(os.environ.get("IMPORT_CHUNK_SIZE", 50_000))
+    IMPORT_WORKERS = int(os.environ.get("IMPORT_WORKERS", 1))
+    IMPORT_UPLOAD_DIR = os.environ.get("IMPORT_UPLOAD_DIR", tempfile.gettempdir())
+    IMPORT_MAX_FILE_SIZE = int(os.environ.get("IMPORT_MAX_FILE_SIZE", 1024**3))
+    IMPORT_WORKER_POLL_INTERVAL = float(
+        os.environ.get("IMPORT_WORKER_POLL_INTERVAL", 2)
+    )
+    IMPORT_JOB_LEASE = float(os.environ.get("IMPORT_JOB_LEASE", 600))
+    FOOTFALL_PARTITION_MONTHS_AHEAD = int(
+        os.environ.get("FOOTFALL_PARTITION_MONTHS_AHEAD", 3)
+    )
+    FOOTFALL_RETENTION_MONTHS = (
+        int(os.environ["FOOTFALL_RETENTION_MONTHS"])
+        if os.environ.get("FOOTFALL_RETENTION_MONTHS")
+        else None
+    )
 
     @property
     def database_url(self) -> sa.URL:
@@ -0,0 +1,31 @@
+from http import HTTPStatus
+from typing import Any
+
+from flask import g
+from flask_apispec.views import MethodResource
+from flask_restful import Resource
+
+from adapters.repositories.footfall_repository.sqlalchemy_repository import (
+    SQLAlchemyFootfallRepository,
+)
+from drivers.rest.controllers.schema import (
+    FootfallAggregateResponse,
+    footfall_aggregate_params,
+)
+from drivers.rest.utils.openapi import docs
+from drivers.rest.utils.validation import validate_params
+
+
+class FootfallAggregateController(MethodResource, Resource):
+    @validate_params(footfall_aggregate_params)
+    @docs(
+        params=footfall_aggregate_params,
+        response_schema={HTTPStatus.OK: FootfallAggregateResponse},
+        description="Sum footfalls per wall or mall and time bucket endpoint",
+        tags=["Footfall"],
+    )
+    def get(self, params: dict[str, Any]):
+        series = SQLAlchemyFootfallRepository(g.session).aggregate(**params)
+        return FootfallAggregateResponse.from_entity(
+            series, params["bucket"], params["group_by"]
+        )
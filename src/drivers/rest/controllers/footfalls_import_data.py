@@ -1,28 +1,102 @@
+from datetime import timedelta
 from http import HTTPStatus
-from io import BytesIO
+from typing import Any
 
-from flask import g, request
+from flask import current_app, g, request
 from flask_apispec import MethodResource
 from flask_restful import Resource
+from marshmallow import ValidationError
 
-from adapters.repositories.footfall_repository.sqlalchemy_repository import (
-    SQLAlchemyFootfallRepository,
+from adapters.repositories.import_job_repository.sqlalchemy_repository import (
+    SQLAlchemyImportJobRepository,
+)
+from adapters.repositories.import_ledger_repository.sqlalchemy_repository import (
+    SQLAlchemyImportLedgerRepository,
+)
+from domain.entities.footfall_import import ImportStrategy
+from domain.entities.import_job import ImportJob
+from drivers.rest.controllers.schema import (
+    FileSchema,
+    ImportJobResponse,
+    import_data_params,
 )
-from drivers.rest.controllers.schema import FileSchema
 from drivers.rest.utils.openapi import docs
-from use_cases.process_footfalls_use_case import ProcessFootfallsUseCase
+from drivers.rest.utils.upload import spool_upload
+from drivers.rest.utils.validation import validate_int, validate_params
+from use_cases.queue_import_job_use_case import QueueImportJobUseCase
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
 
 
 class FootfallImportDataController(MethodResource, Resource):
+    @validate_params(import_data_params)
     @docs(
+        params=import_data_params,
         file_upload=FileSchema,
-        response_schema={HTTPStatus.NO_CONTENT: {}},
-        description="Import footfalls from file",
+        response_schema={
+            HTTPStatus.ACCEPTED: ImportJobResponse,
+            HTTPStatus.OK: ImportJobResponse,
+        },
+        description=(
+            "Queue footfalls import from file. An identical file with the same "
+            "strategy and format, or a repeated Idempotency-Key, returns the "
+            "already queued job with status 200. "
+            "With dry_run=true the file is only validated and nothing is written. "
+            "strategy=upsert updates matching footfalls in place instead of keeping "
+            "their previous versions, strategy=diff only rewrites the hours whose "
+            "counts changed"
+        ),
+        tags=["Footfall File Import"],
+    )
+    def post(self, params: dict[str, Any]):
+        idempotency_key = request.headers.get("Idempotency-Key")
+        if idempotency_key and len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise ValidationError(
+                {
+                    "Idempotency-Key": [
+                        f"Longer than maximum length {IDEMPOTENCY_KEY_MAX_LENGTH}."
+                    ]
+                }
+            )
+        upload = spool_upload(
+            "file",
+            directory=current_app.config["IMPORT_UPLOAD_DIR"],
+            max_size=current_app.config["IMPORT_MAX_FILE_SIZE"],
+        )
+        use_case = QueueImportJobUseCase(
+            SQLAlchemyImportJobRepository(g.session),
+            SQLAlchemyImportLedgerRepository(g.session),
+            lease=timedelta(seconds=current_app.config["IMPORT_JOB_LEASE"]),
+        )
+        try:
+            import_job, created = use_case(
+                ImportJob(
+                    file_path=str(upload.path),
+                    file_format=upload.file_format,
+                    compression=upload.compression,
+                    dry_run=params.get("dry_run", False),
+                    strategy=params.get("strategy", ImportStrategy.history),
+                ),
+                content_hash=upload.content_hash,
+                idempotency_key=idempotency_key,
+            )
+        except Exception:
+            upload.path.unlink(missing_ok=True)
+            raise
+        if not created:
+            upload.path.unlink(missing_ok=True)
+            return ImportJobResponse.from_entity(import_job), HTTPStatus.OK
+        return ImportJobResponse.from_entity(import_job), HTTPStatus.ACCEPTED
+
+
+class FootfallImportJobController(MethodResource, Resource):
+    method_decorators = [validate_int]
+
+    @docs(
+        response_schema={HTTPStatus.OK: ImportJobResponse},
+        description="Get footfalls import job endpoint",
         tags=["Footfall File Import"],
     )
-    def post(self):
-        file = request.files["file"]
-        file_buffer = BytesIO(file.read())
-        use_case = ProcessFootfallsUseCase(SQLAlchemyFootfallRepository(g.session))
-        use_case(file_buffer)
-        return "", 204
+    def get(self, job_id: int):
+        import_job = SQLAlchemyImportJobRepository(g.session).get(id_filter=job_id)
+        return ImportJobResponse.from_entity(import_job)
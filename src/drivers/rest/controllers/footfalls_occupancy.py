@@ -0,0 +1,31 @@
+from http import HTTPStatus
+from typing import Any
+
+from flask import g
+from flask_apispec.views import MethodResource
+from flask_restful import Resource
+
+from adapters.repositories.footfall_repository.sqlalchemy_repository import (
+    SQLAlchemyFootfallRepository,
+)
+from drivers.rest.controllers.schema import (
+    FootfallOccupancyResponse,
+    footfall_occupancy_params,
+)
+from drivers.rest.utils.openapi import docs
+from drivers.rest.utils.validation import validate_params
+
+
+class FootfallOccupancyController(MethodResource, Resource):
+    @validate_params(footfall_occupancy_params)
+    @docs(
+        params=footfall_occupancy_params,
+        response_schema={HTTPStatus.OK: FootfallOccupancyResponse},
+        description="Running occupancy per wall or mall endpoint",
+        tags=["Footfall"],
+    )
+    def get(self, params: dict[str, Any]):
+        series = SQLAlchemyFootfallRepository(g.session).occupancy(**params)
+        return FootfallOccupancyResponse.from_entity(
+            series, params["group_by"], params["daily_reset"]
+        )
@@ -0,0 +1,29 @@
+from http import HTTPStatus
+from typing import Any
+
+from flask import g
+from flask_apispec.views import MethodResource
+from flask_restful import Resource
+
+from adapters.repositories.footfall_repository.sqlalchemy_repository import (
+    SQLAlchemyFootfallRepository,
+)
+from drivers.rest.controllers.schema import (
+    FootfallRankingResponse,
+    footfall_ranking_params,
+)
+from drivers.rest.utils.openapi import docs
+from drivers.rest.utils.validation import validate_params
+
+
+class FootfallRankingController(MethodResource, Resource):
+    @validate_params(footfall_ranking_params)
+    @docs(
+        params=footfall_ranking_params,
+        response_schema={HTTPStatus.OK: FootfallRankingResponse},
+        description="Busiest walls and peak hours per mall endpoint",
+        tags=["Footfall"],
+    )
+    def get(self, params: dict[str, Any]):
+        ranking = SQLAlchemyFootfallRepository(g.session).rank(**params)
+        return FootfallRankingResponse.from_entity(ranking)
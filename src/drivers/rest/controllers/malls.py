@@ -10,6 +10,7 @@ from adapters.repositories.mall_repository.sqlalchemy_repository import (
 )
 from domain.entities.mall import Mall
 from drivers.rest.controllers.schema import (
+    DEFAULT_PAGE_LIMIT,
     MallCollectionResponse,
     MallInput,
     MallResponse,
@@ -17,6 +18,7 @@ from drivers.rest.controllers.schema import (
     mall_collection_params,
 )
 from drivers.rest.utils.openapi import docs
+from drivers.rest.utils.pagination import get_collection
 from drivers.rest.utils.validation import validate_body, validate_int, validate_params
 
 
@@ -41,9 +43,10 @@ class MallController(MethodResource):
     @validate_params(mall_collection_params)
     def get(self, params: dict[str, Any]):
         repository = SQLAlchemyMallRepository(g.session)
-        malls = repository.get_all(**params)
-        count = repository.count(**params)
-        return MallCollectionResponse.from_entity(malls, count)
+        malls, count = get_collection(repository, params)
+        return MallCollectionResponse.from_entity(
+            malls, count, params.get("limit", DEFAULT_PAGE_LIMIT)
+        )
 
 
 class MallItemController(MethodResource, Resource):
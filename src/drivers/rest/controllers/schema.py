@@ -1,3 +1,6 @@
+import base64
+import binascii
+import json
 from dataclasses import asdict
 from typing import Any
 
@@ -12,9 +15,54 @@ from marshmallow import (
 from marshmallow.validate import Length, Range
 
 from domain.entities.footfall import Footfall, OriginType
+from domain.entities.footfall_aggregate import (
+    FootfallBucket,
+    FootfallGroup,
+    FootfallOccupancy,
+    FootfallRanking,
+    FootfallSeries,
+)
+from domain.entities.footfall_import import Compression, FileFormat, ImportStrategy
+from domain.entities.import_job import ImportJob, ImportJobStatus
 from domain.entities.mall import Mall
+from domain.entities.pagination import CountMode
 from domain.entities.wall import Wall
 
+DEFAULT_PAGE_LIMIT = 50
+
+
+class Cursor(fields.String):
+    default_error_messages = {"invalid": "Not a valid cursor."}
+
+    def __init__(self, *key_fields: fields.Field, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.key_fields = key_fields
+
+    def _serialize(self, value: Any, attr: str | None, obj: Any, **kwargs: Any) -> Any:
+        if value is None:
+            return None
+        key = [
+            field._serialize(item, attr, obj)
+            for field, item in zip(self.key_fields, value)
+        ]
+        return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+    def _deserialize(
+        self, value: Any, attr: str | None, data: Any, **kwargs: Any
+    ) -> tuple[Any, ...]:
+        try:
+            key = json.loads(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)))
+        except (binascii.Error, TypeError, ValueError):
+            raise self.make_error("invalid")
+        if not isinstance(key, list) or len(key) != len(self.key_fields):
+            raise self.make_error("invalid")
+        try:
+            return tuple(
+                field.deserialize(item) for field, item in zip(self.key_fields, key)
+            )
+        except ValidationError:
+            raise self.make_error("invalid")
+
 
 class MallInput(Schema):
     name = fields.Str(required=True, validate=Length(min=3, max=60))
@@ -38,20 +86,30 @@ class MallResponse(Schema):
 
 
 class MallCollectionResponse(Schema):
-    total_count = fields.Int(required=True)
+    total_count = fields.Int(allow_none=True)
     items = fields.Nested(MallResponse, many=True)
+    next_cursor = Cursor(fields.Int(), allow_none=True)
 
     @classmethod
-    def from_entity(cls, malls: list[Mall], total_count: int) -> Any:
+    def from_entity(
+        cls, malls: list[Mall], total_count: int | None, limit: int | None = None
+    ) -> Any:
+        next_cursor = (malls[-1].id,) if limit and len(malls) == limit else None
         return cls().dump(
-            {"items": [asdict(mall) for mall in malls], "total_count": total_count}
+            {
+                "items": [asdict(mall) for mall in malls],
+                "total_count": total_count,
+                "next_cursor": next_cursor,
+            }
         )
 
 
 mall_collection_params = {
     "name_filter": fields.Str(),
-    "limit": fields.Int(load_default=50),
+    "limit": fields.Int(load_default=DEFAULT_PAGE_LIMIT),
     "page": fields.Int(load_default=1),
+    "count": fields.Enum(CountMode),
+    "cursor": Cursor(fields.Int()),
 }
 
 
@@ -78,23 +136,35 @@ class WallResponse(Schema):
 
 
 class WallCollectionResponse(Schema):
-    total_count = fields.Int(required=True)
+    total_count = fields.Int(allow_none=True)
     items = fields.Nested(WallResponse, many=True)
+    next_cursor = Cursor(fields.Int(), allow_none=True)
 
     class Meta:
         unknown = EXCLUDE
 
     @classmethod
-    def from_entity(cls, walls: list[Wall], total_count: int) -> Any:
+    def from_entity(
+        cls, walls: list[Wall], total_count: int | None, limit: int | None = None
+    ) -> Any:
         walls_dict = [asdict(wall) for wall in walls]
-        return cls().dump({"items": walls_dict, "total_count": total_count})
+        next_cursor = (walls[-1].id,) if limit and len(walls) == limit else None
+        return cls().dump(
+            {
+                "items": walls_dict,
+                "total_count": total_count,
+                "next_cursor": next_cursor,
+            }
+        )
 
 
 wall_collection_params = {
     "name_filter": fields.Str(),
     "mall_id_filter": fields.Int(),
-    "limit": fields.Int(load_default=50),
+    "limit": fields.Int(load_default=DEFAULT_PAGE_LIMIT),
     "page": fields.Int(load_default=1),
+    "count": fields.Enum(CountMode),
+    "cursor": Cursor(fields.Int()),
 }
 
 
@@ -152,24 +222,155 @@ class FootfallResponse(Schema):
 
 
 class FootfallCollectionResponse(Schema):
-    total_count = fields.Int(required=True)
+    total_count = fields.Int(allow_none=True)
     items = fields.Nested(FootfallResponse, many=True)
+    next_cursor = Cursor(fields.DateTime(), fields.Int(), allow_none=True)
 
     class Meta:
         unknown = EXCLUDE
 
     @classmethod
-    def from_entity(cls, footfalls: list[Footfall], total_count: int) -> Any:
+    def from_entity(
+        cls,
+        footfalls: list[Footfall],
+        total_count: int | None,
+        limit: int | None = None,
+    ) -> Any:
         footfalls_dict = [asdict(footfall) for footfall in footfalls]
-        return cls().dump({"items": footfalls_dict, "total_count": total_count})
+        next_cursor = None
+        if limit and len(footfalls) == limit:
+            next_cursor = (footfalls[-1].start_datetime, footfalls[-1].id)
+        return cls().dump(
+            {
+                "items": footfalls_dict,
+                "total_count": total_count,
+                "next_cursor": next_cursor,
+            }
+        )
 
 
-footfall_collection_params = {
-    "is_active_filter": fields.Bool(),
+footfall_filter_params = {
     "wall_id_filter": fields.Int(),
+    "mall_id_filter": fields.Int(),
     "origin_filter": fields.Enum(OriginType),
-    "limit": fields.Int(load_default=50),
+    "start_datetime_from_filter": fields.DateTime(),
+    "start_datetime_to_filter": fields.DateTime(),
+}
+
+
+footfall_collection_params = {
+    **footfall_filter_params,
+    "is_active_filter": fields.Bool(),
+    "limit": fields.Int(load_default=DEFAULT_PAGE_LIMIT),
     "page": fields.Int(load_default=1),
+    "count": fields.Enum(CountMode),
+    "cursor": Cursor(fields.DateTime(), fields.Int()),
+}
+
+
+class FootfallSeriesResponse(Schema):
+    id = fields.Int(required=True)
+    start_datetimes = fields.List(fields.DateTime(), required=True)
+    people_in = fields.List(fields.Int(), required=True)
+    people_out = fields.List(fields.Int(), required=True)
+
+
+class FootfallAggregateResponse(Schema):
+    bucket = fields.Enum(FootfallBucket, required=True)
+    group_by = fields.Enum(FootfallGroup, required=True)
+    series = fields.Nested(FootfallSeriesResponse, many=True)
+
+    @classmethod
+    def from_entity(
+        cls,
+        series: list[FootfallSeries],
+        bucket: FootfallBucket,
+        group_by: FootfallGroup,
+    ) -> Any:
+        return cls().dump(
+            {
+                "bucket": bucket,
+                "group_by": group_by,
+                "series": [asdict(item) for item in series],
+            }
+        )
+
+
+footfall_aggregate_params = {
+    **footfall_filter_params,
+    "is_active_filter": fields.Bool(load_default=True),
+    "bucket": fields.Enum(FootfallBucket, required=True),
+    "group_by": fields.Enum(FootfallGroup, load_default=FootfallGroup.wall),
+}
+
+
+class FootfallOccupancySeriesResponse(Schema):
+    id = fields.Int(required=True)
+    start_datetimes = fields.List(fields.DateTime(), required=True)
+    occupancy = fields.List(fields.Int(), required=True)
+
+
+class FootfallOccupancyResponse(Schema):
+    group_by = fields.Enum(FootfallGroup, required=True)
+    daily_reset = fields.Bool(required=True)
+    series = fields.Nested(FootfallOccupancySeriesResponse, many=True)
+
+    @classmethod
+    def from_entity(
+        cls,
+        series: list[FootfallOccupancy],
+        group_by: FootfallGroup,
+        daily_reset: bool,
+    ) -> Any:
+        return cls().dump(
+            {
+                "group_by": group_by,
+                "daily_reset": daily_reset,
+                "series": [asdict(item) for item in series],
+            }
+        )
+
+
+footfall_occupancy_params = {
+    **footfall_filter_params,
+    "is_active_filter": fields.Bool(load_default=True),
+    "start_datetime_from_filter": fields.DateTime(required=True),
+    "start_datetime_to_filter": fields.DateTime(required=True),
+    "group_by": fields.Enum(FootfallGroup, load_default=FootfallGroup.wall),
+    "daily_reset": fields.Bool(load_default=False),
+}
+
+
+class FootfallPeakHoursResponse(Schema):
+    id = fields.Int(required=True)
+    start_datetimes = fields.List(fields.DateTime(), required=True)
+    traffic = fields.List(fields.Int(), required=True)
+
+
+class FootfallRankingResponse(Schema):
+    wall_ids = fields.List(fields.Int(), required=True)
+    wall_traffic = fields.List(fields.Int(), required=True)
+    peak_hours = fields.Nested(FootfallPeakHoursResponse, many=True)
+
+    @classmethod
+    def from_entity(cls, ranking: FootfallRanking) -> Any:
+        return cls().dump(asdict(ranking))
+
+
+footfall_ranking_params = {
+    "mall_id_filter": fields.Int(),
+    "origin_filter": fields.Enum(OriginType),
+    "is_active_filter": fields.Bool(load_default=True),
+    "start_datetime_from_filter": fields.DateTime(required=True),
+    "start_datetime_to_filter": fields.DateTime(required=True),
+    "walls_limit": fields.Int(
+        load_default=10,
+        validate=Range(min=1, error="Value must not be lower than 1"),
+    ),
+    "hours_limit": fields.Int(
+        load_default=5,
+        validate=Range(min=1, error="Value must not be lower than 1"),
+    ),
 }
 
 
@@ -188,3 +389,66 @@ class FootfallUpdate(Schema):
 
 class FileSchema(Schema):
     file = fields.Raw(type="file")
+
+
+import_data_params: dict[str, fields.Field] = {
+    "dry_run": fields.Bool(),
+    "strategy": fields.Enum(ImportStrategy),
+}
+
+
+class ImportErrorResponse(Schema):
+    message = fields.Str(required=True)
+    row = fields.Int(allow_none=True)
+    wall_id = fields.Int(allow_none=True)
+
+
+class ImportStageResponse(Schema):
+    seconds = fields.Float(required=True)
+    rows = fields.Int(required=True)
+    peak_memory_delta = fields.Int(required=True)
+    round_trips = fields.Int(allow_none=True)
+
+
+class ImportStatsResponse(Schema):
+    seconds = fields.Float(required=True)
+    rows_per_second = fields.Float(required=True)
+    peak_memory_delta = fields.Int(required=True)
+    round_trips = fields.Int(allow_none=True)
+    stages = fields.Dict(keys=fields.Str(), values=fields.Nested(ImportStageResponse))
+
+
+class ImportJobResponse(Schema):
+    id = fields.Int(required=True)
+    file_format = fields.Enum(FileFormat, required=True)
+    compression = fields.Enum(Compression, allow_none=True)
+    dry_run = fields.Bool(required=True)
+    strategy = fields.Enum(ImportStrategy, required=True)
+    status = fields.Enum(ImportJobStatus, required=True)
+    rows_processed = fields.Int(required=True)
+    walls_processed = fields.Int(required=True)
+    rows_superseded = fields.Int(required=True)
+    rows_unchanged = fields.Int(required=True)
+    rows_changed = fields.Int(required=True)
+    rows_new = fields.Int(required=True)
+    details = fields.Str(allow_none=True)
+    errors = fields.Nested(ImportErrorResponse, many=True)
+    stats = fields.Nested(ImportStatsResponse, allow_none=True)
+    created_at = fields.DateTime(allow_none=True)
+    started_at = fields.DateTime(allow_none=True)
+    finished_at = fields.DateTime(allow_none=True)
+    duration_seconds = fields.Method("get_duration_seconds", allow_none=True)
+
+    class Meta:
+        unknown = EXCLUDE
+
+    @staticmethod
+    def get_duration_seconds(import_job: dict[str, Any]) -> float | None:
+        if import_job["started_at"] is None or import_job["finished_at"] is None:
+            return None
+        duration = import_job["finished_at"] - import_job["started_at"]
+        return float(duration.total_seconds())
+
+    @classmethod
+    def from_entity(cls, import_job: ImportJob) -> Any:
+        return cls().dump(asdict(import_job))
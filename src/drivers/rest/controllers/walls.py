@@ -10,6 +10,7 @@ from adapters.repositories.wall_repository.sqlalchemy_repository import (
 )
 from domain.entities.wall import Wall
 from drivers.rest.controllers.schema import (
+    DEFAULT_PAGE_LIMIT,
     WallCollectionResponse,
     WallInput,
     WallResponse,
@@ -17,6 +18,7 @@ from drivers.rest.controllers.schema import (
     wall_collection_params,
 )
 from drivers.rest.utils.openapi import docs
+from drivers.rest.utils.pagination import get_collection
 from drivers.rest.utils.validation import validate_body, validate_int, validate_params
 
 
@@ -41,9 +43,10 @@ class WallController(MethodResource, Resource):
     )
     def get(self, params: dict[str, Any]):
         repository = SQLAlchemyWallRepository(g.session)
-        walls = repository.get_all(**params)
-        count = repository.count(**params)
-        return WallCollectionResponse.from_entity(walls, count)
+        walls, count = get_collection(repository, params)
+        return WallCollectionResponse.from_entity(
+            walls, count, params.get("limit", DEFAULT_PAGE_LIMIT)
+        )
 
 
 class WallItemController(MethodResource, Resource):
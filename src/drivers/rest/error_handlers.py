@@ -1,10 +1,17 @@
+from dataclasses import asdict
 from http import HTTPStatus
+from typing import Any
 
 from flask import Flask, Response, jsonify
 from marshmallow import ValidationError
 
-from adapters.exceptions import BaseNotFoundException, ExternalException
-from use_cases.exceptions import NotValidFileException
+from adapters.exceptions import (
+    BaseAlreadyExistsException,
+    BaseNotFoundException,
+    ExternalException,
+)
+from drivers.rest.utils.upload import FileTooLargeException
+from use_cases.exceptions import IdempotencyKeyReusedException, NotValidFileException
 
 
 def handle_errors(app: Flask) -> None:
@@ -26,8 +33,40 @@ def handle_errors(app: Flask) -> None:
         response.status_code = HTTPStatus.NOT_FOUND
         return response
 
+    @app.errorhandler(BaseAlreadyExistsException)
+    def handle_already_exists_exception(
+        exception: BaseAlreadyExistsException,
+    ) -> Response:
+        response = jsonify({"details": str(exception)})
+        response.status_code = HTTPStatus.CONFLICT
+        return response
+
     @app.errorhandler(NotValidFileException)
     def handle_file_not_valid_exception(exception: NotValidFileException) -> Response:
-        response = jsonify({"details": "The data is not valid."})
+        body: dict[str, Any] = {"details": "The data is not valid."}
+        if exception.errors:
+            body["errors"] = [asdict(error) for error in exception.errors]
+        response = jsonify(body)
+        response.status_code = HTTPStatus.UNPROCESSABLE_ENTITY
+        return response
+
+    @app.errorhandler(FileTooLargeException)
+    def handle_file_too_large_exception(exception: FileTooLargeException) -> Response:
+        response = jsonify({"details": "The file is too large."})
+        response.status_code = HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+        return response
+
+    @app.errorhandler(IdempotencyKeyReusedException)
+    def handle_idempotency_key_reused_exception(
+        exception: IdempotencyKeyReusedException,
+    ) -> Response:
+        response = jsonify(
+            {
+                "details": (
+                    "The idempotency key was already used for a different file "
+                    "or import options."
+                )
+            }
+        )
         response.status_code = HTTPStatus.UNPROCESSABLE_ENTITY
         return response
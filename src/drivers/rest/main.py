@@ -10,7 +10,13 @@ from drivers.rest.controllers.footfalls import (
     FootfallController,
     FootfallItemController,
 )
-from drivers.rest.controllers.footfalls_import_data import FootfallImportDataController
+from drivers.rest.controllers.footfalls_aggregate import FootfallAggregateController
+from drivers.rest.controllers.footfalls_import_data import (
+    FootfallImportDataController,
+    FootfallImportJobController,
+)
+from drivers.rest.controllers.footfalls_occupancy import FootfallOccupancyController
+from drivers.rest.controllers.footfalls_ranking import FootfallRankingController
 from drivers.rest.controllers.healthcheck import HealthCheck
 from drivers.rest.controllers.malls import MallController, MallItemController
 from drivers.rest.controllers.walls import WallController, WallItemController
@@ -45,9 +51,16 @@ def create_app(config_cls: Type[BaseConfig] | None = None) -> Flask:
     api.add_resource(
         FootfallItemController, f"{path_prefix}/footfalls/<string:footfall_id>"
     )
+    api.add_resource(FootfallAggregateController, f"{path_prefix}/footfalls/aggregate")
+    api.add_resource(FootfallOccupancyController, f"{path_prefix}/footfalls/occupancy")
+    api.add_resource(FootfallRankingController, f"{path_prefix}/footfalls/ranking")
     api.add_resource(
         FootfallImportDataController, f"{path_prefix}/footfalls/import-data"
     )
+    api.add_resource(
+        FootfallImportJobController,
+        f"{path_prefix}/footfalls/import-data/<string:job_id>",
+    )
 
     docs = FlaskApiSpec(app)
     docs.register(MallController)
@@ -56,6 +69,10 @@ def create_app(config_cls: Type[BaseConfig] | None = None) -> Flask:
     docs.register(WallItemController)
     docs.register(FootfallController)
     docs.register(FootfallItemController)
+    docs.register(FootfallAggregateController)
+    docs.register(FootfallOccupancyController)
+    docs.register(FootfallRankingController)
     docs.register(FootfallImportDataController)
+    docs.register(FootfallImportJobController)
 
     return app
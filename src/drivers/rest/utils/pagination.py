@@ -0,0 +1,25 @@
+from typing import Any, Protocol, TypeVar
+
+from domain.entities.pagination import CountMode
+
+Item = TypeVar("Item")
+
+
+class CollectionRepository(Protocol[Item]):
+    def get_all(self, **params: Any) -> list[Item]: ...
+
+    def get_all_with_count(self, **params: Any) -> tuple[list[Item], int]: ...
+
+    def estimate_count(self, **filters: Any) -> int: ...
+
+
+def get_collection(
+    repository: CollectionRepository[Item], params: dict[str, Any]
+) -> tuple[list[Item], int | None]:
+    count = params.pop("count", CountMode.exact)
+    if count == CountMode.exact:
+        return repository.get_all_with_count(**params)
+    items = repository.get_all(**params)
+    if count == CountMode.estimate:
+        return items, repository.estimate_count(**params)
+    return items, None
@@ -0,0 +1,147 @@
+import hashlib
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, cast
+
+from flask import request
+from marshmallow import ValidationError
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.formparser import parse_form_data
+
+from domain.entities.footfall_import import Compression, FileFormat
+
+CONTENT_TYPE_FORMATS = {
+    "application/vnd.apache.parquet": FileFormat.parquet,
+    "application/x-parquet": FileFormat.parquet,
+    "application/vnd.apache.arrow.file": FileFormat.arrow,
+    "application/vnd.apache.arrow.stream": FileFormat.arrow,
+    "text/csv": FileFormat.csv,
+}
+EXTENSION_FORMATS = {
+    ".parquet": FileFormat.parquet,
+    ".pq": FileFormat.parquet,
+    ".arrow": FileFormat.arrow,
+    ".arrows": FileFormat.arrow,
+    ".feather": FileFormat.arrow,
+    ".ipc": FileFormat.arrow,
+    ".csv": FileFormat.csv,
+}
+CONTENT_ENCODINGS = {
+    "gzip": Compression.gzip,
+    "x-gzip": Compression.gzip,
+    "zstd": Compression.zstd,
+}
+CONTENT_TYPE_COMPRESSIONS = {
+    "application/gzip": Compression.gzip,
+    "application/x-gzip": Compression.gzip,
+    "application/zstd": Compression.zstd,
+}
+EXTENSION_COMPRESSIONS = {
+    ".gz": Compression.gzip,
+    ".gzip": Compression.gzip,
+    ".zst": Compression.zstd,
+    ".zstd": Compression.zstd,
+}
+
+
+class FileTooLargeException(Exception):
+    pass
+
+
+class _HashingFile:
+    def __init__(self, file: IO[bytes]):
+        self._file = file
+        self.hash = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.hash.update(data)
+        return self._file.write(data)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._file, name)
+
+
+@dataclass
+class SpooledUpload:
+    path: Path
+    content_hash: str
+    file_format: FileFormat = FileFormat.csv
+    compression: Compression | None = None
+
+
+def spool_upload(field_name: str, directory: str, max_size: int) -> SpooledUpload:
+    spooled_files: list[_HashingFile] = []
+
+    def stream_factory(*args: Any, **kwargs: Any) -> IO[bytes]:
+        spooled_file = _HashingFile(
+            tempfile.NamedTemporaryFile(
+                dir=directory, prefix="footfalls-", delete=False
+            )
+        )
+        spooled_files.append(spooled_file)
+        return cast(IO[bytes], spooled_file)
+
+    try:
+        _, _, files = parse_form_data(
+            request.environ, stream_factory=stream_factory, max_content_length=max_size
+        )
+        if field_name not in files:
+            raise ValidationError({field_name: ["Missing data for required field."]})
+        upload = files[field_name]
+        upload_file = cast(_HashingFile, upload.stream)
+        spooled_upload = SpooledUpload(
+            path=Path(upload_file.name),
+            content_hash=upload_file.hash.hexdigest(),
+            file_format=_get_file_format(upload.filename, upload.mimetype),
+            compression=_get_compression(
+                field_name,
+                upload.filename,
+                upload.mimetype,
+                upload.headers.get("Content-Encoding"),
+            ),
+        )
+    except RequestEntityTooLarge:
+        _remove(spooled_files)
+        raise FileTooLargeException
+    except Exception:
+        _remove(spooled_files)
+        raise
+    _remove([f for f in spooled_files if Path(f.name) != spooled_upload.path])
+    upload.close()
+    return spooled_upload
+
+
+def _get_file_format(filename: str | None, content_type: str) -> FileFormat:
+    if content_type in CONTENT_TYPE_FORMATS:
+        return CONTENT_TYPE_FORMATS[content_type]
+    suffixes = [suffix.lower() for suffix in Path(filename or "").suffixes]
+    if suffixes and suffixes[-1] in EXTENSION_COMPRESSIONS:
+        suffixes.pop()
+    return EXTENSION_FORMATS.get(suffixes[-1] if suffixes else "", FileFormat.csv)
+
+
+def _get_compression(
+    field_name: str,
+    filename: str | None,
+    content_type: str,
+    content_encoding: str | None,
+) -> Compression | None:
+    if content_encoding:
+        encoding = content_encoding.strip().lower()
+        if encoding == "identity":
+            return None
+        if encoding not in CONTENT_ENCODINGS:
+            raise ValidationError(
+                {field_name: [f"Unsupported content encoding: {encoding}."]}
+            )
+        return CONTENT_ENCODINGS[encoding]
+    if content_type in CONTENT_TYPE_COMPRESSIONS:
+        return CONTENT_TYPE_COMPRESSIONS[content_type]
+    return EXTENSION_COMPRESSIONS.get(Path(filename or "").suffix.lower())
+
+
+def _remove(spooled_files: list[_HashingFile]) -> None:
+    for spooled_file in spooled_files:
+        spooled_file.close()
+        Path(spooled_file.name).unlink(missing_ok=True)
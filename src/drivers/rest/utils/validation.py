@@ -2,7 +2,7 @@ import functools
 from typing import Any, Callable, ParamSpec, Type, TypeVar
 
 from flask import request
-from marshmallow import Schema, ValidationError
+from marshmallow import Schema, ValidationError, missing
 from marshmallow.fields import Field
 
 Params = ParamSpec("Params")
@@ -26,9 +26,15 @@ def validate_params(params_mapping: dict[str, Field]) -> Callable[..., Any]:
     def decorator(fn: Callable[Params, ReturnType]) -> Callable[Params, ReturnType]:
         @functools.wraps(fn)
         def wrapper(*args: Params.args, **kwargs: Params.kwargs) -> ReturnType:
-            schema = Schema.from_dict(
+            fields: dict[str, Field | type] = {
+                name: field
+                for name, field in params_mapping.items()
+                if field.required or field.load_default is not missing
+            }
+            fields.update(
                 {name: params_mapping.get(name) for name, value in request.args.items()}  # type: ignore
             )
+            schema = Schema.from_dict(fields)
             params = schema().load(request.args)
             return fn(params=params, *args, **kwargs)
 
@@ -0,0 +1,77 @@
+import logging
+import time
+from datetime import timedelta
+from functools import partial
+from typing import Type
+
+from adapters.exceptions import ExternalException
+from adapters.repositories.footfall_repository.sqlalchemy_repository import (
+    SQLAlchemyFootfallRepository,
+)
+from adapters.repositories.import_job_repository.sqlalchemy_repository import (
+    SQLAlchemyImportJobRepository,
+)
+from adapters.repositories.wall_repository.sqlalchemy_repository import (
+    SQLAlchemyWallRepository,
+)
+from drivers.infrastructure.database import (
+    create_footfall_repository,
+    create_session_maker,
+    get_round_trips,
+)
+from drivers.rest.config import BaseConfig, get_config_cls
+from logger import configure_logging
+from use_cases.process_footfalls_use_case import ProcessFootfallsUseCase
+from use_cases.run_import_job_use_case import RunImportJobUseCase
+
+logger = logging.getLogger()
+
+
+def run(config_cls: Type[BaseConfig] | None = None) -> None:
+    if config_cls is None:
+        config_cls = get_config_cls()
+    config = config_cls()
+    configure_logging(config)
+    session_maker = create_session_maker(config.database_url)
+    read_only_session_maker = create_session_maker(config.database_url, read_only=True)
+    logger.info("Import worker started")
+    while True:
+        with (
+            session_maker() as job_session,
+            session_maker() as heartbeat_session,
+            session_maker() as import_session,
+            read_only_session_maker() as validation_session,
+        ):
+            use_case = RunImportJobUseCase(
+                SQLAlchemyImportJobRepository(job_session),
+                ProcessFootfallsUseCase(
+                    SQLAlchemyFootfallRepository(import_session),
+                    chunk_size=config.IMPORT_CHUNK_SIZE,
+                    workers=config.IMPORT_WORKERS,
+                    shard_repository_factory=partial(
+                        create_footfall_repository, config.database_url
+                    ),
+                    wall_repository=SQLAlchemyWallRepository(import_session),
+                    round_trips=partial(get_round_trips, import_session),
+                ),
+                ProcessFootfallsUseCase(
+                    SQLAlchemyFootfallRepository(validation_session),
+                    chunk_size=config.IMPORT_CHUNK_SIZE,
+                    wall_repository=SQLAlchemyWallRepository(validation_session),
+                    round_trips=partial(get_round_trips, validation_session),
+                ),
+                lease=timedelta(seconds=config.IMPORT_JOB_LEASE),
+                heartbeat_repository=SQLAlchemyImportJobRepository(heartbeat_session),
+            )
+            try:
+                import_job = use_case()
+            except ExternalException:
+                import_job = None
+        if import_job is None:
+            time.sleep(config.IMPORT_WORKER_POLL_INTERVAL)
+        else:
+            logger.info("Import job %s %s", import_job.id, import_job.status)
+
+
+if __name__ == "__main__":
+    run()
@@ -1,9 +1,10 @@
 from logging.config import fileConfig
+from typing import Any
 
 from alembic import context
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import Table, engine_from_config, pool
 
-from adapters.repositories.models import Base
+from adapters.repositories.models import FOOTFALL_PARTITION_PATTERN, Base
 from drivers.rest.config import get_config_cls
 
 # this is the Alembic Config object, which provides
@@ -33,6 +34,20 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+def include_object(
+    object: Any, name: str | None, type_: str, reflected: bool, compare_to: Any
+) -> bool:
+    # Footfall partitions, attached or detached, are created by the partition
+    # maintenance rather than by migrations.
+    if type_ == "table":
+        table_name = name
+    elif isinstance(getattr(object, "table", None), Table):
+        table_name = object.table.name
+    else:
+        return True
+    return not (table_name and FOOTFALL_PARTITION_PATTERN.fullmatch(table_name))
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -49,6 +64,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -71,7 +87,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,36 @@
+"""import job file format
+
+Revision ID: a3c7d52e9b14
+Revises: 5f5f3149bd09
+Create Date: 2026-10-17 14:03:27.519842
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c7d52e9b14"
+down_revision: Union[str, None] = "5f5f3149bd09"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE TYPE fileformat AS ENUM ('csv', 'parquet', 'arrow')")
+    op.add_column(
+        "import_job",
+        sa.Column(
+            "file_format",
+            sa.Enum("csv", "parquet", "arrow", name="fileformat"),
+            server_default="csv",
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("import_job", "file_format")
+    op.execute("DROP TYPE fileformat")
@@ -0,0 +1,35 @@
+"""import job compression
+
+Revision ID: c81e4f0a6d27
+Revises: a3c7d52e9b14
+Create Date: 2026-10-17 16:21:48.730215
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c81e4f0a6d27"
+down_revision: Union[str, None] = "a3c7d52e9b14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE TYPE compression AS ENUM ('gzip', 'zstd')")
+    op.add_column(
+        "import_job",
+        sa.Column(
+            "compression",
+            sa.Enum("gzip", "zstd", name="compression"),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("import_job", "compression")
+    op.execute("DROP TYPE compression")
@@ -0,0 +1,42 @@
+"""import job diff counts
+
+Revision ID: 4e8a0c6f2b71
+Revises: 7d2f41a9c3e5
+Create Date: 2026-10-18 14:05:12.318964
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4e8a0c6f2b71"
+down_revision: Union[str, None] = "7d2f41a9c3e5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TYPE importstrategy ADD VALUE 'diff'")
+    for column in ("rows_unchanged", "rows_changed", "rows_new"):
+        op.add_column(
+            "import_job",
+            sa.Column(column, sa.Integer(), server_default="0", nullable=False),
+        )
+
+
+def downgrade() -> None:
+    for column in ("rows_new", "rows_changed", "rows_unchanged"):
+        op.drop_column("import_job", column)
+    op.execute("UPDATE import_job SET strategy = 'history' WHERE strategy = 'diff'")
+    op.alter_column("import_job", "strategy", server_default=None)
+    op.execute("ALTER TYPE importstrategy RENAME TO importstrategy_old")
+    op.execute("CREATE TYPE importstrategy AS ENUM ('history', 'upsert')")
+    op.execute(
+        "ALTER TABLE import_job ALTER COLUMN strategy TYPE importstrategy "
+        "USING strategy::text::importstrategy"
+    )
+    op.execute("DROP TYPE importstrategy_old")
+    op.alter_column("import_job", "strategy", server_default="history")
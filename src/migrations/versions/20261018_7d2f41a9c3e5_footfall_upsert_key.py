@@ -0,0 +1,73 @@
+"""footfall upsert key
+
+Revision ID: 7d2f41a9c3e5
+Revises: 1b6d83f5a0c9
+Create Date: 2026-10-18 09:27:44.602187
+
+"""
+
+import logging
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7d2f41a9c3e5"
+down_revision: Union[str, None] = "1b6d83f5a0c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def upgrade() -> None:
+    # The unique index only allows one active version of a wall, hour and origin:
+    # older duplicates are kept as inactive history rows.
+    deactivated = op.get_bind().execute(
+        sa.text(
+            """
+            UPDATE footfall AS older
+            SET is_active = false
+            FROM footfall AS newer
+            WHERE older.is_active
+                AND newer.is_active
+                AND newer.wall_id = older.wall_id
+                AND newer.start_datetime = older.start_datetime
+                AND newer.origin = older.origin
+                AND newer.id > older.id
+            """
+        )
+    )
+    if deactivated.rowcount:
+        logger.warning(
+            "Deactivated %s duplicate active footfalls, newest version kept",
+            deactivated.rowcount,
+        )
+    op.create_index(
+        "uq_footfall_active_wall_id_start_datetime_origin",
+        "footfall",
+        ["wall_id", "start_datetime", "origin"],
+        unique=True,
+        postgresql_where=sa.text("is_active"),
+    )
+    op.execute("CREATE TYPE importstrategy AS ENUM ('history', 'upsert')")
+    op.add_column(
+        "import_job",
+        sa.Column(
+            "strategy",
+            sa.Enum("history", "upsert", name="importstrategy"),
+            server_default="history",
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("import_job", "strategy")
+    op.execute("DROP TYPE importstrategy")
+    op.drop_index(
+        "uq_footfall_active_wall_id_start_datetime_origin",
+        table_name="footfall",
+        postgresql_where=sa.text("is_active"),
+    )
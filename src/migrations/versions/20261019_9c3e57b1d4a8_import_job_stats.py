@@ -0,0 +1,26 @@
+"""import job stats
+
+Revision ID: 9c3e57b1d4a8
+Revises: 4e8a0c6f2b71
+Create Date: 2026-10-19 10:12:37.504213
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c3e57b1d4a8"
+down_revision: Union[str, None] = "4e8a0c6f2b71"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("import_job", sa.Column("stats", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("import_job", "stats")
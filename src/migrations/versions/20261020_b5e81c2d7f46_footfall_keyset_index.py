@@ -0,0 +1,36 @@
+"""footfall keyset index
+
+Revision ID: b5e81c2d7f46
+Revises: 9c3e57b1d4a8
+Create Date: 2026-10-20 09:41:18.273905
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e81c2d7f46"
+down_revision: Union[str, None] = "9c3e57b1d4a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_footfall_start_datetime_id",
+            "footfall",
+            ["start_datetime", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_footfall_start_datetime_id",
+            table_name="footfall",
+            postgresql_concurrently=True,
+        )
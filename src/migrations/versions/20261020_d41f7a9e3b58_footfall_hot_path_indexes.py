@@ -0,0 +1,55 @@
+"""footfall hot path indexes
+
+Revision ID: d41f7a9e3b58
+Revises: b5e81c2d7f46
+Create Date: 2026-10-20 14:06:52.918340
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d41f7a9e3b58"
+down_revision: Union[str, None] = "b5e81c2d7f46"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_footfall_wall_id_start_datetime_id",
+            "footfall",
+            ["wall_id", "start_datetime", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_footfall_active_start_datetime_id",
+            "footfall",
+            ["start_datetime", "id"],
+            postgresql_where=sa.text("is_active"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_wall_mall_id", "wall", ["mall_id"], postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_wall_mall_id", table_name="wall", postgresql_concurrently=True
+        )
+        op.drop_index(
+            "ix_footfall_active_start_datetime_id",
+            table_name="footfall",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_footfall_wall_id_start_datetime_id",
+            table_name="footfall",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,96 @@
+"""footfall monthly partitions
+
+Revision ID: 6a0d2c9f8e13
+Revises: d41f7a9e3b58
+Create Date: 2026-10-21 08:52:31.640127
+
+"""
+
+from datetime import datetime
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6a0d2c9f8e13"
+down_revision: Union[str, None] = "d41f7a9e3b58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    month = value.year * 12 + value.month - 1 + months
+    return datetime(month // 12, month % 12 + 1, 1)
+
+
+def _create_indexes() -> None:
+    op.create_index(
+        "uq_footfall_active_wall_id_start_datetime_origin",
+        "footfall",
+        ["wall_id", "start_datetime", "origin"],
+        unique=True,
+        postgresql_where=sa.text("is_active"),
+    )
+    op.create_index(
+        "ix_footfall_start_datetime_id", "footfall", ["start_datetime", "id"]
+    )
+    op.create_index(
+        "ix_footfall_wall_id_start_datetime_id",
+        "footfall",
+        ["wall_id", "start_datetime", "id"],
+    )
+    op.create_index(
+        "ix_footfall_active_start_datetime_id",
+        "footfall",
+        ["start_datetime", "id"],
+        postgresql_where=sa.text("is_active"),
+    )
+
+
+def _replace_footfall(primary_key: str) -> None:
+    op.execute("INSERT INTO footfall_new SELECT * FROM footfall")
+    op.execute("ALTER SEQUENCE footfall_id_seq OWNED BY footfall_new.id")
+    op.execute("DROP TABLE footfall")
+    op.execute("ALTER TABLE footfall_new RENAME TO footfall")
+    op.execute(f"ALTER TABLE footfall ADD CONSTRAINT footfall_pkey {primary_key}")
+    op.execute(
+        """
+        ALTER TABLE footfall ADD CONSTRAINT footfall_wall_id_fkey
+        FOREIGN KEY (wall_id) REFERENCES wall (id) ON DELETE CASCADE
+        """
+    )
+    _create_indexes()
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE footfall_new (LIKE footfall INCLUDING DEFAULTS)
+        PARTITION BY RANGE (start_datetime)
+        """
+    )
+    now = datetime.now()
+    first_datetime = op.get_bind().scalar(
+        sa.text("SELECT min(start_datetime) FROM footfall")
+    )
+    first_datetime = min(first_datetime or now, now)
+    month = datetime(first_datetime.year, first_datetime.month, 1)
+    while month <= _add_months(now, MONTHS_AHEAD):
+        next_month = _add_months(month, 1)
+        op.execute(
+            f"""
+            CREATE TABLE footfall_{month:%Y_%m} PARTITION OF footfall_new
+            FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')
+            """
+        )
+        month = next_month
+    op.execute("CREATE TABLE footfall_default PARTITION OF footfall_new DEFAULT")
+    _replace_footfall("PRIMARY KEY (id, start_datetime)")
+
+
+def downgrade() -> None:
+    op.execute("CREATE TABLE footfall_new (LIKE footfall INCLUDING DEFAULTS)")
+    _replace_footfall("PRIMARY KEY (id)")
@@ -0,0 +1,77 @@
+"""footfall daily rollups
+
+Revision ID: 3f7b9e2a5c61
+Revises: 6a0d2c9f8e13
+Create Date: 2026-10-22 10:31:07.482915
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "3f7b9e2a5c61"
+down_revision: Union[str, None] = "6a0d2c9f8e13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "footfall_daily_wall",
+        sa.Column("wall_id", sa.Integer(), nullable=False),
+        sa.Column("start_datetime", sa.DateTime(), nullable=False),
+        sa.Column(
+            "origin",
+            postgresql.ENUM(name="origintype", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("people_in", sa.Integer(), nullable=False),
+        sa.Column("people_out", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["wall_id"], ["wall.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("wall_id", "start_datetime", "origin"),
+    )
+    op.create_table(
+        "footfall_daily_mall",
+        sa.Column("mall_id", sa.Integer(), nullable=False),
+        sa.Column("start_datetime", sa.DateTime(), nullable=False),
+        sa.Column(
+            "origin",
+            postgresql.ENUM(name="origintype", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("people_in", sa.Integer(), nullable=False),
+        sa.Column("people_out", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["mall_id"], ["mall.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("mall_id", "start_datetime", "origin"),
+    )
+    op.execute(
+        """
+        INSERT INTO footfall_daily_wall
+        SELECT wall_id, date_trunc('day', start_datetime), origin,
+            sum(people_in), sum(people_out)
+        FROM footfall
+        WHERE is_active
+        GROUP BY wall_id, date_trunc('day', start_datetime), origin
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO footfall_daily_mall
+        SELECT wall.mall_id, footfall_daily_wall.start_datetime,
+            footfall_daily_wall.origin, sum(footfall_daily_wall.people_in),
+            sum(footfall_daily_wall.people_out)
+        FROM footfall_daily_wall
+        JOIN wall ON wall.id = footfall_daily_wall.wall_id
+        GROUP BY wall.mall_id, footfall_daily_wall.start_datetime,
+            footfall_daily_wall.origin
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("footfall_daily_mall")
+    op.drop_table("footfall_daily_wall")
@@ -0,0 +1,27 @@
+"""import job claimed at
+
+Revision ID: 8c4e1f6b2d97
+Revises: 3f7b9e2a5c61
+Create Date: 2026-10-23 09:12:35.918264
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c4e1f6b2d97"
+down_revision: Union[str, None] = "3f7b9e2a5c61"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("import_job", sa.Column("claimed_at", sa.DateTime(), nullable=True))
+    op.execute("UPDATE import_job SET claimed_at = started_at WHERE status = 'running'")
+
+
+def downgrade() -> None:
+    op.drop_column("import_job", "claimed_at")
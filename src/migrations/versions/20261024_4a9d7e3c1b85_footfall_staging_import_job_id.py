@@ -0,0 +1,32 @@
+"""footfall staging import job id
+
+Revision ID: 4a9d7e3c1b85
+Revises: 8c4e1f6b2d97
+Create Date: 2026-10-24 10:04:51.237609
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4a9d7e3c1b85"
+down_revision: Union[str, None] = "8c4e1f6b2d97"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "footfall_staging", sa.Column("import_job_id", sa.Integer(), nullable=True)
+    )
+    op.create_index(
+        "ix_footfall_staging_import_job_id", "footfall_staging", ["import_job_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_footfall_staging_import_job_id", table_name="footfall_staging")
+    op.drop_column("footfall_staging", "import_job_id")
@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+
+from domain.entities.footfall import FootfallPartition
+
+
+class FootfallPartitionRepository(ABC):
+    @abstractmethod
+    def get_all(self) -> list[FootfallPartition]:
+        pass
+
+    @abstractmethod
+    def add(self, partition: FootfallPartition) -> None:
+        pass
+
+    @abstractmethod
+    def detach(self, partition: FootfallPartition) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, partition: FootfallPartition) -> None:
+        pass
@@ -1,10 +1,22 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, ContextManager
 
-from domain.entities.footfall import Footfall
+from domain.entities.footfall import Footfall, FootfallBatch, FootfallRange
+from domain.entities.footfall_aggregate import (
+    FootfallBucket,
+    FootfallGroup,
+    FootfallOccupancy,
+    FootfallRanking,
+    FootfallSeries,
+)
+from domain.entities.footfall_import import ImportStrategy
 
 
 class FootfallRepository(ABC):
+    @abstractmethod
+    def atomic(self) -> ContextManager[None]:
+        pass
+
     @abstractmethod
     def add(self, footfall: Footfall) -> Footfall:
         pass
@@ -26,5 +38,68 @@ class FootfallRepository(ABC):
         pass
 
     @abstractmethod
-    def add_batch(self, footfalls: list[Footfall]) -> None:
+    def aggregate(
+        self, bucket: FootfallBucket, group_by: FootfallGroup, **filters: Any
+    ) -> list[FootfallSeries]:
+        pass
+
+    @abstractmethod
+    def occupancy(
+        self, group_by: FootfallGroup, daily_reset: bool = False, **filters: Any
+    ) -> list[FootfallOccupancy]:
+        pass
+
+    @abstractmethod
+    def rank(
+        self, walls_limit: int, hours_limit: int, **filters: Any
+    ) -> FootfallRanking:
+        pass
+
+    @abstractmethod
+    def rebuild_rollups(self) -> None:
+        pass
+
+    @abstractmethod
+    def add_batch(self, footfalls: list[Footfall] | FootfallBatch) -> None:
+        pass
+
+    @abstractmethod
+    def replace_batch(
+        self, footfalls: list[Footfall] | FootfallBatch, ranges: list[FootfallRange]
+    ) -> None:
+        pass
+
+    @abstractmethod
+    def stage_batch(
+        self,
+        staging_key: str,
+        footfalls: FootfallBatch,
+        import_job_id: int | None = None,
+    ) -> None:
+        pass
+
+    @abstractmethod
+    def upsert_batch(self, footfalls: FootfallBatch) -> None:
+        pass
+
+    @abstractmethod
+    def apply_staged(
+        self, staging_key: str, strategy: ImportStrategy = ImportStrategy.history
+    ) -> None:
+        pass
+
+    @abstractmethod
+    def discard_staged(self, staging_key: str) -> None:
+        pass
+
+    @abstractmethod
+    def purge_staged(self, import_job_id: int | None = None) -> int:
+        pass
+
+    @abstractmethod
+    def get_active_in_ranges(self, ranges: list[FootfallRange]) -> FootfallBatch:
+        pass
+
+    @abstractmethod
+    def count_active_in_ranges(self, ranges: list[FootfallRange]) -> int:
         pass
@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import Any, ContextManager
+
+from domain.entities.import_job import ImportJob
+
+
+class ImportJobRepository(ABC):
+    @abstractmethod
+    def atomic(self) -> ContextManager[None]:
+        pass
+
+    @abstractmethod
+    def add(self, import_job: ImportJob) -> ImportJob:
+        pass
+
+    @abstractmethod
+    def get(self, **filters: Any) -> ImportJob:
+        pass
+
+    @abstractmethod
+    def update(self, fields_to_update: dict[str, Any], **filters: Any) -> None:
+        pass
+
+    @abstractmethod
+    def claim_next(self, lease: timedelta) -> ImportJob | None:
+        pass
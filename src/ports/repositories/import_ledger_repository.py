@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from typing import Any, ContextManager
+
+from domain.entities.import_ledger import ImportLedgerEntry
+
+
+class ImportLedgerRepository(ABC):
+    @abstractmethod
+    def atomic(self) -> ContextManager[None]:
+        pass
+
+    @abstractmethod
+    def add(self, entry: ImportLedgerEntry) -> ImportLedgerEntry:
+        pass
+
+    @abstractmethod
+    def get(self, **filters: Any) -> ImportLedgerEntry:
+        pass
+
+    @abstractmethod
+    def update(self, fields_to_update: dict[str, Any], **filters: Any) -> None:
+        pass
@@ -24,3 +24,7 @@ class WallRepository(ABC):
     @abstractmethod
     def get_all(self, **filters: Any) -> list[Wall]:
         pass
+
+    @abstractmethod
+    def get_existing_ids(self, ids: list[int]) -> set[int]:
+        pass
@@ -6,10 +6,24 @@ from sqlalchemy.orm import sessionmaker
 from adapters.repositories.footfall_repository.sqlalchemy_repository import (
     SQLAlchemyFootfallRepository,
 )
+from adapters.repositories.import_job_repository.sqlalchemy_repository import (
+    SQLAlchemyImportJobRepository,
+)
+from adapters.repositories.import_ledger_repository.sqlalchemy_repository import (
+    SQLAlchemyImportLedgerRepository,
+)
 from adapters.repositories.mall_repository.sqlalchemy_repository import (
     SQLAlchemyMallRepository,
 )
-from adapters.repositories.models import Base, FootfallORM, MallORM, WallORM
+from adapters.repositories.models import (
+    Base,
+    FootfallORM,
+    FootfallStagingORM,
+    ImportJobORM,
+    ImportLedgerORM,
+    MallORM,
+    WallORM,
+)
 from adapters.repositories.wall_repository.sqlalchemy_repository import (
     SQLAlchemyWallRepository,
 )
@@ -55,9 +69,26 @@ def footfall_repository(db_session):
     return SQLAlchemyFootfallRepository(db_session)
 
 
+@pytest.fixture
+def import_job_repository(db_session):
+    return SQLAlchemyImportJobRepository(db_session)
+
+
+@pytest.fixture
+def import_ledger_repository(db_session):
+    return SQLAlchemyImportLedgerRepository(db_session)
+
+
 @pytest.fixture(autouse=True)
 def truncate_tables(db_session):
-    for table in (WallORM, MallORM, FootfallORM):
+    for table in (
+        WallORM,
+        MallORM,
+        FootfallORM,
+        FootfallStagingORM,
+        ImportLedgerORM,
+        ImportJobORM,
+    ):
         db_session.execute(sa.delete(table))
 
 
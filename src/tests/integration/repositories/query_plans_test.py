@@ -0,0 +1,173 @@
+from datetime import datetime, timedelta
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ClauseElement
+
+from adapters.repositories.footfall_repository.sqlalchemy_repository import (
+    SQLAlchemyFootfallRepository,
+)
+from adapters.repositories.models import FootfallORM, MallORM, WallORM
+from adapters.repositories.utils import Explain
+from adapters.repositories.wall_repository.sqlalchemy_repository import (
+    SQLAlchemyWallRepository,
+)
+from domain.entities.footfall import FootfallRange, OriginType
+
+START_DATETIME = datetime(2024, 3, 1)
+
+
+@pytest.fixture(name="walls")
+def walls_fixture(db_session: Session) -> list[WallORM]:
+    # Enough rows for the planner to prefer the indexes over sequential scans
+    # on its own statistics.
+    mall = MallORM(name="Test Mall")
+    walls = [WallORM(name=f"Test Wall {i}", mall=mall) for i in range(5)]
+    db_session.add_all(walls)
+    db_session.flush()
+    db_session.execute(
+        sa.insert(MallORM).from_select(
+            ["name"],
+            sa.select(
+                sa.literal("Another Mall ") + sa.cast(sa.column("i"), sa.String)
+            ).select_from(sa.func.generate_series(1, 50).alias("i")),
+        )
+    )
+    db_session.execute(
+        sa.insert(WallORM).from_select(
+            ["name", "mall_id"],
+            sa.select(
+                sa.literal("Another Wall ") + sa.cast(sa.column("i"), sa.String),
+                MallORM.id,
+            )
+            .select_from(MallORM)
+            .join(sa.func.generate_series(1, 100).alias("i"), sa.true())
+            .where(MallORM.id != mall.id),
+        )
+    )
+    # The test walls and 45 others get 200 hourly footfalls each.
+    footfall_walls = sa.select(WallORM.id).order_by(WallORM.id).limit(50).subquery()
+    hours = sa.func.generate_series(0, 199).alias("hour")
+    hour = sa.column("hour", sa.Integer)
+    db_session.execute(
+        sa.insert(FootfallORM).from_select(
+            [
+                "start_datetime",
+                "end_datetime",
+                "people_in",
+                "people_out",
+                "is_active",
+                "origin",
+                "wall_id",
+            ],
+            sa.select(
+                START_DATETIME + sa.func.make_interval(0, 0, 0, 0, hour),
+                START_DATETIME + sa.func.make_interval(0, 0, 0, 0, hour + 1),
+                sa.literal(100),
+                sa.literal(90),
+                hour % 4 != 0,
+                sa.literal(OriginType.raw.name),
+                footfall_walls.c.id,
+            )
+            .select_from(footfall_walls)
+            .join(hours, sa.true()),
+        )
+    )
+    db_session.execute(sa.text("ANALYZE footfall"))
+    db_session.execute(sa.text("ANALYZE wall"))
+    return walls
+
+
+def get_index_names(session: Session, query: ClauseElement) -> set[str]:
+    def walk(node: dict[str, Any]) -> set[str]:
+        names = {node["Index Name"]} if "Index Name" in node else set()
+        for child in node.get("Plans", []):
+            names |= walk(child)
+        return names
+
+    plan = session.scalar(Explain(query))
+    names = walk(plan[0]["Plan"])
+    # Scans on footfall partitions use the partition's copy of the parent index.
+    parent_names = session.scalars(
+        sa.text(
+            """
+            SELECT parent.relname
+            FROM pg_inherits
+            JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid
+            JOIN pg_class AS parent ON parent.oid = pg_inherits.inhparent
+            WHERE child.relname = ANY(:names)
+            """
+        ),
+        {"names": list(names)},
+    )
+    return names | set(parent_names)
+
+
+def get_page_query(**filters: Any) -> sa.Select[Any]:
+    return SQLAlchemyFootfallRepository._get_page_query(
+        1, 50, None, SQLAlchemyFootfallRepository._get_filter_expressions(filters)
+    )
+
+
+def test_get_all_footfalls_uses_start_datetime_index(
+    db_session: Session, walls: list[WallORM]
+):
+    query = get_page_query()
+    assert "ix_footfall_start_datetime_id" in get_index_names(db_session, query)
+
+
+def test_get_all_footfalls_by_wall_uses_wall_index(
+    db_session: Session, walls: list[WallORM]
+):
+    query = get_page_query(wall_id_filter=walls[0].id)
+    assert "ix_footfall_wall_id_start_datetime_id" in get_index_names(db_session, query)
+
+
+def test_get_all_active_footfalls_uses_partial_index(
+    db_session: Session, walls: list[WallORM]
+):
+    query = get_page_query(is_active_filter=True)
+    assert "ix_footfall_active_start_datetime_id" in get_index_names(db_session, query)
+
+
+def test_count_footfalls_between_dates_uses_start_datetime_index(
+    db_session: Session, walls: list[WallORM]
+):
+    filters = {
+        "start_date_between_filter": (
+            START_DATETIME,
+            START_DATETIME + timedelta(hours=5),
+        )
+    }
+    query = (
+        sa.select(sa.func.count())
+        .select_from(FootfallORM)
+        .where(*SQLAlchemyFootfallRepository._get_filter_expressions(filters))
+    )
+    assert "ix_footfall_start_datetime_id" in get_index_names(db_session, query)
+
+
+def test_invalidate_footfalls_uses_wall_index(
+    db_session: Session, walls: list[WallORM]
+):
+    ranges = [
+        FootfallRange(
+            wall_id=walls[0].id,
+            start_datetime=START_DATETIME,
+            end_datetime=START_DATETIME + timedelta(hours=5),
+        )
+    ]
+    query = SQLAlchemyFootfallRepository._get_invalidate_query(ranges)
+    assert "ix_footfall_wall_id_start_datetime_id" in get_index_names(db_session, query)
+
+
+def test_get_all_walls_by_mall_uses_mall_index(
+    db_session: Session, walls: list[WallORM]
+):
+    filters = SQLAlchemyWallRepository._get_filter_expressions(
+        {"mall_id_filter": walls[0].mall_id}
+    )
+    query = SQLAlchemyWallRepository._get_page_query(1, 50, None, filters)
+    assert "ix_wall_mall_id" in get_index_names(db_session, query)
@@ -0,0 +1,163 @@
+from datetime import datetime, timedelta
+from typing import Callable
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from adapters.exceptions import DatabaseException
+from adapters.repositories.footfall_partition_repository.sqlalchemy_repository import (
+    SQLAlchemyFootfallPartitionRepository,
+)
+from adapters.repositories.footfall_repository.sqlalchemy_repository import (
+    SQLAlchemyFootfallRepository,
+)
+from adapters.repositories.mall_repository.sqlalchemy_repository import (
+    SQLAlchemyMallRepository,
+)
+from adapters.repositories.models import (
+    FootfallDailyMallORM,
+    FootfallDailyWallORM,
+    FootfallORM,
+)
+from adapters.repositories.utils import Explain
+from adapters.repositories.wall_repository.sqlalchemy_repository import (
+    SQLAlchemyWallRepository,
+)
+from domain.entities.footfall import Footfall, FootfallPartition, OriginType
+from domain.entities.mall import Mall
+from domain.entities.wall import Wall
+
+PARTITION = FootfallPartition(
+    name="footfall_2024_03",
+    start_datetime=datetime(2024, 3, 1),
+    end_datetime=datetime(2024, 4, 1),
+)
+
+
+@pytest.fixture
+def partition_repository(db_session: Session):
+    yield SQLAlchemyFootfallPartitionRepository(db_session)
+    db_session.rollback()
+    db_session.execute(sa.text(f"DROP TABLE IF EXISTS {PARTITION.name}"))
+    db_session.commit()
+
+
+@pytest.fixture(name="create_footfall")
+def create_footfall_fixture(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    wall_repository: SQLAlchemyWallRepository,
+    mall_repository: SQLAlchemyMallRepository,
+):
+    mall = mall_repository.add(Mall(name="Test Mall"))
+    assert mall.id
+    wall_id = wall_repository.add(Wall(name="Test Wall", mall_id=mall.id)).id
+    assert wall_id
+
+    def inner(start_datetime: datetime) -> Footfall:
+        return footfall_repository.add(
+            Footfall(
+                start_datetime=start_datetime,
+                end_datetime=start_datetime + timedelta(hours=1),
+                people_in=100,
+                people_out=90,
+                is_active=True,
+                origin=OriginType.raw,
+                wall_id=wall_id,
+            )
+        )
+
+    return inner
+
+
+def count_rows(session: Session, table: str) -> int:
+    return session.scalar(sa.text(f"SELECT count(*) FROM ONLY {table}")) or 0
+
+
+def get_rollup_days(session: Session) -> list[tuple[datetime, datetime]]:
+    walls = session.scalars(sa.select(FootfallDailyWallORM.start_datetime)).all()
+    malls = session.scalars(sa.select(FootfallDailyMallORM.start_datetime)).all()
+    return list(zip(walls, malls))
+
+
+def test_add_footfall_partition_moves_default_rows(
+    partition_repository: SQLAlchemyFootfallPartitionRepository,
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+    db_session: Session,
+):
+    create_footfall(datetime(2024, 3, 10, 12))
+    create_footfall(datetime(2024, 4, 1))
+
+    partition_repository.add(PARTITION)
+    assert partition_repository.get_all() == [PARTITION]
+    assert count_rows(db_session, PARTITION.name) == 1
+    assert count_rows(db_session, "footfall_default") == 1
+    assert footfall_repository.count() == 2
+
+    create_footfall(datetime(2024, 3, 31, 23))
+    assert count_rows(db_session, PARTITION.name) == 2
+
+
+def test_footfall_date_range_prunes_partitions(
+    partition_repository: SQLAlchemyFootfallPartitionRepository,
+    db_session: Session,
+):
+    partition_repository.add(PARTITION)
+    filters = {
+        "start_date_between_filter": (datetime(2024, 3, 1), datetime(2024, 3, 31))
+    }
+    query = (
+        sa.select(sa.func.count())
+        .select_from(FootfallORM)
+        .where(*SQLAlchemyFootfallRepository._get_filter_expressions(filters))
+    )
+    plan = str(db_session.scalar(Explain(query)))
+    assert PARTITION.name in plan
+    assert "footfall_default" not in plan
+
+
+def test_detach_footfall_partition(
+    partition_repository: SQLAlchemyFootfallPartitionRepository,
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+    db_session: Session,
+):
+    partition_repository.add(PARTITION)
+    create_footfall(datetime(2024, 3, 10, 12))
+    create_footfall(datetime(2024, 4, 1))
+
+    partition_repository.detach(PARTITION)
+    assert partition_repository.get_all() == []
+    assert footfall_repository.count() == 1
+    assert count_rows(db_session, PARTITION.name) == 1
+    assert get_rollup_days(db_session) == [(datetime(2024, 4, 1),) * 2]
+
+
+def test_delete_footfall_partition(
+    partition_repository: SQLAlchemyFootfallPartitionRepository,
+    create_footfall: Callable[..., Footfall],
+    db_session: Session,
+):
+    partition_repository.add(PARTITION)
+    create_footfall(datetime(2024, 3, 10, 12))
+    create_footfall(datetime(2024, 4, 1))
+
+    partition_repository.delete(PARTITION)
+    assert partition_repository.get_all() == []
+    assert not sa.inspect(db_session.connection()).has_table(PARTITION.name)
+    assert get_rollup_days(db_session) == [(datetime(2024, 4, 1),) * 2]
+
+
+def test_add_footfall_partition_overlapping(
+    partition_repository: SQLAlchemyFootfallPartitionRepository,
+):
+    partition_repository.add(PARTITION)
+    with pytest.raises(DatabaseException):
+        partition_repository.add(
+            FootfallPartition(
+                name="footfall_2024_03_overlap",
+                start_datetime=datetime(2024, 3, 15),
+                end_datetime=datetime(2024, 4, 15),
+            )
+        )
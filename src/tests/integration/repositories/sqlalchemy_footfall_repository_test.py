@@ -1,21 +1,54 @@
+from dataclasses import replace
 from datetime import datetime, timedelta, timezone
-from typing import Callable
+from typing import Any, Callable
 
 import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
 
-from adapters.exceptions import FootfallNotFoundException, WallNotFoundException
+from adapters.exceptions import (
+    DatabaseException,
+    FootfallAlreadyExistsException,
+    FootfallNotFoundException,
+    WallNotFoundException,
+)
 from adapters.repositories.footfall_repository.sqlalchemy_repository import (
     SQLAlchemyFootfallRepository,
 )
+from adapters.repositories.import_job_repository.sqlalchemy_repository import (
+    SQLAlchemyImportJobRepository,
+)
 from adapters.repositories.mall_repository.sqlalchemy_repository import (
     SQLAlchemyMallRepository,
 )
+from adapters.repositories.models import (
+    FootfallDailyMallORM,
+    FootfallDailyWallORM,
+    FootfallStagingORM,
+)
 from adapters.repositories.wall_repository.sqlalchemy_repository import (
     SQLAlchemyWallRepository,
 )
-from domain.entities.footfall import Footfall, OriginType
+from domain.entities.footfall import (
+    Footfall,
+    FootfallBatch,
+    FootfallRange,
+    OriginType,
+)
+from domain.entities.footfall_aggregate import (
+    FootfallBucket,
+    FootfallGroup,
+    FootfallOccupancy,
+    FootfallPeakHours,
+    FootfallRanking,
+    FootfallSeries,
+)
+from domain.entities.footfall_import import ImportStrategy
+from domain.entities.import_job import ImportJob, ImportJobStatus
 from domain.entities.mall import Mall
 from domain.entities.wall import Wall
+from drivers.infrastructure.database import create_session_maker, get_round_trips
+from drivers.rest.config import TestingConfig
 
 
 @pytest.fixture(name="create_footfall")
@@ -63,6 +96,16 @@ def test_add_footfall_wall_not_found(footfall_repository: SQLAlchemyFootfallRepo
         assert footfall_repository.add(footfall)
 
 
+def test_add_footfall_already_exists(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    footfall = create_footfall()
+    with pytest.raises(FootfallAlreadyExistsException):
+        footfall_repository.add(replace(footfall, id=None))
+    assert footfall_repository.count() == 1
+
+
 #
 def test_add_get_footfall(
     footfall_repository: SQLAlchemyFootfallRepository,
@@ -96,6 +139,21 @@ def test_update_footfall_not_found(footfall_repository: SQLAlchemyFootfallReposi
         footfall_repository.update(fields_to_update, id_filter=555)
 
 
+def test_update_footfall_already_exists(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    footfall = create_footfall()
+    other = create_footfall(start_datetime=footfall.start_datetime + timedelta(hours=1))
+    fields_to_update = {
+        "wall_id": footfall.wall_id,
+        "start_datetime": footfall.start_datetime,
+    }
+    with pytest.raises(FootfallAlreadyExistsException):
+        footfall_repository.update(fields_to_update, id_filter=other.id)
+    assert footfall_repository.get(id_filter=other.id) == other
+
+
 def test_delete_footfall(
     footfall_repository: SQLAlchemyFootfallRepository,
     create_footfall: Callable[..., Footfall],
@@ -178,6 +236,22 @@ def test_get_all_footfalls_with_pagination(
     assert len(footfall_repository.get_all(limit=2, page=1)) == 2
 
 
+def test_get_all_footfalls_with_cursor(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    start_datetime = datetime(day=1, month=3, year=2024, hour=12)
+    later = create_footfall(start_datetime=start_datetime + timedelta(hours=1))
+    first = create_footfall(start_datetime=start_datetime)
+    second = create_footfall(start_datetime=start_datetime)
+
+    page = footfall_repository.get_all(limit=2)
+    assert [footfall.id for footfall in page] == [first.id, second.id]
+    cursor = (page[-1].start_datetime, page[-1].id)
+    next_page = footfall_repository.get_all(limit=2, cursor=cursor)
+    assert [footfall.id for footfall in next_page] == [later.id]
+
+
 def test_count_footfalls(
     footfall_repository: SQLAlchemyFootfallRepository,
     create_footfall: Callable[..., Footfall],
@@ -203,6 +277,38 @@ def test_count_footfalls_with_origin_filters(
     assert footfall_repository.count(origin_filter=OriginType.reconstruction) == 2
 
 
+def test_get_all_footfalls_with_count(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    for _ in range(3):
+        create_footfall(origin=OriginType.reconstruction)
+    create_footfall(origin=OriginType.raw)
+
+    footfalls, count = footfall_repository.get_all_with_count(
+        limit=2, origin_filter=OriginType.reconstruction
+    )
+    assert len(footfalls) == 2
+    assert count == 3
+    cursor = (footfalls[-1].start_datetime, footfalls[-1].id)
+    footfalls, count = footfall_repository.get_all_with_count(
+        limit=2, cursor=cursor, origin_filter=OriginType.reconstruction
+    )
+    assert len(footfalls) == 1
+    assert count == 3
+    assert footfall_repository.get_all_with_count(limit=2, page=3) == ([], 4)
+
+
+def test_estimate_count_footfalls(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    for _ in range(3):
+        create_footfall()
+    footfall_repository.session.execute(sa.text("ANALYZE footfall"))
+    assert footfall_repository.estimate_count() == 3
+
+
 def test_update_footfalls_between_dates(
     footfall_repository: SQLAlchemyFootfallRepository,
     create_footfall: Callable[..., Footfall],
@@ -288,3 +394,841 @@ def test_add_batch_footfalls_wall_not_found(
         footfalls.append(footfall)
     with pytest.raises(WallNotFoundException):
         footfall_repository.add_batch(footfalls)
+
+
+def test_add_batch_footfalls_duplicates(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    footfall = create_footfall()
+    footfall_repository.delete(id_filter=footfall.id)
+    footfalls = [
+        replace(footfall, id=None, people_in=people_in) for people_in in (1, 2, 3)
+    ]
+    footfall_repository.add_batch(footfalls)
+    assert footfall_repository.count() == 3
+    active = footfall_repository.get(is_active_filter=True)
+    assert active.people_in == 3
+
+
+def test_add_batch_footfalls_already_exists(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    footfall = create_footfall()
+    footfalls = [
+        replace(footfall, id=None, start_datetime=footfall.start_datetime + delta)
+        for delta in (timedelta(hours=1), timedelta())
+    ]
+    with pytest.raises(FootfallAlreadyExistsException):
+        footfall_repository.add_batch(footfalls)
+    assert footfall_repository.count() == 1
+
+
+def test_add_batch_footfalls_values(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    wall_id = create_footfall().wall_id
+    footfall_repository.delete(wall_id_filter=wall_id)
+    start_datetime = datetime(day=1, month=3, year=2024, hour=8)
+    footfall = Footfall(
+        start_datetime=start_datetime,
+        end_datetime=start_datetime + timedelta(hours=1),
+        people_in=12,
+        people_out=7,
+        is_active=False,
+        origin=OriginType.raw,
+        wall_id=wall_id,
+    )
+    footfall_repository.add_batch([footfall])
+    [stored] = footfall_repository.get_all(wall_id_filter=wall_id)
+    assert stored.start_datetime == footfall.start_datetime
+    assert stored.end_datetime == footfall.end_datetime
+    assert (stored.people_in, stored.people_out) == (12, 7)
+    assert stored.is_active is False
+    assert stored.origin == OriginType.raw
+
+
+def test_add_batch_footfalls_columnar(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    wall_id = create_footfall().wall_id
+    start_datetime = datetime(day=2, month=3, year=2024)
+    batch = FootfallBatch(
+        start_datetimes=[start_datetime, start_datetime + timedelta(hours=1)],
+        end_datetimes=[
+            start_datetime + timedelta(hours=1),
+            start_datetime + timedelta(hours=2),
+        ],
+        people_in=[5, 6],
+        people_out=[4, 3],
+        is_active=[True, True],
+        origins=[OriginType.reconstruction, OriginType.reconstruction],
+        wall_ids=[wall_id, wall_id],
+    )
+    footfall_repository.add_batch(batch)
+    assert footfall_repository.count(wall_id_filter=wall_id) == 3
+
+
+def test_replace_batch_footfalls(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    date = datetime(day=1, month=3, year=2024, hour=12)
+    in_window = create_footfall(start_datetime=date)
+    before_window = Footfall(
+        start_datetime=date - timedelta(hours=1),
+        end_datetime=date,
+        people_in=100,
+        people_out=90,
+        is_active=True,
+        origin=OriginType.reconstruction,
+        wall_id=in_window.wall_id,
+    )
+    before_window = footfall_repository.add(before_window)
+    other_wall = create_footfall(start_datetime=date)
+    footfall = Footfall(
+        start_datetime=date,
+        end_datetime=date + timedelta(hours=1),
+        people_in=1,
+        people_out=1,
+        is_active=True,
+        origin=OriginType.reconstruction,
+        wall_id=in_window.wall_id,
+    )
+    ranges = [
+        FootfallRange(wall_id=in_window.wall_id, start_datetime=date, end_datetime=date)
+    ]
+    footfall_repository.replace_batch([footfall], ranges)
+
+    assert footfall_repository.get(id_filter=in_window.id).is_active is False
+    assert footfall_repository.get(id_filter=before_window.id).is_active is True
+    assert footfall_repository.get(id_filter=other_wall.id).is_active is True
+    assert footfall_repository.count(is_active_filter=True) == 3
+
+
+def test_replace_batch_footfalls_wall_not_found_rolls_back(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    date = datetime(day=1, month=3, year=2024, hour=12)
+    existing = create_footfall(start_datetime=date)
+    footfall = Footfall(
+        start_datetime=date,
+        end_datetime=date + timedelta(hours=1),
+        people_in=1,
+        people_out=1,
+        is_active=True,
+        origin=OriginType.reconstruction,
+        wall_id=555,
+    )
+    ranges = [
+        FootfallRange(wall_id=existing.wall_id, start_datetime=date, end_datetime=date)
+    ]
+    with pytest.raises(WallNotFoundException):
+        footfall_repository.replace_batch([footfall], ranges)
+    assert footfall_repository.get(id_filter=existing.id).is_active is True
+
+
+def test_stage_apply_footfalls(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    date = datetime(day=1, month=3, year=2024, hour=12)
+    existing = create_footfall(start_datetime=date)
+    other_wall = create_footfall(start_datetime=date)
+    footfalls = [
+        Footfall(
+            start_datetime=date + timedelta(hours=hour),
+            end_datetime=date + timedelta(hours=hour + 1),
+            people_in=hour,
+            people_out=hour,
+            is_active=True,
+            origin=OriginType.reconstruction,
+            wall_id=existing.wall_id,
+        )
+        for hour in range(2)
+    ]
+    footfall_repository.stage_batch("key", FootfallBatch.from_footfalls(footfalls))
+    footfall_repository.stage_batch("other", FootfallBatch.from_footfalls(footfalls))
+    assert footfall_repository.count(wall_id_filter=existing.wall_id) == 1
+
+    footfall_repository.apply_staged("key")
+    assert footfall_repository.get(id_filter=existing.id).is_active is False
+    assert footfall_repository.get(id_filter=other_wall.id).is_active is True
+    assert footfall_repository.count(is_active_filter=True) == 3
+    staged = footfall_repository.session.scalars(
+        sa.select(FootfallStagingORM.staging_key)
+    ).all()
+    assert staged == ["other"] * 2
+
+
+def test_apply_staged_footfalls_wall_not_found_rolls_back(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    date = datetime(day=1, month=3, year=2024, hour=12)
+    existing = create_footfall(start_datetime=date)
+    footfalls = [
+        Footfall(
+            start_datetime=date,
+            end_datetime=date + timedelta(hours=1),
+            people_in=1,
+            people_out=1,
+            is_active=True,
+            origin=OriginType.reconstruction,
+            wall_id=wall_id,
+        )
+        for wall_id in (existing.wall_id, 555)
+    ]
+    footfall_repository.stage_batch("key", FootfallBatch.from_footfalls(footfalls))
+    with pytest.raises(WallNotFoundException):
+        footfall_repository.apply_staged("key")
+    assert footfall_repository.get(id_filter=existing.id).is_active is True
+    assert footfall_repository.count() == 1
+
+    footfall_repository.discard_staged("key")
+    staged = footfall_repository.session.scalar(
+        sa.select(sa.func.count()).select_from(FootfallStagingORM)
+    )
+    assert staged == 0
+
+
+def staged(session: Session) -> list[tuple[str, int | None]]:
+    query = sa.select(
+        FootfallStagingORM.staging_key, FootfallStagingORM.import_job_id
+    ).order_by(FootfallStagingORM.staging_key)
+    return [(row.staging_key, row.import_job_id) for row in session.execute(query)]
+
+
+def test_purge_staged_footfalls(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    import_job_repository: SQLAlchemyImportJobRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    date = datetime(day=1, month=3, year=2024, hour=12)
+    existing = create_footfall(start_datetime=date)
+    running = import_job_repository.add(
+        ImportJob(file_path="running.csv", status=ImportJobStatus.running)
+    )
+    failed = import_job_repository.add(
+        ImportJob(file_path="failed.csv", status=ImportJobStatus.failed)
+    )
+    batch = FootfallBatch.from_footfalls(
+        [
+            Footfall(
+                start_datetime=date,
+                end_datetime=date + timedelta(hours=1),
+                people_in=1,
+                people_out=1,
+                is_active=True,
+                origin=OriginType.reconstruction,
+                wall_id=existing.wall_id,
+            )
+        ]
+    )
+    footfall_repository.stage_batch("running", batch, running.id)
+    footfall_repository.stage_batch("failed", batch, failed.id)
+    footfall_repository.stage_batch("deleted", batch, 555)
+    footfall_repository.stage_batch("untracked", batch)
+    assert staged(footfall_repository.session) == [
+        ("deleted", 555),
+        ("failed", failed.id),
+        ("running", running.id),
+        ("untracked", None),
+    ]
+
+    assert footfall_repository.purge_staged() == 2
+    assert staged(footfall_repository.session) == [
+        ("running", running.id),
+        ("untracked", None),
+    ]
+
+    assert footfall_repository.purge_staged(running.id) == 1
+    assert staged(footfall_repository.session) == [("untracked", None)]
+
+
+def test_count_active_footfalls_in_ranges(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    date = datetime(day=1, month=3, year=2024, hour=12)
+    in_window = create_footfall(start_datetime=date)
+    create_footfall(start_datetime=date, is_active=False)
+    other_wall = create_footfall(start_datetime=date + timedelta(hours=5))
+    ranges = [
+        FootfallRange(wall_id=wall_id, start_datetime=date, end_datetime=date)
+        for wall_id in (in_window.wall_id, other_wall.wall_id)
+    ]
+    assert footfall_repository.count_active_in_ranges(ranges) == 1
+    assert footfall_repository.count_active_in_ranges([]) == 0
+
+
+def test_replace_batch_footfalls_read_only_session(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    date = datetime(day=1, month=3, year=2024, hour=12)
+    existing = create_footfall(start_datetime=date)
+    session_maker = create_session_maker(TestingConfig().database_url, read_only=True)
+    ranges = [
+        FootfallRange(wall_id=existing.wall_id, start_datetime=date, end_datetime=date)
+    ]
+    with session_maker() as session:
+        with pytest.raises(DatabaseException):
+            SQLAlchemyFootfallRepository(session).replace_batch([existing], ranges)
+    assert footfall_repository.get(id_filter=existing.id).is_active is True
+
+
+def test_upsert_batch_footfalls(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    date = datetime(day=1, month=3, year=2024, hour=12)
+    existing = create_footfall(start_datetime=date)
+    inactive = create_footfall(start_datetime=date, is_active=False)
+    raw = footfall_repository.add(
+        Footfall(
+            start_datetime=date,
+            end_datetime=date + timedelta(hours=1),
+            people_in=100,
+            people_out=90,
+            is_active=True,
+            origin=OriginType.raw,
+            wall_id=existing.wall_id,
+        )
+    )
+    footfalls = [
+        Footfall(
+            start_datetime=date + timedelta(hours=hour),
+            end_datetime=date + timedelta(hours=hour + 1),
+            people_in=hour + 1,
+            people_out=hour,
+            is_active=True,
+            origin=OriginType.reconstruction,
+            wall_id=existing.wall_id,
+        )
+        for hour in range(2)
+    ]
+    footfall_repository.upsert_batch(FootfallBatch.from_footfalls(footfalls))
+
+    updated = footfall_repository.get(id_filter=existing.id)
+    assert (updated.people_in, updated.people_out, updated.is_active) == (1, 0, True)
+    assert footfall_repository.get(id_filter=raw.id).people_in == 100
+    assert footfall_repository.get(id_filter=inactive.id).is_active is False
+    assert footfall_repository.count(wall_id_filter=existing.wall_id) == 3
+
+
+def test_apply_staged_footfalls_upsert(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    date = datetime(day=1, month=3, year=2024, hour=12)
+    existing = create_footfall(start_datetime=date)
+    footfall = Footfall(
+        start_datetime=date,
+        end_datetime=date + timedelta(hours=1),
+        people_in=1,
+        people_out=1,
+        is_active=True,
+        origin=OriginType.reconstruction,
+        wall_id=existing.wall_id,
+    )
+    footfall_repository.stage_batch("key", FootfallBatch.from_footfalls([footfall]))
+    footfall_repository.apply_staged("key", ImportStrategy.upsert)
+    assert footfall_repository.get(id_filter=existing.id).people_in == 1
+    assert footfall_repository.count() == 1
+
+
+def test_get_active_in_ranges_footfalls(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    date = datetime(day=1, month=3, year=2024, hour=12)
+    footfall = create_footfall(start_datetime=date)
+    for start_datetime, is_active in ((date, False), (date + timedelta(days=1), True)):
+        footfall_repository.add(
+            replace(
+                footfall, id=None, start_datetime=start_datetime, is_active=is_active
+            )
+        )
+    batch = footfall_repository.get_active_in_ranges(
+        [
+            FootfallRange(
+                wall_id=footfall.wall_id, start_datetime=date, end_datetime=date
+            )
+        ]
+    )
+    assert batch.start_datetimes == [date]
+    assert batch.people_in == [footfall.people_in]
+    assert batch.origins == [footfall.origin]
+    assert len(footfall_repository.get_active_in_ranges([])) == 0
+
+
+def test_replace_batch_footfalls_round_trips(
+    create_footfall: Callable[..., Footfall],
+):
+    date = datetime(day=1, month=3, year=2024, hour=12)
+    existing = create_footfall(start_datetime=date)
+    session_maker = create_session_maker(TestingConfig().database_url)
+    ranges = [
+        FootfallRange(wall_id=existing.wall_id, start_datetime=date, end_datetime=date)
+    ]
+    with session_maker() as session:
+        session.connection()
+        round_trips = get_round_trips(session)
+        SQLAlchemyFootfallRepository(session).replace_batch([existing], ranges)
+        assert get_round_trips(session) - round_trips == 5
+
+
+def test_round_trips_counted_per_session():
+    session_maker = create_session_maker(TestingConfig().database_url)
+    with session_maker() as session, session_maker() as other_session:
+        SQLAlchemyFootfallRepository(session).count()
+        round_trips = get_round_trips(session)
+        SQLAlchemyFootfallRepository(other_session).count()
+        assert get_round_trips(session) == round_trips
+        assert get_round_trips(other_session) == 1
+
+
+def test_aggregate_footfalls_by_wall_and_day(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    wall_repository: SQLAlchemyWallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    start_datetime = datetime(2024, 3, 1, 12)
+    footfall = create_footfall(start_datetime=start_datetime)
+    for hours, is_active in ((1, True), (2, False), (24, True)):
+        footfall_repository.add(
+            replace(
+                footfall,
+                id=None,
+                start_datetime=start_datetime + timedelta(hours=hours),
+                end_datetime=start_datetime + timedelta(hours=hours + 1),
+                is_active=is_active,
+            )
+        )
+    other = create_footfall(start_datetime=start_datetime)
+
+    series = footfall_repository.aggregate(
+        FootfallBucket.day, FootfallGroup.wall, is_active_filter=True
+    )
+    assert series == [
+        FootfallSeries(
+            id=footfall.wall_id,
+            start_datetimes=[datetime(2024, 3, 1), datetime(2024, 3, 2)],
+            people_in=[200, 100],
+            people_out=[180, 90],
+        ),
+        FootfallSeries(
+            id=other.wall_id,
+            start_datetimes=[datetime(2024, 3, 1)],
+            people_in=[100],
+            people_out=[90],
+        ),
+    ]
+
+
+def test_aggregate_footfalls_by_mall_with_filters(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    wall_repository: SQLAlchemyWallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    footfall = create_footfall(start_datetime=datetime(2024, 3, 1, 12))
+    assert footfall.wall
+    wall = wall_repository.add(Wall(name="Other Wall", mall_id=footfall.wall.mall_id))
+    assert wall.id
+    footfall_repository.add(replace(footfall, id=None, wall_id=wall.id))
+    footfall_repository.add(
+        replace(
+            footfall,
+            id=None,
+            start_datetime=datetime(2024, 4, 1),
+            end_datetime=datetime(2024, 4, 1, 1),
+        )
+    )
+    create_footfall(start_datetime=datetime(2024, 3, 1, 12))
+
+    series = footfall_repository.aggregate(
+        FootfallBucket.month,
+        FootfallGroup.mall,
+        mall_id_filter=footfall.wall.mall_id,
+        start_datetime_from_filter=datetime(2024, 3, 1),
+        start_datetime_to_filter=datetime(2024, 4, 1),
+    )
+    assert series == [
+        FootfallSeries(
+            id=footfall.wall.mall_id,
+            start_datetimes=[datetime(2024, 3, 1)],
+            people_in=[200],
+            people_out=[180],
+        )
+    ]
+
+
+def get_rollups(session: Session) -> tuple[list[Any], list[Any]]:
+    walls = session.execute(
+        sa.select(
+            FootfallDailyWallORM.wall_id,
+            FootfallDailyWallORM.start_datetime,
+            FootfallDailyWallORM.origin,
+            FootfallDailyWallORM.people_in,
+            FootfallDailyWallORM.people_out,
+        ).order_by(FootfallDailyWallORM.wall_id, FootfallDailyWallORM.start_datetime)
+    )
+    malls = session.execute(
+        sa.select(
+            FootfallDailyMallORM.mall_id,
+            FootfallDailyMallORM.start_datetime,
+            FootfallDailyMallORM.origin,
+            FootfallDailyMallORM.people_in,
+            FootfallDailyMallORM.people_out,
+        ).order_by(FootfallDailyMallORM.mall_id, FootfallDailyMallORM.start_datetime)
+    )
+    return [tuple(row) for row in walls], [tuple(row) for row in malls]
+
+
+def test_add_update_delete_footfall_maintains_rollups(
+    db_session: Session,
+    footfall_repository: SQLAlchemyFootfallRepository,
+    wall_repository: SQLAlchemyWallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    day = datetime(2024, 3, 1)
+    footfall = create_footfall(start_datetime=day + timedelta(hours=12))
+    assert footfall.wall
+    wall_id, mall_id = footfall.wall_id, footfall.wall.mall_id
+    wall = wall_repository.add(Wall(name="Other Wall", mall_id=mall_id))
+    assert wall.id
+    other = footfall_repository.add(replace(footfall, id=None, wall_id=wall.id))
+    footfall_repository.add(replace(footfall, id=None, is_active=False))
+    origin = OriginType.reconstruction
+    assert get_rollups(db_session) == (
+        [(wall_id, day, origin, 100, 90), (wall.id, day, origin, 100, 90)],
+        [(mall_id, day, origin, 200, 180)],
+    )
+
+    footfall_repository.update(
+        {"start_datetime": day + timedelta(days=1, hours=12), "people_in": 50},
+        id_filter=footfall.id,
+    )
+    next_day = day + timedelta(days=1)
+    assert get_rollups(db_session) == (
+        [(wall_id, next_day, origin, 50, 90), (wall.id, day, origin, 100, 90)],
+        [(mall_id, day, origin, 100, 90), (mall_id, next_day, origin, 50, 90)],
+    )
+
+    footfall_repository.delete(id_filter=other.id)
+    assert get_rollups(db_session) == (
+        [(wall_id, next_day, origin, 50, 90)],
+        [(mall_id, next_day, origin, 50, 90)],
+    )
+
+
+def test_replace_batch_footfalls_maintains_rollups(
+    db_session: Session,
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    date = datetime(2024, 3, 1, 12)
+    existing = create_footfall(start_datetime=date)
+    assert existing.wall
+    footfalls = [
+        replace(
+            existing,
+            id=None,
+            start_datetime=date + timedelta(hours=hours),
+            end_datetime=date + timedelta(hours=hours + 1),
+            people_in=1,
+            people_out=2,
+        )
+        for hours in (0, 1, 24)
+    ]
+    ranges = [
+        FootfallRange(
+            wall_id=existing.wall_id,
+            start_datetime=date,
+            end_datetime=date + timedelta(hours=24),
+        )
+    ]
+    footfall_repository.replace_batch(footfalls, ranges)
+
+    origin = OriginType.reconstruction
+    wall_rollups, mall_rollups = get_rollups(db_session)
+    assert wall_rollups == [
+        (existing.wall_id, datetime(2024, 3, 1), origin, 2, 4),
+        (existing.wall_id, datetime(2024, 3, 2), origin, 1, 2),
+    ]
+    assert mall_rollups == [
+        (existing.wall.mall_id, datetime(2024, 3, 1), origin, 2, 4),
+        (existing.wall.mall_id, datetime(2024, 3, 2), origin, 1, 2),
+    ]
+
+
+@pytest.mark.parametrize("strategy", [ImportStrategy.history, ImportStrategy.upsert])
+def test_apply_staged_footfalls_maintains_rollups(
+    db_session: Session,
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+    strategy: ImportStrategy,
+):
+    date = datetime(2024, 3, 1, 12)
+    existing = create_footfall(start_datetime=date)
+    footfalls = [
+        replace(existing, id=None, people_in=1),
+        replace(
+            existing,
+            id=None,
+            start_datetime=date + timedelta(hours=1),
+            end_datetime=date + timedelta(hours=2),
+        ),
+    ]
+    footfall_repository.stage_batch("key", FootfallBatch.from_footfalls(footfalls))
+    footfall_repository.apply_staged("key", strategy)
+
+    wall_rollups, _ = get_rollups(db_session)
+    assert wall_rollups == [
+        (existing.wall_id, datetime(2024, 3, 1), OriginType.reconstruction, 101, 180)
+    ]
+
+
+def test_rebuild_rollups(
+    db_session: Session,
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    footfall = create_footfall(start_datetime=datetime(2024, 3, 1, 12))
+    expected = get_rollups(db_session)
+    db_session.execute(sa.update(FootfallDailyWallORM).values(people_in=0))
+    db_session.execute(sa.delete(FootfallDailyMallORM))
+    db_session.add(
+        FootfallDailyWallORM(
+            wall_id=footfall.wall_id,
+            start_datetime=datetime(2024, 1, 1),
+            origin=OriginType.raw,
+            people_in=1,
+            people_out=1,
+        )
+    )
+    db_session.commit()
+
+    footfall_repository.rebuild_rollups()
+    assert get_rollups(db_session) == expected
+
+
+def test_delete_and_move_wall_maintains_mall_rollups(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    wall_repository: SQLAlchemyWallRepository,
+    mall_repository: SQLAlchemyMallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    footfall = create_footfall(start_datetime=datetime(2024, 3, 1, 12))
+    assert footfall.wall
+    mall_id = footfall.wall.mall_id
+    walls = [
+        wall_repository.add(Wall(name=f"Wall {index}", mall_id=mall_id))
+        for index in range(2)
+    ]
+    for wall in walls:
+        assert wall.id
+        footfall_repository.add(replace(footfall, id=None, wall_id=wall.id))
+
+    def assert_rollups_match_footfalls() -> None:
+        rollups = footfall_repository.aggregate(
+            FootfallBucket.day, FootfallGroup.mall, is_active_filter=True
+        )
+        footfalls = footfall_repository.aggregate(
+            FootfallBucket.day, FootfallGroup.mall
+        )
+        assert rollups == footfalls
+
+    wall_repository.delete(id_filter=footfall.wall_id)
+    assert_rollups_match_footfalls()
+
+    other_mall = mall_repository.add(Mall(name="Other Mall"))
+    wall_repository.update({"mall_id": other_mall.id}, id_filter=walls[0].id)
+    assert_rollups_match_footfalls()
+    assert [
+        (item.id, item.people_in)
+        for item in footfall_repository.aggregate(
+            FootfallBucket.day, FootfallGroup.mall, is_active_filter=True
+        )
+    ] == [(mall_id, [100]), (other_mall.id, [100])]
+
+
+def test_aggregate_footfalls_reads_rollups(
+    db_session: Session,
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    footfall = create_footfall(start_datetime=datetime(2024, 3, 1, 12))
+    assert footfall.wall
+    db_session.execute(sa.update(FootfallDailyWallORM).values(people_in=1))
+    db_session.execute(sa.update(FootfallDailyMallORM).values(people_in=2))
+    db_session.commit()
+
+    def get_people_in(bucket: FootfallBucket, **filters: Any) -> list[int]:
+        series = footfall_repository.aggregate(bucket, **filters)
+        return [people_in for item in series for people_in in item.people_in]
+
+    assert get_people_in(
+        FootfallBucket.day, group_by=FootfallGroup.wall, is_active_filter=True
+    ) == [1]
+    assert get_people_in(
+        FootfallBucket.month,
+        group_by=FootfallGroup.mall,
+        is_active_filter=True,
+        start_datetime_from_filter=datetime(2024, 3, 1),
+    ) == [2]
+    assert get_people_in(
+        FootfallBucket.week,
+        group_by=FootfallGroup.mall,
+        is_active_filter=True,
+        wall_id_filter=footfall.wall_id,
+    ) == [1]
+    assert get_people_in(
+        FootfallBucket.hour, group_by=FootfallGroup.wall, is_active_filter=True
+    ) == [100]
+    assert get_people_in(FootfallBucket.day, group_by=FootfallGroup.wall) == [100]
+    assert get_people_in(
+        FootfallBucket.day,
+        group_by=FootfallGroup.wall,
+        is_active_filter=True,
+        start_datetime_from_filter=datetime(2024, 3, 1, 6),
+    ) == [100]
+
+
+def test_occupancy_footfalls_by_wall(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    start_datetime = datetime(2024, 3, 1, 22)
+    footfall = create_footfall(start_datetime=start_datetime)
+    for hours, people_in, people_out in ((1, 10, 50), (2, 30, 20), (3, 5, 5)):
+        footfall_repository.add(
+            replace(
+                footfall,
+                id=None,
+                start_datetime=start_datetime + timedelta(hours=hours),
+                end_datetime=start_datetime + timedelta(hours=hours + 1),
+                people_in=people_in,
+                people_out=people_out,
+            )
+        )
+    filters: dict[str, Any] = {
+        "start_datetime_from_filter": start_datetime,
+        "start_datetime_to_filter": start_datetime + timedelta(hours=3),
+    }
+    start_datetimes = [start_datetime + timedelta(hours=hours) for hours in range(3)]
+
+    assert footfall_repository.occupancy(FootfallGroup.wall, **filters) == [
+        FootfallOccupancy(
+            id=footfall.wall_id,
+            start_datetimes=start_datetimes,
+            occupancy=[10, -30, -20],
+        )
+    ]
+    assert footfall_repository.occupancy(
+        FootfallGroup.wall, daily_reset=True, **filters
+    ) == [
+        FootfallOccupancy(
+            id=footfall.wall_id,
+            start_datetimes=start_datetimes,
+            occupancy=[10, -30, 10],
+        )
+    ]
+
+
+def test_occupancy_footfalls_by_mall(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    wall_repository: SQLAlchemyWallRepository,
+    create_footfall: Callable[..., Footfall],
+):
+    start_datetime = datetime(2024, 3, 1, 12)
+    footfall = create_footfall(start_datetime=start_datetime)
+    assert footfall.wall
+    wall = wall_repository.add(Wall(name="Other Wall", mall_id=footfall.wall.mall_id))
+    assert wall.id
+    next_hour = start_datetime + timedelta(hours=1)
+    for wall_id, start in ((wall.id, start_datetime), (wall.id, next_hour)):
+        footfall_repository.add(
+            replace(footfall, id=None, wall_id=wall_id, start_datetime=start)
+        )
+    footfall_repository.add(
+        replace(footfall, id=None, start_datetime=next_hour, is_active=False)
+    )
+    create_footfall(start_datetime=start_datetime)
+
+    occupancy = footfall_repository.occupancy(
+        FootfallGroup.mall,
+        mall_id_filter=footfall.wall.mall_id,
+        is_active_filter=True,
+    )
+    assert occupancy == [
+        FootfallOccupancy(
+            id=footfall.wall.mall_id,
+            start_datetimes=[start_datetime, next_hour],
+            occupancy=[20, 30],
+        )
+    ]
+
+
+@pytest.mark.parametrize("start_hour", [0, 1])
+def test_rank_footfalls(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    wall_repository: SQLAlchemyWallRepository,
+    create_footfall: Callable[..., Footfall],
+    start_hour: int,
+):
+    start_datetime = datetime(2024, 3, 1, 1)
+    footfall = create_footfall(start_datetime=start_datetime)
+    assert footfall.wall
+    mall_id = footfall.wall.mall_id
+    wall = wall_repository.add(Wall(name="Busy Wall", mall_id=mall_id))
+    quiet_wall = wall_repository.add(Wall(name="Quiet Wall", mall_id=mall_id))
+    assert wall.id and quiet_wall.id
+    for wall_id, hours, people_in in (
+        (wall.id, 0, 300),
+        (wall.id, 1, 50),
+        (wall.id, 2, 10),
+        (quiet_wall.id, 2, 1),
+    ):
+        footfall_repository.add(
+            replace(
+                footfall,
+                id=None,
+                wall_id=wall_id,
+                start_datetime=start_datetime + timedelta(hours=hours),
+                end_datetime=start_datetime + timedelta(hours=hours + 1),
+                people_in=people_in,
+            )
+        )
+    footfall_repository.add(
+        replace(footfall, id=None, wall_id=quiet_wall.id, is_active=False)
+    )
+    other = create_footfall(start_datetime=start_datetime)
+
+    ranking = footfall_repository.rank(
+        walls_limit=2,
+        hours_limit=2,
+        mall_id_filter=mall_id,
+        is_active_filter=True,
+        start_datetime_from_filter=datetime(2024, 3, 1, start_hour),
+        start_datetime_to_filter=datetime(2024, 3, 2),
+    )
+    assert ranking == FootfallRanking(
+        wall_ids=[wall.id, footfall.wall_id],
+        wall_traffic=[630, 190],
+        peak_hours=[
+            FootfallPeakHours(
+                id=mall_id,
+                start_datetimes=[start_datetime, start_datetime + timedelta(hours=2)],
+                traffic=[580, 191],
+            )
+        ],
+    )
+    ranking = footfall_repository.rank(walls_limit=5, hours_limit=1)
+    assert other.wall_id in ranking.wall_ids
+    assert len(ranking.peak_hours) == 2
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from adapters.exceptions import ImportJobNotFoundException
+from adapters.repositories.import_job_repository.sqlalchemy_repository import (
+    SQLAlchemyImportJobRepository,
+)
+from domain.entities.footfall_import import (
+    FootfallImportError,
+    FootfallImportStage,
+    FootfallImportStats,
+)
+from domain.entities.import_job import ImportJob, ImportJobStatus
+
+LEASE = timedelta(minutes=10)
+
+
+def test_add_get_import_job(import_job_repository: SQLAlchemyImportJobRepository):
+    import_job = import_job_repository.add(ImportJob(file_path="footfalls.csv"))
+    assert import_job.id and import_job.created_at
+    assert import_job_repository.get(id_filter=import_job.id) == import_job
+
+
+def test_get_import_job_not_found(
+    import_job_repository: SQLAlchemyImportJobRepository,
+):
+    with pytest.raises(ImportJobNotFoundException):
+        import_job_repository.get(id_filter=555)
+
+
+def test_update_import_job(import_job_repository: SQLAlchemyImportJobRepository):
+    import_job = import_job_repository.add(ImportJob(file_path="footfalls.csv"))
+    errors = [FootfallImportError(message="Not consecutive.", row=3, wall_id=1)]
+    import_job_repository.update(
+        {"status": ImportJobStatus.failed, "errors": errors}, id_filter=import_job.id
+    )
+    updated_import_job = import_job_repository.get(id_filter=import_job.id)
+    assert updated_import_job.status == ImportJobStatus.failed
+    assert updated_import_job.errors == errors
+
+
+def test_update_import_job_stats(
+    import_job_repository: SQLAlchemyImportJobRepository,
+):
+    import_job = import_job_repository.add(ImportJob(file_path="footfalls.csv"))
+    stats = FootfallImportStats(
+        seconds=2.0,
+        rows_per_second=1.5,
+        round_trips=4,
+        stages={"parse": FootfallImportStage(seconds=0.5, rows=3)},
+    )
+    import_job_repository.update({"stats": stats}, id_filter=import_job.id)
+    assert import_job_repository.get(id_filter=import_job.id).stats == stats
+
+
+def test_update_import_job_not_found(
+    import_job_repository: SQLAlchemyImportJobRepository,
+):
+    with pytest.raises(ImportJobNotFoundException):
+        import_job_repository.update({"status": ImportJobStatus.failed}, id_filter=555)
+
+
+def test_claim_next_import_job(import_job_repository: SQLAlchemyImportJobRepository):
+    first = import_job_repository.add(ImportJob(file_path="first.csv"))
+    second = import_job_repository.add(ImportJob(file_path="second.csv"))
+    claimed = import_job_repository.claim_next(LEASE)
+    assert claimed and claimed.id == first.id
+    assert claimed.status == ImportJobStatus.running
+    assert claimed.started_at is not None
+    assert claimed.claimed_at is not None
+    claimed = import_job_repository.claim_next(LEASE)
+    assert claimed and claimed.id == second.id
+    assert import_job_repository.claim_next(LEASE) is None
+
+
+def test_claim_next_import_job_expired_lease(
+    import_job_repository: SQLAlchemyImportJobRepository,
+):
+    expired = import_job_repository.add(
+        ImportJob(
+            file_path="expired.csv",
+            status=ImportJobStatus.running,
+            claimed_at=datetime.now() - LEASE - timedelta(minutes=1),
+        )
+    )
+    import_job_repository.add(
+        ImportJob(
+            file_path="running.csv",
+            status=ImportJobStatus.running,
+            claimed_at=datetime.now(),
+        )
+    )
+    claimed = import_job_repository.claim_next(LEASE)
+    assert claimed and claimed.id == expired.id
+    assert claimed.status == ImportJobStatus.running
+    assert claimed.claimed_at and claimed.claimed_at > datetime.now() - LEASE
+    assert import_job_repository.claim_next(LEASE) is None
+
+
+def test_update_import_job_claim_lost(
+    import_job_repository: SQLAlchemyImportJobRepository,
+):
+    import_job_repository.add(ImportJob(file_path="footfalls.csv"))
+    claimed = import_job_repository.claim_next(LEASE)
+    assert claimed and claimed.started_at
+    with pytest.raises(ImportJobNotFoundException):
+        import_job_repository.update(
+            {"status": ImportJobStatus.succeeded},
+            id_filter=claimed.id,
+            status_filter=ImportJobStatus.running,
+            started_at_filter=claimed.started_at - timedelta(seconds=1),
+        )
+    import_job_repository.update(
+        {"status": ImportJobStatus.succeeded},
+        id_filter=claimed.id,
+        status_filter=ImportJobStatus.running,
+        started_at_filter=claimed.started_at,
+    )
+    assert (
+        import_job_repository.get(id_filter=claimed.id).status
+        == ImportJobStatus.succeeded
+    )
@@ -0,0 +1,91 @@
+import pytest
+
+from adapters.exceptions import (
+    ImportJobNotFoundException,
+    ImportLedgerEntryAlreadyExistsException,
+    ImportLedgerEntryNotFoundException,
+)
+from adapters.repositories.import_job_repository.sqlalchemy_repository import (
+    SQLAlchemyImportJobRepository,
+)
+from adapters.repositories.import_ledger_repository.sqlalchemy_repository import (
+    SQLAlchemyImportLedgerRepository,
+)
+from domain.entities.import_job import ImportJob
+from domain.entities.import_ledger import ImportLedgerEntry
+
+
+@pytest.fixture
+def import_job(import_job_repository: SQLAlchemyImportJobRepository):
+    return import_job_repository.add(ImportJob(file_path="footfalls.csv"))
+
+
+def test_add_get_import_ledger_entry(
+    import_ledger_repository: SQLAlchemyImportLedgerRepository, import_job: ImportJob
+):
+    assert import_job.id
+    entry = import_ledger_repository.add(
+        ImportLedgerEntry(
+            content_hash="a" * 64, import_job_id=import_job.id, idempotency_key="key"
+        )
+    )
+    assert entry.id and entry.created_at
+    assert import_ledger_repository.get(content_hash_filter="a" * 64) == entry
+    assert import_ledger_repository.get(idempotency_key_filter="key") == entry
+
+
+def test_get_import_ledger_entry_not_found(
+    import_ledger_repository: SQLAlchemyImportLedgerRepository,
+):
+    with pytest.raises(ImportLedgerEntryNotFoundException):
+        import_ledger_repository.get(content_hash_filter="a" * 64)
+
+
+def test_add_import_ledger_entry_duplicate_hash(
+    import_ledger_repository: SQLAlchemyImportLedgerRepository, import_job: ImportJob
+):
+    assert import_job.id
+    entry = ImportLedgerEntry(content_hash="a" * 64, import_job_id=import_job.id)
+    import_ledger_repository.add(entry)
+    with pytest.raises(ImportLedgerEntryAlreadyExistsException):
+        import_ledger_repository.add(
+            ImportLedgerEntry(content_hash="a" * 64, import_job_id=import_job.id)
+        )
+
+
+def test_update_import_ledger_entry(
+    import_ledger_repository: SQLAlchemyImportLedgerRepository,
+    import_job_repository: SQLAlchemyImportJobRepository,
+    import_job: ImportJob,
+):
+    assert import_job.id
+    entry = import_ledger_repository.add(
+        ImportLedgerEntry(content_hash="a" * 64, import_job_id=import_job.id)
+    )
+    retry = import_job_repository.add(ImportJob(file_path="footfalls.csv"))
+    import_ledger_repository.update({"import_job_id": retry.id}, id_filter=entry.id)
+    updated_entry = import_ledger_repository.get(id_filter=entry.id)
+    assert updated_entry.import_job_id == retry.id
+
+
+def test_nested_atomic_import_ledger_entry_rolled_back(
+    import_job_repository: SQLAlchemyImportJobRepository,
+    import_ledger_repository: SQLAlchemyImportLedgerRepository,
+):
+    with pytest.raises(ValueError):
+        with import_job_repository.atomic():
+            with import_ledger_repository.atomic():
+                import_job = import_job_repository.add(
+                    ImportJob(file_path="footfalls.csv")
+                )
+                assert import_job.id
+                import_ledger_repository.add(
+                    ImportLedgerEntry(
+                        content_hash="c" * 64, import_job_id=import_job.id
+                    )
+                )
+            raise ValueError
+    with pytest.raises(ImportJobNotFoundException):
+        import_job_repository.get(id_filter=import_job.id)
+    with pytest.raises(ImportLedgerEntryNotFoundException):
+        import_ledger_repository.get(content_hash_filter="c" * 64)
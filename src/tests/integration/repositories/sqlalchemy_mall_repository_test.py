@@ -89,6 +89,14 @@ def test_get_all_malls_with_pagination(
     assert len(mall_repository.get_all(limit=2, page=1)) == 2
 
 
+def test_get_all_malls_with_cursor(
+    mall_repository: SQLAlchemyMallRepository, create_mall: Callable[..., Mall]
+):
+    malls = [create_mall(name=f"Test Mall {i}") for i in range(3)]
+    page = mall_repository.get_all(limit=2, cursor=(malls[0].id,))
+    assert [mall.id for mall in page] == [mall.id for mall in malls[1:]]
+
+
 def test_get_all_malls_not_found(mall_repository: SQLAlchemyMallRepository):
     malls = mall_repository.get_all()
     assert len(malls) == 0
@@ -102,6 +110,12 @@ def test_count_malls(
     assert mall_repository.count() == 2
 
 
+def test_get_all_malls_with_count_not_found(
+    mall_repository: SQLAlchemyMallRepository,
+):
+    assert mall_repository.get_all_with_count() == ([], 0)
+
+
 def test_count_malls_not_found(mall_repository: SQLAlchemyMallRepository):
     assert mall_repository.count() == 0
 
@@ -98,6 +98,14 @@ def test_get_all_walls_with_pagination(
     assert len(wall_repository.get_all(limit=2, page=1)) == 2
 
 
+def test_get_all_walls_with_cursor(
+    wall_repository: SQLAlchemyWallRepository, create_wall: Callable[..., Wall]
+):
+    walls = [create_wall(name=f"Test Wall {i}") for i in range(3)]
+    page = wall_repository.get_all(limit=2, cursor=(walls[0].id,))
+    assert [wall.id for wall in page] == [wall.id for wall in walls[1:]]
+
+
 def test_get_all_walls_with_mall_id_filters(
     wall_repository: SQLAlchemyWallRepository, create_wall: Callable[..., Wall]
 ):
@@ -128,3 +136,11 @@ def test_count_walls_with_name_filters(
     create_wall(name="Test Wall 2")
     create_wall(name="Another Wall")
     assert wall_repository.count(name_filter="Test Wall") == 2
+
+
+def test_get_existing_wall_ids(
+    wall_repository: SQLAlchemyWallRepository, create_wall: Callable[..., Wall]
+):
+    wall = create_wall()
+    assert wall.id
+    assert wall_repository.get_existing_ids([wall.id, 555]) == {wall.id}
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+from adapters.repositories.footfall_repository.sqlalchemy_repository import (
+    SQLAlchemyFootfallRepository,
+)
+from adapters.repositories.mall_repository.sqlalchemy_repository import (
+    SQLAlchemyMallRepository,
+)
+from adapters.repositories.wall_repository.sqlalchemy_repository import (
+    SQLAlchemyWallRepository,
+)
+from domain.entities.footfall import Footfall, OriginType
+from domain.entities.footfall_import import ImportStrategy
+from domain.entities.mall import Mall
+from domain.entities.wall import Wall
+from use_cases.exceptions import NotValidFileException
+from use_cases.process_footfalls_use_case import ProcessFootfallsUseCase
+
+
+@pytest.mark.parametrize("strategy", list(ImportStrategy))
+def test_process_footfalls_later_chunk_not_valid_writes_nothing(
+    footfall_repository: SQLAlchemyFootfallRepository,
+    wall_repository: SQLAlchemyWallRepository,
+    mall_repository: SQLAlchemyMallRepository,
+    strategy: ImportStrategy,
+):
+    mall = mall_repository.add(Mall(name="Test Mall"))
+    assert mall.id
+    wall = wall_repository.add(Wall(name="Test Wall", mall_id=mall.id))
+    assert wall.id
+    start_datetime = datetime(2024, 2, 9, 12)
+    existing = footfall_repository.add(
+        Footfall(
+            start_datetime=start_datetime,
+            end_datetime=start_datetime + timedelta(hours=1),
+            people_in=100,
+            people_out=90,
+            is_active=True,
+            origin=OriginType.reconstruction,
+            wall_id=wall.id,
+        )
+    )
+    from_dates = [start_datetime + timedelta(hours=hours) for hours in range(6)]
+    from_dates.append(from_dates[-1] + timedelta(hours=2))
+    csv = pd.DataFrame(
+        {
+            "from_date": from_dates,
+            "to_date": [from_date + timedelta(hours=1) for from_date in from_dates],
+            "people_in": 1,
+            "people_out": 1,
+            "wall_id": wall.id,
+        }
+    ).to_csv(index=False)
+    use_case = ProcessFootfallsUseCase(
+        footfall_repository, chunk_size=2, wall_repository=wall_repository
+    )
+
+    with pytest.raises(NotValidFileException):
+        use_case(BytesIO(csv.encode()), strategy=strategy)
+    assert footfall_repository.count() == 1
+    assert footfall_repository.get(id_filter=existing.id) == existing
@@ -0,0 +1,77 @@
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from adapters.repositories.import_job_repository.sqlalchemy_repository import (
+    SQLAlchemyImportJobRepository,
+)
+from adapters.repositories.import_ledger_repository.sqlalchemy_repository import (
+    SQLAlchemyImportLedgerRepository,
+)
+from adapters.repositories.models import ImportJobORM
+from domain.entities.import_job import ImportJob, ImportJobStatus
+from domain.entities.import_ledger import ImportLedgerEntry
+from use_cases.queue_import_job_use_case import QueueImportJobUseCase, get_fingerprint
+
+CONTENT_HASH = "a" * 64
+
+
+@pytest.fixture
+def use_case(
+    import_job_repository: SQLAlchemyImportJobRepository,
+    import_ledger_repository: SQLAlchemyImportLedgerRepository,
+):
+    return QueueImportJobUseCase(import_job_repository, import_ledger_repository)
+
+
+def count_import_jobs(db_session: Session) -> int:
+    return db_session.scalar(sa.select(sa.func.count()).select_from(ImportJobORM)) or 0
+
+
+def find_stale_entry_once(
+    use_case: QueueImportJobUseCase, entry: ImportLedgerEntry | None, monkeypatch
+) -> None:
+    # The request looks the file up before a concurrent request commits.
+    find_entry = use_case._find_entry
+    entries = [entry]
+
+    def inner(*args: Any) -> ImportLedgerEntry | None:
+        return entries.pop() if entries else find_entry(*args)
+
+    monkeypatch.setattr(use_case, "_find_entry", inner)
+
+
+def test_queue_import_job_concurrent_same_content(
+    db_session: Session, use_case: QueueImportJobUseCase, monkeypatch
+):
+    first, _ = use_case(ImportJob(file_path="first.csv"), CONTENT_HASH)
+    find_stale_entry_once(use_case, None, monkeypatch)
+    import_job, created = use_case(ImportJob(file_path="second.csv"), CONTENT_HASH)
+    assert not created
+    assert import_job.id == first.id
+    assert count_import_jobs(db_session) == 1
+
+
+def test_queue_import_job_concurrent_requeue(
+    db_session: Session,
+    use_case: QueueImportJobUseCase,
+    import_job_repository: SQLAlchemyImportJobRepository,
+    import_ledger_repository: SQLAlchemyImportLedgerRepository,
+    monkeypatch,
+):
+    failed, _ = use_case(ImportJob(file_path="first.csv"), CONTENT_HASH)
+    import_job_repository.update(
+        {"status": ImportJobStatus.failed}, id_filter=failed.id
+    )
+    stale_entry = import_ledger_repository.get(
+        content_hash_filter=get_fingerprint(CONTENT_HASH, failed)
+    )
+    requeued, created = use_case(ImportJob(file_path="second.csv"), CONTENT_HASH)
+    assert created
+    find_stale_entry_once(use_case, stale_entry, monkeypatch)
+    import_job, created = use_case(ImportJob(file_path="third.csv"), CONTENT_HASH)
+    assert not created
+    assert import_job.id == requeued.id
+    assert count_import_jobs(db_session) == 2
@@ -0,0 +1,69 @@
+from datetime import datetime
+from http import HTTPStatus
+
+from flask.testing import FlaskClient
+
+from adapters.repositories.footfall_repository.sqlalchemy_repository import (
+    SQLAlchemyFootfallRepository,
+)
+from domain.entities.footfall_aggregate import (
+    FootfallBucket,
+    FootfallGroup,
+    FootfallSeries,
+)
+
+PATH = "/api/footfalls/aggregate"
+
+
+def test_aggregate_footfalls_success(client: FlaskClient, monkeypatch):
+    series = [
+        FootfallSeries(
+            id=1,
+            start_datetimes=[datetime(2024, 3, 1), datetime(2024, 3, 2)],
+            people_in=[200, 100],
+            people_out=[180, 90],
+        )
+    ]
+    calls = []
+
+    def mock_aggregate(*args, **kwargs):
+        calls.append(kwargs)
+        return series
+
+    monkeypatch.setattr(SQLAlchemyFootfallRepository, "aggregate", mock_aggregate)
+    response = client.get(f"{PATH}?bucket=day&mall_id_filter=2")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == {
+        "bucket": "day",
+        "group_by": "wall",
+        "series": [
+            {
+                "id": 1,
+                "start_datetimes": ["2024-03-01T00:00:00", "2024-03-02T00:00:00"],
+                "people_in": [200, 100],
+                "people_out": [180, 90],
+            }
+        ],
+    }
+    assert calls == [
+        {
+            "bucket": FootfallBucket.day,
+            "group_by": FootfallGroup.wall,
+            "is_active_filter": True,
+            "mall_id_filter": 2,
+        }
+    ]
+
+
+def test_aggregate_footfalls_validation_error(client: FlaskClient):
+    response = client.get(f"{PATH}?group_by=floor&start_datetime_from_filter=today")
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json == {
+        "details": [
+            {
+                "bucket": ["Missing data for required field."],
+                "group_by": ["Must be one of: wall, mall."],
+                "start_datetime_from_filter": ["Not a valid datetime."],
+            }
+        ]
+    }
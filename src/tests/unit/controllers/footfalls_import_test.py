@@ -1,19 +1,56 @@
+from datetime import datetime
 from http import HTTPStatus
 from io import BytesIO
+from pathlib import Path
 
+import pytest
+from flask import Flask
 from flask.testing import FlaskClient
+from werkzeug.datastructures import FileStorage, Headers
 
-from use_cases.exceptions import NotValidFileException
-from use_cases.process_footfalls_use_case import ProcessFootfallsUseCase
+from adapters.exceptions import DatabaseException, ImportJobNotFoundException
+from adapters.repositories.import_job_repository.sqlalchemy_repository import (
+    SQLAlchemyImportJobRepository,
+)
+from adapters.repositories.import_ledger_repository.mock_repository import (
+    MockImportLedgerRepository,
+)
+from domain.entities.footfall_import import (
+    Compression,
+    FileFormat,
+    FootfallImportError,
+    ImportStrategy,
+)
+from domain.entities.import_job import ImportJob, ImportJobStatus
+from drivers.rest.controllers import footfalls_import_data
+from drivers.rest.controllers.schema import ImportJobResponse
 
 PATH_PREFIX = "/api/footfalls/import-data"
 
 
-def test_post_footfall_success(client: FlaskClient, monkeypatch):
-    def mock_call(*args, **kwargs):
-        pass
+@pytest.fixture(autouse=True)
+def import_ledger_repository(monkeypatch):
+    import_ledger_repository = MockImportLedgerRepository()
+    monkeypatch.setattr(
+        footfalls_import_data,
+        "SQLAlchemyImportLedgerRepository",
+        lambda session: import_ledger_repository,
+    )
+    return import_ledger_repository
+
+
+def test_post_footfall_import_accepted(
+    app: Flask, client: FlaskClient, monkeypatch, tmp_path: Path
+):
+    monkeypatch.setitem(app.config, "IMPORT_UPLOAD_DIR", str(tmp_path))
+    import_jobs = []
 
-    monkeypatch.setattr(ProcessFootfallsUseCase, "__call__", mock_call)
+    def mock_add(self, import_job):
+        import_job.id = 1
+        import_jobs.append(import_job)
+        return import_job
+
+    monkeypatch.setattr(SQLAlchemyImportJobRepository, "add", mock_add)
 
     data = {"file": (BytesIO(b"test data"), "file")}
     response = client.post(
@@ -21,14 +58,252 @@ def test_post_footfall_success(client: FlaskClient, monkeypatch):
         data=data,
         content_type="multipart/form-data",
     )
-    assert response.status_code == HTTPStatus.NO_CONTENT
+    [import_job] = import_jobs
+    file_path = Path(import_job.file_path)
+    assert file_path.parent == tmp_path
+    assert file_path.read_bytes() == b"test data"
+    assert response.status_code == HTTPStatus.ACCEPTED
+    assert response.json == ImportJobResponse.from_entity(import_job)
+
+
+@pytest.mark.parametrize(
+    "filename, content_type, file_format",
+    [
+        ("footfalls.csv", None, FileFormat.csv),
+        ("footfalls.parquet", None, FileFormat.parquet),
+        ("footfalls.arrow", None, FileFormat.arrow),
+        ("footfalls", "application/vnd.apache.parquet", FileFormat.parquet),
+        ("footfalls.csv", "application/vnd.apache.arrow.stream", FileFormat.arrow),
+    ],
+)
+def test_post_footfall_import_file_format(
+    app: Flask,
+    client: FlaskClient,
+    monkeypatch,
+    tmp_path: Path,
+    filename: str,
+    content_type: str | None,
+    file_format: FileFormat,
+):
+    monkeypatch.setitem(app.config, "IMPORT_UPLOAD_DIR", str(tmp_path))
+    import_jobs = []
+
+    def mock_add(self, import_job):
+        import_job.id = 1
+        import_jobs.append(import_job)
+        return import_job
+
+    monkeypatch.setattr(SQLAlchemyImportJobRepository, "add", mock_add)
+
+    data = {"file": (BytesIO(b"test data"), filename, content_type)}
+    response = client.post(
+        PATH_PREFIX,
+        data=data,
+        content_type="multipart/form-data",
+    )
+    [import_job] = import_jobs
+    assert response.status_code == HTTPStatus.ACCEPTED
+    assert import_job.file_format == file_format
+
+
+@pytest.mark.parametrize(
+    "filename, content_encoding, file_format, compression",
+    [
+        ("footfalls.csv", None, FileFormat.csv, None),
+        ("footfalls.csv.gz", None, FileFormat.csv, Compression.gzip),
+        ("footfalls.arrows.zst", None, FileFormat.arrow, Compression.zstd),
+        ("footfalls.csv", "gzip", FileFormat.csv, Compression.gzip),
+        ("footfalls.gz", "identity", FileFormat.csv, None),
+    ],
+)
+def test_post_footfall_import_compression(
+    app: Flask,
+    client: FlaskClient,
+    monkeypatch,
+    tmp_path: Path,
+    filename: str,
+    content_encoding: str | None,
+    file_format: FileFormat,
+    compression: Compression | None,
+):
+    monkeypatch.setitem(app.config, "IMPORT_UPLOAD_DIR", str(tmp_path))
+    import_jobs = []
+
+    def mock_add(self, import_job):
+        import_job.id = 1
+        import_jobs.append(import_job)
+        return import_job
+
+    monkeypatch.setattr(SQLAlchemyImportJobRepository, "add", mock_add)
+
+    headers = Headers()
+    if content_encoding:
+        headers["Content-Encoding"] = content_encoding
+    file = FileStorage(BytesIO(b"test data"), filename=filename, headers=headers)
+    response = client.post(
+        PATH_PREFIX,
+        data={"file": file},
+        content_type="multipart/form-data",
+    )
+    [import_job] = import_jobs
+    assert response.status_code == HTTPStatus.ACCEPTED
+    assert import_job.file_format == file_format
+    assert import_job.compression == compression
+
+
+def test_post_footfall_import_content_encoding_not_supported(
+    app: Flask, client: FlaskClient, monkeypatch, tmp_path: Path
+):
+    monkeypatch.setitem(app.config, "IMPORT_UPLOAD_DIR", str(tmp_path))
+
+    headers = Headers({"Content-Encoding": "br"})
+    file = FileStorage(BytesIO(b"test data"), filename="file", headers=headers)
+    response = client.post(
+        PATH_PREFIX,
+        data={"file": file},
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json == {
+        "details": [{"file": ["Unsupported content encoding: br."]}]
+    }
+    assert not list(tmp_path.iterdir())
+
+
+def test_post_footfall_import_params(
+    app: Flask, client: FlaskClient, monkeypatch, tmp_path: Path
+):
+    monkeypatch.setitem(app.config, "IMPORT_UPLOAD_DIR", str(tmp_path))
+    import_jobs = []
+
+    def mock_add(self, import_job):
+        import_job.id = 1
+        import_jobs.append(import_job)
+        return import_job
+
+    monkeypatch.setattr(SQLAlchemyImportJobRepository, "add", mock_add)
+
+    response = client.post(
+        f"{PATH_PREFIX}?dry_run=true&strategy=upsert",
+        data={"file": (BytesIO(b"test data"), "file")},
+        content_type="multipart/form-data",
+    )
+    [import_job] = import_jobs
+    assert response.status_code == HTTPStatus.ACCEPTED
+    assert import_job.dry_run is True
+    assert import_job.strategy == ImportStrategy.upsert
+
 
+def test_post_footfall_import_replayed(
+    app: Flask, client: FlaskClient, monkeypatch, tmp_path: Path
+):
+    monkeypatch.setitem(app.config, "IMPORT_UPLOAD_DIR", str(tmp_path))
+    import_jobs: dict[int, ImportJob] = {}
 
-def test_post_footfall_file_not_valid(client: FlaskClient, monkeypatch):
-    def mock_call(*args, **kwargs):
-        raise NotValidFileException
+    def mock_add(self, import_job):
+        import_job.id = len(import_jobs) + 1
+        import_jobs[import_job.id] = import_job
+        return import_job
 
-    monkeypatch.setattr(ProcessFootfallsUseCase, "__call__", mock_call)
+    def mock_get(self, id_filter):
+        return import_jobs[id_filter]
+
+    monkeypatch.setattr(SQLAlchemyImportJobRepository, "add", mock_add)
+    monkeypatch.setattr(SQLAlchemyImportJobRepository, "get", mock_get)
+
+    responses = [
+        client.post(
+            PATH_PREFIX,
+            data={"file": (BytesIO(b"test data"), "file")},
+            content_type="multipart/form-data",
+        )
+        for _ in range(2)
+    ]
+    assert [response.status_code for response in responses] == [
+        HTTPStatus.ACCEPTED,
+        HTTPStatus.OK,
+    ]
+    assert responses[0].json == responses[1].json
+    assert len(import_jobs) == 1
+    assert [path.name for path in tmp_path.iterdir()] == [
+        Path(import_jobs[1].file_path).name
+    ]
+
+
+def test_post_footfall_import_idempotency_key_reused(
+    app: Flask, client: FlaskClient, monkeypatch, tmp_path: Path
+):
+    monkeypatch.setitem(app.config, "IMPORT_UPLOAD_DIR", str(tmp_path))
+
+    def mock_add(self, import_job):
+        import_job.id = 1
+        return import_job
+
+    monkeypatch.setattr(SQLAlchemyImportJobRepository, "add", mock_add)
+
+    responses = [
+        client.post(
+            PATH_PREFIX,
+            data={"file": (BytesIO(content), "file")},
+            headers={"Idempotency-Key": "key"},
+            content_type="multipart/form-data",
+        )
+        for content in (b"test data", b"other data")
+    ]
+    assert responses[1].status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert responses[1].json == {
+        "details": (
+            "The idempotency key was already used for a different file "
+            "or import options."
+        )
+    }
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_post_footfall_import_too_large(
+    app: Flask, client: FlaskClient, monkeypatch, tmp_path: Path
+):
+    monkeypatch.setitem(app.config, "IMPORT_UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setitem(app.config, "IMPORT_MAX_FILE_SIZE", 64)
+
+    data = {"file": (BytesIO(b"x" * 128), "file")}
+    response = client.post(
+        PATH_PREFIX,
+        data=data,
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    assert response.json == {"details": "The file is too large."}
+    assert not list(tmp_path.iterdir())
+
+
+def test_post_footfall_import_file_missing(
+    app: Flask, client: FlaskClient, monkeypatch, tmp_path: Path
+):
+    monkeypatch.setitem(app.config, "IMPORT_UPLOAD_DIR", str(tmp_path))
+
+    data = {"other": (BytesIO(b"test data"), "file")}
+    response = client.post(
+        PATH_PREFIX,
+        data=data,
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json == {
+        "details": [{"file": ["Missing data for required field."]}]
+    }
+    assert not list(tmp_path.iterdir())
+
+
+def test_post_footfall_import_database_error(
+    app: Flask, client: FlaskClient, monkeypatch, tmp_path: Path
+):
+    monkeypatch.setitem(app.config, "IMPORT_UPLOAD_DIR", str(tmp_path))
+
+    def mock_add(*args, **kwargs):
+        raise DatabaseException
+
+    monkeypatch.setattr(SQLAlchemyImportJobRepository, "add", mock_add)
 
     data = {"file": (BytesIO(b"test data"), "file")}
     response = client.post(
@@ -36,5 +311,65 @@ def test_post_footfall_file_not_valid(client: FlaskClient, monkeypatch):
         data=data,
         content_type="multipart/form-data",
     )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_get_footfall_import_job_success(client: FlaskClient, monkeypatch):
+    import_job = ImportJob(
+        file_path="footfalls.csv",
+        status=ImportJobStatus.failed,
+        rows_processed=2,
+        walls_processed=1,
+        details="The data is not valid.",
+        errors=[FootfallImportError(message="Not consecutive.", row=3, wall_id=1)],
+        created_at=datetime(2024, 4, 8, 12),
+        started_at=datetime(2024, 4, 8, 12, 0, 1),
+        finished_at=datetime(2024, 4, 8, 12, 0, 3),
+        id=1,
+    )
+
+    def mock_get(*args, **kwargs):
+        return import_job
+
+    monkeypatch.setattr(SQLAlchemyImportJobRepository, "get", mock_get)
+    response = client.get(f"{PATH_PREFIX}/{import_job.id}")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == {
+        "id": 1,
+        "file_format": "csv",
+        "compression": None,
+        "dry_run": False,
+        "strategy": "history",
+        "status": "failed",
+        "rows_processed": 2,
+        "walls_processed": 1,
+        "rows_superseded": 0,
+        "rows_unchanged": 0,
+        "rows_changed": 0,
+        "rows_new": 0,
+        "details": "The data is not valid.",
+        "errors": [{"message": "Not consecutive.", "row": 3, "wall_id": 1}],
+        "stats": None,
+        "created_at": "2024-04-08T12:00:00",
+        "started_at": "2024-04-08T12:00:01",
+        "finished_at": "2024-04-08T12:00:03",
+        "duration_seconds": 2.0,
+    }
+
+
+def test_get_footfall_import_job_not_found(client: FlaskClient, monkeypatch):
+    id_filter = 1
+
+    def mock_get(*args, **kwargs):
+        raise ImportJobNotFoundException({"id_filter": id_filter})
+
+    monkeypatch.setattr(SQLAlchemyImportJobRepository, "get", mock_get)
+    response = client.get(f"{PATH_PREFIX}/{id_filter}")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json == {"details": f"Import job not found: id_filter={id_filter}"}
+
+
+def test_get_footfall_import_job_validation_error(client: FlaskClient):
+    response = client.get(f"{PATH_PREFIX}/not-valid-id")
     assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
-    assert response.json == {"details": "The data is not valid."}
+    assert response.json == {"details": [{"job_id": ["Not a valid integer."]}]}
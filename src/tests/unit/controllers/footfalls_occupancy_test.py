@@ -0,0 +1,68 @@
+from datetime import datetime
+from http import HTTPStatus
+
+from flask.testing import FlaskClient
+
+from adapters.repositories.footfall_repository.sqlalchemy_repository import (
+    SQLAlchemyFootfallRepository,
+)
+from domain.entities.footfall_aggregate import FootfallGroup, FootfallOccupancy
+
+PATH = "/api/footfalls/occupancy"
+
+
+def test_occupancy_footfalls_success(client: FlaskClient, monkeypatch):
+    series = [
+        FootfallOccupancy(
+            id=2,
+            start_datetimes=[datetime(2024, 3, 1, 9), datetime(2024, 3, 1, 10)],
+            occupancy=[40, 65],
+        )
+    ]
+    calls = []
+
+    def mock_occupancy(*args, **kwargs):
+        calls.append(kwargs)
+        return series
+
+    monkeypatch.setattr(SQLAlchemyFootfallRepository, "occupancy", mock_occupancy)
+    response = client.get(
+        f"{PATH}?group_by=mall&daily_reset=true"
+        "&start_datetime_from_filter=2024-03-01T00:00:00"
+        "&start_datetime_to_filter=2024-03-02T00:00:00"
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == {
+        "group_by": "mall",
+        "daily_reset": True,
+        "series": [
+            {
+                "id": 2,
+                "start_datetimes": ["2024-03-01T09:00:00", "2024-03-01T10:00:00"],
+                "occupancy": [40, 65],
+            }
+        ],
+    }
+    assert calls == [
+        {
+            "group_by": FootfallGroup.mall,
+            "daily_reset": True,
+            "is_active_filter": True,
+            "start_datetime_from_filter": datetime(2024, 3, 1),
+            "start_datetime_to_filter": datetime(2024, 3, 2),
+        }
+    ]
+
+
+def test_occupancy_footfalls_validation_error(client: FlaskClient):
+    response = client.get(f"{PATH}?daily_reset=maybe")
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json == {
+        "details": [
+            {
+                "daily_reset": ["Not a valid boolean."],
+                "start_datetime_from_filter": ["Missing data for required field."],
+                "start_datetime_to_filter": ["Missing data for required field."],
+            }
+        ]
+    }
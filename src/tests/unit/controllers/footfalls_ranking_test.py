@@ -0,0 +1,73 @@
+from datetime import datetime
+from http import HTTPStatus
+
+from flask.testing import FlaskClient
+
+from adapters.repositories.footfall_repository.sqlalchemy_repository import (
+    SQLAlchemyFootfallRepository,
+)
+from domain.entities.footfall_aggregate import FootfallPeakHours, FootfallRanking
+
+PATH = "/api/footfalls/ranking"
+
+
+def test_rank_footfalls_success(client: FlaskClient, monkeypatch):
+    ranking = FootfallRanking(
+        wall_ids=[3, 1],
+        wall_traffic=[630, 190],
+        peak_hours=[
+            FootfallPeakHours(
+                id=2,
+                start_datetimes=[datetime(2024, 3, 1, 17)],
+                traffic=[580],
+            )
+        ],
+    )
+    calls = []
+
+    def mock_rank(*args, **kwargs):
+        calls.append(kwargs)
+        return ranking
+
+    monkeypatch.setattr(SQLAlchemyFootfallRepository, "rank", mock_rank)
+    response = client.get(
+        f"{PATH}?hours_limit=1&mall_id_filter=2"
+        "&start_datetime_from_filter=2024-03-01T00:00:00"
+        "&start_datetime_to_filter=2024-03-02T00:00:00"
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == {
+        "wall_ids": [3, 1],
+        "wall_traffic": [630, 190],
+        "peak_hours": [
+            {
+                "id": 2,
+                "start_datetimes": ["2024-03-01T17:00:00"],
+                "traffic": [580],
+            }
+        ],
+    }
+    assert calls == [
+        {
+            "walls_limit": 10,
+            "hours_limit": 1,
+            "mall_id_filter": 2,
+            "is_active_filter": True,
+            "start_datetime_from_filter": datetime(2024, 3, 1),
+            "start_datetime_to_filter": datetime(2024, 3, 2),
+        }
+    ]
+
+
+def test_rank_footfalls_validation_error(client: FlaskClient):
+    response = client.get(f"{PATH}?walls_limit=0")
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json == {
+        "details": [
+            {
+                "walls_limit": ["Value must not be lower than 1"],
+                "start_datetime_from_filter": ["Missing data for required field."],
+                "start_datetime_to_filter": ["Missing data for required field."],
+            }
+        ]
+    }
@@ -3,7 +3,11 @@ from http import HTTPStatus
 
 from flask.testing import FlaskClient
 
-from adapters.exceptions import DatabaseException, FootfallNotFoundException
+from adapters.exceptions import (
+    DatabaseException,
+    FootfallAlreadyExistsException,
+    FootfallNotFoundException,
+)
 from adapters.repositories.footfall_repository.sqlalchemy_repository import (
     SQLAlchemyFootfallRepository,
 )
@@ -96,20 +100,39 @@ def test_post_footfall_database_error(client: FlaskClient, monkeypatch):
     assert response.json == {"details": "Something went wrong. Please try again later."}
 
 
+def test_post_footfall_already_exists(client: FlaskClient, monkeypatch):
+    footfall = create_footfall()
+
+    def mock_add(*args, **kwargs):
+        raise FootfallAlreadyExistsException({"wall_id": footfall.wall_id})
+
+    payload = {
+        "start_datetime": str(footfall.start_datetime),
+        "end_datetime": str(footfall.end_datetime),
+        "people_in": footfall.people_in,
+        "people_out": footfall.people_out,
+        "wall_id": footfall.wall_id,
+    }
+    monkeypatch.setattr(SQLAlchemyFootfallRepository, "add", mock_add)
+    response = client.post(PATH_PREFIX, json=payload)
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert response.json == {
+        "details": f"Active footfall already exists: wall_id={footfall.wall_id}"
+    }
+
+
 def test_list_footfalls_success(client: FlaskClient, monkeypatch):
     footfalls = [
         create_footfall(),
         create_footfall(),
     ]
 
-    def mock_get_all(*args, **kwargs):
-        return footfalls
-
-    def mock_count(*args, **kwargs):
-        return len(footfalls)
+    def mock_get_all_with_count(*args, **kwargs):
+        return footfalls, len(footfalls)
 
-    monkeypatch.setattr(SQLAlchemyFootfallRepository, "get_all", mock_get_all)
-    monkeypatch.setattr(SQLAlchemyFootfallRepository, "count", mock_count)
+    monkeypatch.setattr(
+        SQLAlchemyFootfallRepository, "get_all_with_count", mock_get_all_with_count
+    )
     response = client.get(PATH_PREFIX)
     assert response.status_code == HTTPStatus.OK
     assert response.json == FootfallCollectionResponse.from_entity(
@@ -117,6 +140,35 @@ def test_list_footfalls_success(client: FlaskClient, monkeypatch):
     )
 
 
+def test_list_footfalls_next_cursor(client: FlaskClient, monkeypatch):
+    footfalls = [create_footfall(), create_footfall()]
+    calls = []
+
+    def mock_get_all_with_count(*args, **kwargs):
+        calls.append(kwargs)
+        return footfalls, len(footfalls)
+
+    monkeypatch.setattr(
+        SQLAlchemyFootfallRepository, "get_all_with_count", mock_get_all_with_count
+    )
+    response = client.get(f"{PATH_PREFIX}?limit=2")
+    assert response.status_code == HTTPStatus.OK
+    expected = FootfallCollectionResponse.from_entity(footfalls, len(footfalls), 2)
+    assert response.json == expected
+    next_cursor = expected["next_cursor"]
+    assert next_cursor
+
+    response = client.get(f"{PATH_PREFIX}?limit=2&cursor={next_cursor}")
+    assert response.status_code == HTTPStatus.OK
+    assert calls[-1]["cursor"] == (footfalls[-1].start_datetime, footfalls[-1].id)
+
+
+def test_list_footfalls_invalid_cursor(client: FlaskClient):
+    response = client.get(f"{PATH_PREFIX}?cursor=bm90LWEtY3Vyc29y")
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json == {"details": [{"cursor": ["Not a valid cursor."]}]}
+
+
 def test_list_footfalls_validation_error(client: FlaskClient):
     params = "page=df&limit=sdf&wall_id_filter=not_int&origin_filter=ds&is_active_filter=skdfh"
     response = client.get(f"{PATH_PREFIX}?{params}")
@@ -191,6 +243,23 @@ def test_patch_footfall_item_not_found(client: FlaskClient, monkeypatch):
     assert response.json == {"details": f"Footfall not found: id_filter={id_filter}"}
 
 
+def test_patch_footfall_item_already_exists(client: FlaskClient, monkeypatch):
+    id_filter = 1
+
+    def mock_patch(*args, **kwargs):
+        raise FootfallAlreadyExistsException({"id_filter": id_filter})
+
+    monkeypatch.setattr(SQLAlchemyFootfallRepository, "update", mock_patch)
+    response = client.patch(
+        f"{PATH_PREFIX}/{id_filter}",
+        json={"is_active": True, "origin": "reconstruction"},
+    )
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert response.json == {
+        "details": f"Active footfall already exists: id_filter={id_filter}"
+    }
+
+
 def test_patch_footfall_item_validation_error(client: FlaskClient):
     response = client.patch(
         f"{PATH_PREFIX}/string_id",
@@ -47,19 +47,38 @@ def test_list_malls_success(client: FlaskClient, monkeypatch):
         Mall(name="Another Mall", id=2),
     ]
 
-    def mock_get_all(*args, **kwargs):
-        return malls
+    def mock_get_all_with_count(*args, **kwargs):
+        return malls, len(malls)
 
-    def mock_count(*args, **kwargs):
-        return len(malls)
-
-    monkeypatch.setattr(SQLAlchemyMallRepository, "get_all", mock_get_all)
-    monkeypatch.setattr(SQLAlchemyMallRepository, "count", mock_count)
+    monkeypatch.setattr(
+        SQLAlchemyMallRepository, "get_all_with_count", mock_get_all_with_count
+    )
     response = client.get(PATH_PREFIX)
     assert response.status_code == HTTPStatus.OK
     assert response.json == MallCollectionResponse.from_entity(malls, len(malls))
 
 
+def test_list_malls_with_cursor(client: FlaskClient, monkeypatch):
+    malls = [Mall(name="Another Mall", id=3)]
+    calls = []
+
+    def mock_get_all_with_count(*args, **kwargs):
+        calls.append(kwargs)
+        return malls, 3
+
+    monkeypatch.setattr(
+        SQLAlchemyMallRepository, "get_all_with_count", mock_get_all_with_count
+    )
+    cursor = MallCollectionResponse.from_entity([Mall(name="New Mall", id=2)], 3, 1)[
+        "next_cursor"
+    ]
+    response = client.get(f"{PATH_PREFIX}?limit=1&cursor={cursor}")
+    assert response.status_code == HTTPStatus.OK
+    assert calls == [{"limit": 1, "page": 1, "cursor": (2,)}]
+    assert response.json == MallCollectionResponse.from_entity(malls, 3, 1)
+    assert response.json["next_cursor"] != cursor
+
+
 def test_list_malls_validation_error(client: FlaskClient):
     response = client.get(f"{PATH_PREFIX}?page=string&limit=string")
     assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
@@ -61,27 +61,46 @@ def test_list_walls_success(client: FlaskClient, monkeypatch):
         Wall(name="Another Wall", id=2, mall_id=1),
     ]
 
+    def mock_get_all_with_count(*args, **kwargs):
+        return walls, len(walls)
+
+    monkeypatch.setattr(
+        SQLAlchemyWallRepository, "get_all_with_count", mock_get_all_with_count
+    )
+    response = client.get(PATH_PREFIX)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == WallCollectionResponse.from_entity(walls, len(walls))
+
+
+def test_list_walls_count_modes(client: FlaskClient, monkeypatch):
+    walls = [Wall(name="New Wall", id=1, mall_id=1)]
+
     def mock_get_all(*args, **kwargs):
         return walls
 
-    def mock_count(*args, **kwargs):
-        return len(walls)
+    def mock_estimate_count(*args, **kwargs):
+        return 1200
 
     monkeypatch.setattr(SQLAlchemyWallRepository, "get_all", mock_get_all)
-    monkeypatch.setattr(SQLAlchemyWallRepository, "count", mock_count)
-    response = client.get(PATH_PREFIX)
+    monkeypatch.setattr(SQLAlchemyWallRepository, "estimate_count", mock_estimate_count)
+    response = client.get(f"{PATH_PREFIX}?count=estimate")
     assert response.status_code == HTTPStatus.OK
-    assert response.json == WallCollectionResponse.from_entity(walls, len(walls))
+    assert response.json == WallCollectionResponse.from_entity(walls, 1200)
+
+    response = client.get(f"{PATH_PREFIX}?count=none")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == WallCollectionResponse.from_entity(walls, None)
 
 
 def test_list_walls_validation_error(client: FlaskClient):
     response = client.get(
-        f"{PATH_PREFIX}?page=string&limit=string&mall_id_filter=not_int"
+        f"{PATH_PREFIX}?page=string&limit=string&mall_id_filter=not_int&count=all"
     )
     assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
     assert response.json == {
         "details": [
             {
+                "count": ["Must be one of: exact, estimate, none."],
                 "limit": ["Not a valid integer."],
                 "mall_id_filter": ["Not a valid integer."],
                 "page": ["Not a valid integer."],
@@ -0,0 +1,153 @@
+import gzip
+from datetime import datetime, timedelta
+from functools import partial
+from io import BytesIO
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import pytest
+
+from domain.entities.footfall_import import Compression, FileFormat
+from use_cases.footfall_file_readers import (
+    read_footfall_frames,
+    read_footfall_wall_ids,
+)
+
+CSV = b"""from_date,to_date,people_in,people_out,wall_id
+2024-02-09 12:00:00,2024-02-09 13:00:00,0,0,1
+2024-02-09 13:00:00,2024-02-09 14:00:00,2,0,1
+2024-02-09 12:00:00,2024-02-09 13:00:00,13,10,2
+"""
+
+
+def test_read_footfall_frames_csv_typed():
+    [df] = read_footfall_frames(BytesIO(CSV), FileFormat.csv)
+    assert df.dtypes.astype(str).to_dict() == {
+        "from_date": "datetime64[us]",
+        "to_date": "datetime64[us]",
+        "people_in": "int32",
+        "people_out": "int32",
+        "wall_id": "int32",
+    }
+
+
+@pytest.mark.parametrize(
+    "from_date, to_date, expected",
+    [
+        (b"2024-02-09T12:00:00Z", b"2024-02-09T13:00:00Z", datetime(2024, 2, 9, 12)),
+        (
+            b"2024-02-09 12:00:00+01:00",
+            b"2024-02-09 13:00:00+01:00",
+            datetime(2024, 2, 9, 11),
+        ),
+    ],
+)
+@pytest.mark.parametrize("chunk_size", [None, 1])
+def test_read_footfall_frames_csv_zoned(from_date, to_date, expected, chunk_size):
+    csv = CSV.split(b"\n")[0] + b"\n" + from_date + b"," + to_date + b",1,2,3\n"
+    [df] = read_footfall_frames(BytesIO(csv), FileFormat.csv, chunk_size)
+    assert df["from_date"].dtype == "datetime64[us]"
+    assert df["from_date"].tolist() == [expected]
+    assert df["to_date"].tolist() == [expected + timedelta(hours=1)]
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1])
+def test_read_footfall_frames_csv_mixed_zones(chunk_size):
+    csv = (
+        CSV
+        + b"2024-02-09T14:00:00Z,2024-02-09 15:00:00,1,2,1\n"
+        + b"2024-02-09T16:00:00+02:00,2024-02-09T15:00:00Z,1,2,1\n"
+    )
+    frames = read_footfall_frames(BytesIO(csv), FileFormat.csv, chunk_size)
+    df = pd.concat(frames)
+    assert df["from_date"].tolist()[-2:] == [
+        datetime(2024, 2, 9, 14),
+        datetime(2024, 2, 9, 14),
+    ]
+    assert df["to_date"].tolist()[-2:] == [
+        datetime(2024, 2, 9, 15),
+        datetime(2024, 2, 9, 15),
+    ]
+
+
+def test_read_footfall_frames_csv_fractional_seconds():
+    csv = CSV.replace(b"12:00:00,", b"12:00:00.5,", 1)
+    [df] = read_footfall_frames(BytesIO(csv), FileFormat.csv)
+    assert df["from_date"].iloc[0] == datetime(2024, 2, 9, 12, 0, 0, 500000)
+
+
+def test_read_footfall_frames_csv_invalid_timestamp():
+    csv = CSV.replace(b"2024-02-09 13:00:00,2024", b"not a date,2024", 1)
+    with pytest.raises(pa.ArrowInvalid):
+        list(read_footfall_frames(BytesIO(csv), FileFormat.csv))
+
+
+def test_read_footfall_frames_parquet_zoned():
+    table = pa_csv.read_csv(BytesIO(CSV))
+    for name in ("from_date", "to_date"):
+        zoned = table.column(name).cast(pa.timestamp("s", tz="Europe/Paris"))
+        table = table.set_column(table.schema.get_field_index(name), name, zoned)
+    file = BytesIO()
+    pq.write_table(table, file)
+    file.seek(0)
+    [df] = read_footfall_frames(file, FileFormat.parquet)
+    assert df["from_date"].dtype == "datetime64[us]"
+    assert df["from_date"].iloc[0] == datetime(2024, 2, 9, 12)
+
+
+def test_read_footfall_frames_csv_chunked():
+    frames = list(read_footfall_frames(BytesIO(CSV), FileFormat.csv, chunk_size=2))
+    assert [list(df.index) for df in frames] == [[0, 1], [2]]
+
+
+@pytest.mark.parametrize(
+    "compression, compress",
+    [
+        (Compression.gzip, gzip.compress),
+        (Compression.zstd, partial(pa.compress, codec="zstd", asbytes=True)),
+    ],
+)
+def test_read_footfall_frames_csv_compressed(compression, compress):
+    frames = read_footfall_frames(
+        BytesIO(compress(CSV)), FileFormat.csv, chunk_size=2, compression=compression
+    )
+    assert [df["people_in"].tolist() for df in frames] == [[0, 2], [13]]
+
+
+def test_read_footfall_frames_arrow_file_compressed():
+    table = pa_csv.read_csv(BytesIO(CSV))
+    file = BytesIO()
+    with pa.ipc.new_file(file, table.schema) as writer:
+        writer.write_table(table)
+    [df] = read_footfall_frames(
+        BytesIO(gzip.compress(file.getvalue())),
+        FileFormat.arrow,
+        compression=Compression.gzip,
+    )
+    assert df["wall_id"].tolist() == [1, 1, 2]
+
+
+def to_parquet(data: bytes) -> bytes:
+    file = BytesIO()
+    pq.write_table(pa_csv.read_csv(BytesIO(data)), file)
+    return file.getvalue()
+
+
+@pytest.mark.parametrize(
+    "file_format, compression, encode",
+    [
+        (FileFormat.csv, None, bytes),
+        (FileFormat.csv, Compression.gzip, gzip.compress),
+        (FileFormat.parquet, None, to_parquet),
+    ],
+)
+def test_read_footfall_wall_ids(file_format, compression, encode):
+    file = BytesIO(encode(CSV))
+    assert read_footfall_wall_ids(file, file_format, compression) == {1, 2}
+    assert not file.closed
+
+
+def test_read_footfall_wall_ids_column_missing():
+    assert read_footfall_wall_ids(BytesIO(b"a,b\n1,2\n"), FileFormat.csv) == set()
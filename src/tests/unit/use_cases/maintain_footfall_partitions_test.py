@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from adapters.repositories.footfall_partition_repository.mock_repository import (
+    MockFootfallPartitionRepository,
+)
+from domain.entities.footfall import FootfallPartition, FootfallPartitionSummary
+from use_cases.maintain_footfall_partitions_use_case import (
+    MaintainFootfallPartitionsUseCase,
+)
+
+NOW = datetime(2024, 11, 17, 15)
+
+
+def create_partition(year: int, month: int) -> FootfallPartition:
+    return FootfallPartition(
+        name=f"footfall_{year}_{month:02}",
+        start_datetime=datetime(year, month, 1),
+        end_datetime=datetime(year + month // 12, month % 12 + 1, 1),
+    )
+
+
+def test_maintain_footfall_partitions_creates_upcoming_months():
+    repository = MockFootfallPartitionRepository([create_partition(2024, 11)])
+    summary = MaintainFootfallPartitionsUseCase(repository, months_ahead=2)(NOW)
+    assert summary == FootfallPartitionSummary(
+        created=["footfall_2024_12", "footfall_2025_01"]
+    )
+    assert repository.partitions["footfall_2025_01"] == create_partition(2025, 1)
+
+
+def test_maintain_footfall_partitions_detaches_expired():
+    partitions = [create_partition(2024, month) for month in range(8, 12)]
+    repository = MockFootfallPartitionRepository(partitions)
+    use_case = MaintainFootfallPartitionsUseCase(
+        repository, months_ahead=0, retention_months=2
+    )
+    assert use_case(NOW) == FootfallPartitionSummary(detached=["footfall_2024_08"])
+    assert repository.detached == ["footfall_2024_08"]
+    assert sorted(repository.partitions) == [
+        "footfall_2024_09",
+        "footfall_2024_10",
+        "footfall_2024_11",
+    ]
+
+
+def test_maintain_footfall_partitions_drops_expired():
+    partitions = [create_partition(2024, month) for month in range(8, 12)]
+    repository = MockFootfallPartitionRepository(partitions)
+    use_case = MaintainFootfallPartitionsUseCase(
+        repository, months_ahead=0, retention_months=1, drop_expired=True
+    )
+    assert use_case(NOW) == FootfallPartitionSummary(
+        dropped=["footfall_2024_08", "footfall_2024_09"]
+    )
+    assert repository.detached == []
@@ -1,12 +1,25 @@
+from datetime import datetime
 from io import BytesIO
+from pathlib import Path
 from typing import Any
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 
+from adapters.exceptions import WallNotFoundException
 from adapters.repositories.footfall_repository.mock_repository import (
     MockFootfallRepository,
 )
+from adapters.repositories.wall_repository.mock_repository import MockWallRepository
+from domain.entities.footfall import FootfallBatch, FootfallRange, OriginType
+from domain.entities.footfall_import import (
+    FileFormat,
+    FootfallImportError,
+    FootfallImportSummary,
+    ImportStrategy,
+)
 from use_cases.exceptions import NotValidFileException
 from use_cases.process_footfalls_use_case import ProcessFootfallsUseCase
 
@@ -68,7 +81,420 @@ def test_process_footfall_datetime_not_consecutive(
         process_footfall_use_case(to_bytes_csv(data))
 
 
+def test_process_footfall_not_consecutive_report(
+    process_footfall_use_case: ProcessFootfallsUseCase, data: dict[str, Any]
+):
+    data["from_date"][3] = "2024-02-09 15:00:00"
+    data["to_date"][3] = "2024-02-09 16:00:00"
+    with pytest.raises(NotValidFileException) as exc_info:
+        process_footfall_use_case(to_bytes_csv(data))
+    assert exc_info.value.errors == [
+        FootfallImportError(
+            message=(
+                "2024-02-09 15:00:00 - 2024-02-09 16:00:00 is not one hour after "
+                "2024-02-09 12:00:00 - 2024-02-09 13:00:00."
+            ),
+            row=4,
+            wall_id=2,
+        )
+    ]
+
+
 def test_process_footfall_success(
     process_footfall_use_case: ProcessFootfallsUseCase, data: dict[str, Any]
 ):
-    assert process_footfall_use_case(to_bytes_csv(data)) is None  # type: ignore
+    summary = process_footfall_use_case(to_bytes_csv(data))
+    assert summary == FootfallImportSummary(rows=4, walls=2, chunks=1)
+
+
+def test_process_footfall_chunked_success(data: dict[str, Any], monkeypatch):
+    calls = []
+
+    def mock_replace_batch(self, footfalls, ranges):
+        calls.append((footfalls, ranges))
+
+    monkeypatch.setattr(MockFootfallRepository, "replace_batch", mock_replace_batch)
+    use_case = ProcessFootfallsUseCase(MockFootfallRepository(), chunk_size=1)
+    use_case(to_bytes_csv(data))
+    assert len(calls) == 4
+    assert all(len(batch) == 1 and len(ranges) == 1 for batch, ranges in calls)
+    assert calls[1][1] == [
+        FootfallRange(
+            wall_id=1,
+            start_datetime=datetime(2024, 2, 9, 13),
+            end_datetime=datetime(2024, 2, 9, 13),
+        )
+    ]
+
+
+def test_process_footfall_chunked_not_consecutive_across_chunks(data: dict[str, Any]):
+    data["from_date"][1] = "2024-02-09 14:00:00"
+    use_case = ProcessFootfallsUseCase(MockFootfallRepository(), chunk_size=1)
+    with pytest.raises(NotValidFileException) as exc_info:
+        use_case(to_bytes_csv(data))
+    assert [(error.row, error.wall_id) for error in exc_info.value.errors] == [(2, 1)]
+
+
+def test_process_footfall_batch(data: dict[str, Any], monkeypatch):
+    calls = []
+
+    def mock_replace_batch(self, footfalls, ranges):
+        calls.append((footfalls, ranges))
+
+    monkeypatch.setattr(MockFootfallRepository, "replace_batch", mock_replace_batch)
+    ProcessFootfallsUseCase(MockFootfallRepository())(to_bytes_csv(data))
+    [(batch, ranges)] = calls
+    assert ranges == [
+        FootfallRange(
+            wall_id=wall_id,
+            start_datetime=datetime(2024, 2, 9, 12),
+            end_datetime=datetime(2024, 2, 9, 13),
+        )
+        for wall_id in (1, 2)
+    ]
+    assert isinstance(batch, FootfallBatch)
+    assert batch.start_datetimes[1] == datetime(2024, 2, 9, 13)
+    assert batch.end_datetimes[1] == datetime(2024, 2, 9, 14)
+    assert batch.people_in == data["people_in"]
+    assert batch.people_out == data["people_out"]
+    assert batch.wall_ids == data["wall_id"]
+    assert batch.is_active == [True] * 4
+    assert batch.origins == [OriginType.reconstruction] * 4
+
+
+def to_table(data: dict[str, Any]) -> pa.Table:
+    df = pd.DataFrame(data)
+    for field_name in ("from_date", "to_date"):
+        df[field_name] = pd.to_datetime(df[field_name])
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def test_process_footfall_parquet_success(data: dict[str, Any], monkeypatch):
+    calls = []
+
+    def mock_replace_batch(self, footfalls, ranges):
+        calls.append((footfalls, ranges))
+
+    monkeypatch.setattr(MockFootfallRepository, "replace_batch", mock_replace_batch)
+    file = BytesIO()
+    pq.write_table(to_table(data), file)
+    file.seek(0)
+    use_case = ProcessFootfallsUseCase(MockFootfallRepository(), chunk_size=3)
+    summary = use_case(file, file_format=FileFormat.parquet)
+    assert summary == FootfallImportSummary(rows=4, walls=2, chunks=2)
+    assert [len(batch) for batch, _ in calls] == [3, 1]
+    assert calls[0][0].start_datetimes[1] == datetime(2024, 2, 9, 13)
+    assert calls[1][0].wall_ids == [2]
+
+
+@pytest.mark.parametrize("new_writer", [pa.ipc.new_file, pa.ipc.new_stream])
+def test_process_footfall_arrow_success(
+    process_footfall_use_case: ProcessFootfallsUseCase,
+    data: dict[str, Any],
+    new_writer,
+):
+    table = to_table(data)
+    file = BytesIO()
+    with new_writer(file, table.schema) as writer:
+        writer.write_table(table)
+    file.seek(0)
+    summary = process_footfall_use_case(file, file_format=FileFormat.arrow)
+    assert summary == FootfallImportSummary(rows=4, walls=2, chunks=1)
+
+
+def test_process_footfall_parquet_column_missing(
+    process_footfall_use_case: ProcessFootfallsUseCase, data: dict[str, Any]
+):
+    del data["wall_id"]
+    file = BytesIO()
+    pq.write_table(to_table(data), file)
+    file.seek(0)
+    with pytest.raises(NotValidFileException):
+        process_footfall_use_case(file, file_format=FileFormat.parquet)
+
+
+def test_process_footfall_sharded_success(data: dict[str, Any], monkeypatch):
+    calls = []
+
+    def mock_apply_staged(self, staging_key, strategy):
+        calls.append((staging_key, strategy))
+
+    monkeypatch.setattr(MockFootfallRepository, "apply_staged", mock_apply_staged)
+    use_case = ProcessFootfallsUseCase(
+        MockFootfallRepository(),
+        chunk_size=3,
+        workers=2,
+        shard_repository_factory=MockFootfallRepository,
+    )
+    summary = use_case(to_bytes_csv(data))
+    assert summary == FootfallImportSummary(rows=4, walls=2, chunks=2)
+    assert len(calls) == 1
+
+
+def test_process_footfall_sharded_purges_reclaimed_job(
+    data: dict[str, Any], monkeypatch
+):
+    calls = []
+
+    def mock_purge_staged(self, import_job_id=None):
+        calls.append(import_job_id)
+        return 0
+
+    monkeypatch.setattr(MockFootfallRepository, "purge_staged", mock_purge_staged)
+    use_case = ProcessFootfallsUseCase(
+        MockFootfallRepository(),
+        chunk_size=3,
+        workers=2,
+        shard_repository_factory=MockFootfallRepository,
+    )
+    use_case(to_bytes_csv(data), import_job_id=7)
+    assert calls == [7]
+
+
+def test_process_footfall_sharded_not_consecutive(data: dict[str, Any], monkeypatch):
+    calls = []
+
+    def mock_discard_staged(self, staging_key):
+        calls.append(staging_key)
+
+    monkeypatch.setattr(MockFootfallRepository, "discard_staged", mock_discard_staged)
+    data["from_date"][1] = "2024-02-09 14:00:00"
+    data["from_date"][3] = "2024-02-09 15:00:00"
+    use_case = ProcessFootfallsUseCase(
+        MockFootfallRepository(),
+        chunk_size=3,
+        workers=2,
+        shard_repository_factory=MockFootfallRepository,
+    )
+    with pytest.raises(NotValidFileException) as exc_info:
+        use_case(to_bytes_csv(data))
+    assert [(error.row, error.wall_id) for error in exc_info.value.errors] == [(2, 1)]
+    assert len(calls) == 1
+
+
+def test_process_footfall_dry_run_success(data: dict[str, Any], monkeypatch):
+    def mock_replace_batch(self, footfalls, ranges):
+        raise AssertionError
+
+    def mock_count_active_in_ranges(self, ranges):
+        return len(ranges)
+
+    monkeypatch.setattr(MockFootfallRepository, "replace_batch", mock_replace_batch)
+    monkeypatch.setattr(
+        MockFootfallRepository, "count_active_in_ranges", mock_count_active_in_ranges
+    )
+    use_case = ProcessFootfallsUseCase(
+        MockFootfallRepository(), chunk_size=3, wall_repository=MockWallRepository()
+    )
+    summary = use_case(to_bytes_csv(data), dry_run=True)
+    assert summary == FootfallImportSummary(rows=4, walls=2, chunks=2, superseded=3)
+
+
+def test_process_footfall_dry_run_report(data: dict[str, Any]):
+    data["from_date"][1] = "2024-02-09 14:00:00"
+    use_case = ProcessFootfallsUseCase(
+        MockFootfallRepository(),
+        chunk_size=1,
+        wall_repository=MockWallRepository({1}),
+    )
+    with pytest.raises(NotValidFileException) as exc_info:
+        use_case(to_bytes_csv(data), dry_run=True)
+    assert [(error.row, error.wall_id) for error in exc_info.value.errors] == [
+        (2, 1),
+        (3, 2),
+    ]
+    assert exc_info.value.errors[1].message == "Wall not found."
+
+
+def test_process_footfall_dry_run_capped(data: dict[str, Any], monkeypatch):
+    monkeypatch.setattr(ProcessFootfallsUseCase, "max_reported_errors", 1)
+    use_case = ProcessFootfallsUseCase(
+        MockFootfallRepository(),
+        chunk_size=1,
+        wall_repository=MockWallRepository(set()),
+    )
+    with pytest.raises(NotValidFileException) as exc_info:
+        use_case(to_bytes_csv(data), dry_run=True)
+    assert [(error.row, error.wall_id) for error in exc_info.value.errors] == [(1, 1)]
+
+
+def test_process_footfall_dry_run_without_wall_repository(data: dict[str, Any]):
+    use_case = ProcessFootfallsUseCase(MockFootfallRepository(), chunk_size=1)
+    with pytest.raises(ValueError):
+        use_case(to_bytes_csv(data), dry_run=True)
+
+
+def test_process_footfall_upsert(data: dict[str, Any], monkeypatch):
+    calls = []
+
+    def mock_replace_batch(self, footfalls, ranges):
+        raise AssertionError
+
+    def mock_upsert_batch(self, footfalls):
+        calls.append(footfalls)
+
+    monkeypatch.setattr(MockFootfallRepository, "replace_batch", mock_replace_batch)
+    monkeypatch.setattr(MockFootfallRepository, "upsert_batch", mock_upsert_batch)
+    use_case = ProcessFootfallsUseCase(MockFootfallRepository(), chunk_size=3)
+    use_case(to_bytes_csv(data), strategy=ImportStrategy.upsert)
+    assert [len(batch) for batch in calls] == [3, 1]
+
+
+def test_process_footfall_diff(data: dict[str, Any], monkeypatch):
+    calls = []
+
+    def mock_get_active_in_ranges(self, ranges):
+        hour = datetime(2024, 2, 9, 12)
+        return FootfallBatch(
+            start_datetimes=[
+                hour,
+                hour.replace(hour=13),
+                hour,
+                hour.replace(minute=30),
+            ],
+            end_datetimes=[hour.replace(hour=13), hour.replace(hour=14)] * 2,
+            people_in=[0, 5, 13, 1],
+            people_out=[0, 0, 10, 1],
+            is_active=[True] * 4,
+            origins=[OriginType.reconstruction] * 2 + [OriginType.raw] * 2,
+            wall_ids=[1, 1, 2, 1],
+        )
+
+    def mock_replace_batch(self, footfalls, ranges):
+        calls.append((footfalls, ranges))
+
+    monkeypatch.setattr(
+        MockFootfallRepository, "get_active_in_ranges", mock_get_active_in_ranges
+    )
+    monkeypatch.setattr(MockFootfallRepository, "replace_batch", mock_replace_batch)
+    use_case = ProcessFootfallsUseCase(MockFootfallRepository())
+    summary = use_case(to_bytes_csv(data), strategy=ImportStrategy.diff)
+
+    assert (summary.unchanged, summary.changed, summary.new) == (1, 2, 1)
+    assert summary.superseded == 3
+    [(batch, ranges)] = calls
+    assert batch.wall_ids == [1, 2, 2]
+    assert batch.people_in == [2, 13, 1]
+    assert sorted((r.wall_id, r.start_datetime) for r in ranges) == [
+        (1, datetime(2024, 2, 9, 12, 30)),
+        (1, datetime(2024, 2, 9, 13)),
+        (2, datetime(2024, 2, 9, 12)),
+    ]
+    assert all(r.start_datetime == r.end_datetime for r in ranges)
+
+
+def test_process_footfall_diff_unchanged(data: dict[str, Any], monkeypatch):
+    def mock_get_active_in_ranges(self, ranges):
+        df = ProcessFootfallsUseCase._to_df(pd.DataFrame(data))
+        return ProcessFootfallsUseCase._to_batch(df)
+
+    def mock_replace_batch(self, footfalls, ranges):
+        raise AssertionError
+
+    monkeypatch.setattr(
+        MockFootfallRepository, "get_active_in_ranges", mock_get_active_in_ranges
+    )
+    monkeypatch.setattr(MockFootfallRepository, "replace_batch", mock_replace_batch)
+    use_case = ProcessFootfallsUseCase(MockFootfallRepository())
+    summary = use_case(to_bytes_csv(data), strategy=ImportStrategy.diff)
+    assert (summary.unchanged, summary.changed, summary.new) == (4, 0, 0)
+    assert summary.superseded == 0
+
+
+def test_process_footfall_wall_not_found(data: dict[str, Any], monkeypatch):
+    def mock_replace_batch(self, footfalls, ranges):
+        raise AssertionError
+
+    monkeypatch.setattr(MockFootfallRepository, "replace_batch", mock_replace_batch)
+    data["wall_id"] = [1, 1, 3, 3]
+    use_case = ProcessFootfallsUseCase(
+        MockFootfallRepository(), chunk_size=2, wall_repository=MockWallRepository()
+    )
+    with pytest.raises(WallNotFoundException) as e:
+        use_case(to_bytes_csv(data))
+    assert str(e.value) == "Wall not found: id_filter=[3]"
+
+
+class StreamIO(BytesIO):
+    def seekable(self) -> bool:
+        return False
+
+
+def test_process_footfall_stream_wall_not_found(data: dict[str, Any], monkeypatch):
+    calls = []
+
+    def mock_replace_batch(self, footfalls, ranges):
+        calls.append(footfalls)
+
+    monkeypatch.setattr(MockFootfallRepository, "replace_batch", mock_replace_batch)
+    data["wall_id"] = [1, 1, 3, 3]
+    use_case = ProcessFootfallsUseCase(
+        MockFootfallRepository(), chunk_size=2, wall_repository=MockWallRepository()
+    )
+    with pytest.raises(WallNotFoundException):
+        use_case(StreamIO(to_bytes_csv(data).getvalue()))
+    assert len(calls) == 1
+
+
+def test_process_footfall_stats(data: dict[str, Any], monkeypatch):
+    round_trips = [0]
+
+    def mock_replace_batch(*args, **kwargs):
+        round_trips[0] += 2
+
+    monkeypatch.setattr(MockFootfallRepository, "replace_batch", mock_replace_batch)
+    use_case = ProcessFootfallsUseCase(
+        MockFootfallRepository(),
+        chunk_size=3,
+        wall_repository=MockWallRepository(),
+        round_trips=lambda: round_trips[0],
+    )
+    stats = use_case(to_bytes_csv(data)).stats
+    assert set(stats.stages) == {
+        "walls",
+        "parse",
+        "cadence",
+        "batch",
+        "ranges",
+        "write",
+    }
+    assert stats.stages["parse"].rows == 4
+    assert stats.stages["write"].rows == 4
+    assert stats.round_trips == 4
+    assert stats.stages["write"].round_trips == 4
+    assert stats.stages["parse"].round_trips == 0
+    assert stats.peak_memory_delta >= stats.stages["parse"].peak_memory_delta
+    assert stats.seconds >= sum(stage.seconds for stage in stats.stages.values())
+
+
+@pytest.mark.skipif(not Path("/proc/self/clear_refs").exists(), reason="Linux only")
+def test_process_footfall_stats_peak_memory(data: dict[str, Any], monkeypatch):
+    size = 64 * 2**20
+
+    def mock_replace_batch(*args, **kwargs):
+        # Freed before the stage ends, only a peak can see it.
+        buffer = b"x" * size
+        del buffer
+
+    monkeypatch.setattr(MockFootfallRepository, "replace_batch", mock_replace_batch)
+    use_case = ProcessFootfallsUseCase(
+        MockFootfallRepository(), wall_repository=MockWallRepository()
+    )
+    stats = use_case(to_bytes_csv(data)).stats
+    assert stats.stages["write"].peak_memory_delta > size // 2
+    assert stats.stages["parse"].peak_memory_delta < size // 2
+    assert stats.peak_memory_delta >= stats.stages["write"].peak_memory_delta
+
+
+def test_process_footfall_stats_without_proc(data: dict[str, Any], monkeypatch):
+    def mock_open(*args, **kwargs):
+        raise FileNotFoundError
+
+    monkeypatch.setattr("use_cases.import_stats.open", mock_open, raising=False)
+    use_case = ProcessFootfallsUseCase(
+        MockFootfallRepository(), wall_repository=MockWallRepository()
+    )
+    stats = use_case(to_bytes_csv(data)).stats
+    assert stats.stages["write"].rows == 4
+    assert stats.peak_memory_delta == 0
+    assert stats.stages["write"].peak_memory_delta == 0
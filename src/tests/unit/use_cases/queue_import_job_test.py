@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from adapters.repositories.import_job_repository.mock_repository import (
+    MockImportJobRepository,
+)
+from adapters.repositories.import_ledger_repository.mock_repository import (
+    MockImportLedgerRepository,
+)
+from domain.entities.footfall_import import Compression, ImportStrategy
+from domain.entities.import_job import ImportJob, ImportJobStatus
+from domain.entities.import_ledger import ImportLedgerEntry
+from use_cases.exceptions import IdempotencyKeyReusedException
+from use_cases.queue_import_job_use_case import QueueImportJobUseCase, get_fingerprint
+
+CONTENT_HASH = "a" * 64
+FINGERPRINT = get_fingerprint(CONTENT_HASH, ImportJob(file_path="first.csv"))
+
+
+@pytest.fixture
+def use_case():
+    return QueueImportJobUseCase(
+        MockImportJobRepository(), MockImportLedgerRepository()
+    )
+
+
+def test_queue_import_job_new(use_case: QueueImportJobUseCase):
+    import_job, created = use_case(ImportJob(file_path="first.csv"), CONTENT_HASH)
+    assert created
+    assert import_job.id == 1
+
+
+def test_queue_import_job_same_content(use_case: QueueImportJobUseCase):
+    first, _ = use_case(ImportJob(file_path="first.csv"), CONTENT_HASH)
+    import_job, created = use_case(ImportJob(file_path="second.csv"), CONTENT_HASH)
+    assert not created
+    assert import_job is first
+
+
+def test_queue_import_job_same_idempotency_key(use_case: QueueImportJobUseCase):
+    first, _ = use_case(ImportJob(file_path="first.csv"), CONTENT_HASH, "key")
+    import_job, created = use_case(
+        ImportJob(file_path="second.csv"), CONTENT_HASH, "key"
+    )
+    assert not created
+    assert import_job is first
+
+
+def test_queue_import_job_idempotency_key_reused(use_case: QueueImportJobUseCase):
+    use_case(ImportJob(file_path="first.csv"), CONTENT_HASH, "key")
+    with pytest.raises(IdempotencyKeyReusedException):
+        use_case(ImportJob(file_path="second.csv"), "b" * 64, "key")
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"strategy": ImportStrategy.upsert},
+        {"strategy": ImportStrategy.diff},
+        {"compression": Compression.gzip},
+    ],
+)
+def test_queue_import_job_same_content_other_options(
+    use_case: QueueImportJobUseCase, options: dict[str, Any]
+):
+    first, _ = use_case(ImportJob(file_path="first.csv"), CONTENT_HASH)
+    import_job, created = use_case(
+        ImportJob(file_path="second.csv", **options), CONTENT_HASH
+    )
+    assert created
+    assert import_job.id != first.id
+
+
+def test_queue_import_job_idempotency_key_reused_other_options(
+    use_case: QueueImportJobUseCase,
+):
+    use_case(ImportJob(file_path="first.csv"), CONTENT_HASH, "key")
+    with pytest.raises(IdempotencyKeyReusedException):
+        use_case(
+            ImportJob(file_path="second.csv", strategy=ImportStrategy.upsert),
+            CONTENT_HASH,
+            "key",
+        )
+
+
+def test_queue_import_job_dry_run(use_case: QueueImportJobUseCase):
+    first, _ = use_case(ImportJob(file_path="first.csv", dry_run=True), CONTENT_HASH)
+    import_job, created = use_case(ImportJob(file_path="second.csv"), CONTENT_HASH)
+    assert created
+    assert import_job.id != first.id
+
+
+def test_queue_import_job_previous_failed():
+    import_job_repository = MockImportJobRepository(
+        [ImportJob(file_path="first.csv", status=ImportJobStatus.failed, id=1)]
+    )
+    import_ledger_repository = MockImportLedgerRepository(
+        [ImportLedgerEntry(content_hash=FINGERPRINT, import_job_id=1, id=1)]
+    )
+    use_case = QueueImportJobUseCase(import_job_repository, import_ledger_repository)
+    import_job, created = use_case(ImportJob(file_path="second.csv"), CONTENT_HASH)
+    assert created
+    assert import_job.id == 2
+    assert import_ledger_repository.entries[1].import_job_id == 2
+
+
+def test_queue_import_job_previous_abandoned(tmp_path: Path):
+    file_path = tmp_path / "first.csv"
+    file_path.touch()
+    import_job_repository = MockImportJobRepository(
+        [
+            ImportJob(
+                file_path=str(file_path),
+                status=ImportJobStatus.running,
+                claimed_at=datetime.now() - timedelta(hours=1),
+                id=1,
+            )
+        ]
+    )
+    import_ledger_repository = MockImportLedgerRepository(
+        [ImportLedgerEntry(content_hash=FINGERPRINT, import_job_id=1, id=1)]
+    )
+    use_case = QueueImportJobUseCase(import_job_repository, import_ledger_repository)
+    import_job, created = use_case(ImportJob(file_path="second.csv"), CONTENT_HASH)
+    assert created
+    assert import_job.id == 2
+    assert import_ledger_repository.entries[1].import_job_id == 2
+    assert import_job_repository.import_jobs[1].status == ImportJobStatus.failed
+    assert not file_path.exists()
+
+
+def test_queue_import_job_previous_running():
+    running = ImportJob(
+        file_path="first.csv",
+        status=ImportJobStatus.running,
+        claimed_at=datetime.now(),
+        id=1,
+    )
+    use_case = QueueImportJobUseCase(
+        MockImportJobRepository([running]),
+        MockImportLedgerRepository(
+            [ImportLedgerEntry(content_hash=FINGERPRINT, import_job_id=1, id=1)]
+        ),
+    )
+    import_job, created = use_case(ImportJob(file_path="second.csv"), CONTENT_HASH)
+    assert not created
+    assert import_job is running
@@ -0,0 +1,194 @@
+import gzip
+import logging
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from adapters.exceptions import DatabaseException
+from adapters.repositories.footfall_repository.mock_repository import (
+    MockFootfallRepository,
+)
+from adapters.repositories.import_job_repository.mock_repository import (
+    MockImportJobRepository,
+)
+from adapters.repositories.wall_repository.mock_repository import MockWallRepository
+from domain.entities.footfall_import import Compression
+from domain.entities.import_job import ImportJob, ImportJobStatus
+from use_cases.process_footfalls_use_case import ProcessFootfallsUseCase
+from use_cases.run_import_job_use_case import RunImportJobUseCase
+
+CSV = b"""from_date,to_date,people_in,people_out,wall_id
+2024-02-09 12:00:00,2024-02-09 13:00:00,0,0,1
+2024-02-09 13:00:00,2024-02-09 14:00:00,2,0,1
+2024-02-09 12:00:00,2024-02-09 13:00:00,13,10,2
+"""
+
+
+@pytest.fixture
+def create_use_case(tmp_path: Path):
+    def inner(
+        content: bytes = CSV,
+        compression: Compression | None = None,
+        dry_run: bool = False,
+        status: ImportJobStatus = ImportJobStatus.pending,
+        claimed_at: datetime | None = None,
+    ):
+        file_path = tmp_path / "footfalls.csv"
+        file_path.write_bytes(content)
+        import_job = ImportJob(
+            file_path=str(file_path),
+            compression=compression,
+            dry_run=dry_run,
+            status=status,
+            claimed_at=claimed_at,
+            id=1,
+        )
+        use_case = RunImportJobUseCase(
+            MockImportJobRepository([import_job]),
+            ProcessFootfallsUseCase(MockFootfallRepository(), chunk_size=2),
+            ProcessFootfallsUseCase(
+                MockFootfallRepository(),
+                chunk_size=2,
+                wall_repository=MockWallRepository({1}),
+            ),
+        )
+        return use_case, file_path
+
+    return inner
+
+
+def test_run_import_job_success(create_use_case):
+    use_case, file_path = create_use_case()
+    import_job = use_case()
+    assert import_job is not None
+    assert import_job.status == ImportJobStatus.succeeded
+    assert import_job.rows_processed == 3
+    assert import_job.walls_processed == 2
+    assert import_job.finished_at is not None
+    assert not file_path.exists()
+
+
+def test_run_import_job_stats(create_use_case, caplog):
+    use_case, _ = create_use_case()
+    with caplog.at_level(logging.INFO):
+        import_job = use_case()
+    assert import_job is not None and import_job.stats is not None
+    assert import_job.stats.stages["parse"].rows == 3
+    assert import_job.stats.stages["write"].rows == 3
+    assert import_job.stats.rows_per_second > 0
+    [record] = [r for r in caplog.records if hasattr(r, "import_stats")]
+    assert record.import_job_id == 1
+    assert record.import_stats["stages"]["parse"]["rows"] == 3
+
+
+def test_run_import_job_compressed_success(create_use_case):
+    use_case, file_path = create_use_case(gzip.compress(CSV), Compression.gzip)
+    import_job = use_case()
+    assert import_job is not None
+    assert import_job.status == ImportJobStatus.succeeded
+    assert import_job.rows_processed == 3
+    assert not file_path.exists()
+
+
+def test_run_import_job_dry_run(create_use_case, monkeypatch):
+    def mock_replace_batch(*args, **kwargs):
+        raise AssertionError
+
+    monkeypatch.setattr(MockFootfallRepository, "replace_batch", mock_replace_batch)
+    use_case, file_path = create_use_case(dry_run=True)
+    import_job = use_case()
+    assert import_job is not None
+    assert import_job.status == ImportJobStatus.failed
+    assert [(error.row, error.wall_id) for error in import_job.errors] == [(3, 2)]
+    assert not file_path.exists()
+
+
+def test_run_import_job_not_valid(create_use_case):
+    use_case, file_path = create_use_case(CSV.replace(b"13:00:00,2", b"15:00:00,2"))
+    import_job = use_case()
+    assert import_job is not None
+    assert import_job.status == ImportJobStatus.failed
+    assert import_job.details == "The data is not valid."
+    assert [error.row for error in import_job.errors] == [2]
+    assert not file_path.exists()
+
+
+def test_run_import_job_database_error(create_use_case, monkeypatch):
+    def mock_replace_batch(*args, **kwargs):
+        raise DatabaseException
+
+    monkeypatch.setattr(MockFootfallRepository, "replace_batch", mock_replace_batch)
+    use_case, _ = create_use_case()
+    import_job = use_case()
+    assert import_job is not None
+    assert import_job.status == ImportJobStatus.failed
+    assert import_job.details == "Something went wrong. Please try again later."
+
+
+def test_run_import_job_nothing_pending(create_use_case):
+    use_case, _ = create_use_case()
+    use_case()
+    assert use_case() is None
+
+
+def test_run_import_job_expired_lease(create_use_case):
+    claimed_at = datetime.now() - timedelta(hours=1)
+    use_case, _ = create_use_case(status=ImportJobStatus.running, claimed_at=claimed_at)
+    import_job = use_case()
+    assert import_job is not None
+    assert import_job.status == ImportJobStatus.succeeded
+    assert import_job.claimed_at and import_job.claimed_at > claimed_at
+
+
+def test_run_import_job_lease_not_expired(create_use_case):
+    use_case, file_path = create_use_case(
+        status=ImportJobStatus.running, claimed_at=datetime.now()
+    )
+    assert use_case() is None
+    assert file_path.exists()
+
+
+def test_run_import_job_heartbeat(tmp_path: Path, monkeypatch):
+    file_path = tmp_path / "footfalls.csv"
+    file_path.write_bytes(CSV)
+    import_job = ImportJob(file_path=str(file_path), id=1)
+    import_job_repository = MockImportJobRepository([import_job])
+    claims = []
+
+    def mock_replace_batch(*args, **kwargs):
+        claims.append(import_job.claimed_at)
+        time.sleep(0.1)
+        claims.append(import_job.claimed_at)
+
+    monkeypatch.setattr(MockFootfallRepository, "replace_batch", mock_replace_batch)
+    use_case = RunImportJobUseCase(
+        import_job_repository,
+        ProcessFootfallsUseCase(MockFootfallRepository()),
+        lease=timedelta(seconds=0.03),
+        heartbeat_repository=import_job_repository,
+    )
+    result = use_case()
+    assert result is not None and result.status == ImportJobStatus.succeeded
+    assert claims[0] and claims[1] and claims[1] > claims[0]
+
+
+def test_run_import_job_claim_lost(tmp_path: Path, monkeypatch):
+    file_path = tmp_path / "footfalls.csv"
+    file_path.write_bytes(CSV)
+    import_job = ImportJob(file_path=str(file_path), id=1)
+
+    def mock_replace_batch(*args, **kwargs):
+        # Another worker reclaims the job while this one is still writing.
+        import_job.started_at = import_job.claimed_at = datetime.now()
+
+    monkeypatch.setattr(MockFootfallRepository, "replace_batch", mock_replace_batch)
+    use_case = RunImportJobUseCase(
+        MockImportJobRepository([import_job]),
+        ProcessFootfallsUseCase(MockFootfallRepository(), chunk_size=2),
+    )
+    assert use_case() is None
+    assert import_job.status == ImportJobStatus.running
+    assert import_job.rows_processed == 0
+    assert file_path.exists()
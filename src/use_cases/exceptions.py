@@ -1,2 +1,10 @@
+from domain.entities.footfall_import import FootfallImportError
+
+
 class NotValidFileException(Exception):
+    def __init__(self, errors: list[FootfallImportError] | None = None):
+        self.errors = errors or []
+
+
+class IdempotencyKeyReusedException(Exception):
     pass
@@ -0,0 +1,210 @@
+import io
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Iterable, Iterator, TypeAlias
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from domain.entities.footfall_import import Compression, FileFormat
+
+TIMESTAMP_TYPE = pa.timestamp("us")
+COLUMN_TYPES = {
+    "from_date": TIMESTAMP_TYPE,
+    "to_date": TIMESTAMP_TYPE,
+    "people_in": pa.int32(),
+    "people_out": pa.int32(),
+    "wall_id": pa.int32(),
+}
+TIMESTAMP_COLUMNS = ("from_date", "to_date")
+ZONED_TIMESTAMP_TYPE = pa.timestamp("us", tz="UTC")
+ZONED_TIMESTAMP_PATTERN = r":\d{2}(\.\d+)?(Z|[+-]\d{2}:?\d{2})$"
+CSV_COLUMN_TYPES = {
+    **COLUMN_TYPES,
+    **{name: pa.string() for name in TIMESTAMP_COLUMNS},
+}
+CSV_BYTES_PER_ROW = 64
+CSV_MIN_BLOCK_SIZE = 1 << 20
+ARROW_FILE_MAGIC = b"ARROW1"
+ARROW_FILE_PREFIX_SIZE = 8
+
+Batch: TypeAlias = pa.Table | pa.RecordBatch
+
+
+def read_footfall_frames(
+    file: BinaryIO,
+    file_format: FileFormat,
+    chunk_size: int | None = None,
+    compression: Compression | None = None,
+) -> Iterator[pd.DataFrame]:
+    if compression is not None:
+        with pa.CompressedInputStream(file, compression.value) as stream:
+            yield from read_footfall_frames(stream, file_format, chunk_size)
+        return
+    readers = {
+        FileFormat.csv: _read_csv,
+        FileFormat.parquet: _read_parquet,
+        FileFormat.arrow: _read_arrow,
+    }
+    offset = 0
+    for batch in _limit_rows(readers[file_format](file, chunk_size), chunk_size):
+        df = _cast(batch).to_pandas()
+        df.index = pd.RangeIndex(offset, offset + len(df))
+        offset += len(df)
+        yield df
+
+
+def read_footfall_wall_ids(
+    file: BinaryIO,
+    file_format: FileFormat,
+    compression: Compression | None = None,
+) -> set[int]:
+    if compression is None:
+        return _read_wall_ids(file, file_format)
+    # Threaded CSV reads of a compressed stream that is closed before the
+    # interpreter exits abort the process, so the pre-scan reads them serially.
+    with pa.CompressedInputStream(_FileView(file), compression.value) as stream:
+        return _read_wall_ids(stream, file_format, use_threads=False)
+
+
+def _read_wall_ids(
+    file: BinaryIO, file_format: FileFormat, use_threads: bool = True
+) -> set[int]:
+    wall_ids: set[int] = set()
+    if file_format == FileFormat.csv:
+        read_options = pa_csv.ReadOptions(use_threads=use_threads)
+        convert_options = pa_csv.ConvertOptions(
+            column_types={"wall_id": COLUMN_TYPES["wall_id"]},
+            include_columns=["wall_id"],
+            include_missing_columns=True,
+        )
+        table = pa_csv.read_csv(
+            file, read_options=read_options, convert_options=convert_options
+        )
+        _add_wall_ids(wall_ids, table.to_batches())
+    elif file_format == FileFormat.parquet:
+        _add_wall_ids(wall_ids, pq.ParquetFile(file).iter_batches(columns=["wall_id"]))
+    else:
+        with _buffered(file) as buffered:
+            _add_wall_ids(wall_ids, _open_arrow(buffered))
+    return wall_ids
+
+
+def _add_wall_ids(wall_ids: set[int], batches: Iterable[pa.RecordBatch]) -> None:
+    for batch in batches:
+        wall_ids.update(pc.unique(batch.column("wall_id").drop_null()).to_pylist())
+
+
+def _cast(batch: Batch) -> Batch:
+    if set(batch.schema.names) != set(COLUMN_TYPES):
+        return batch
+    schema = pa.schema(COLUMN_TYPES.items())
+    if isinstance(batch, pa.RecordBatch):
+        batch = pa.Table.from_batches([batch])
+    return batch.select(schema.names).cast(schema)
+
+
+def _read_csv(file: BinaryIO, chunk_size: int | None) -> Iterator[Batch]:
+    convert_options = pa_csv.ConvertOptions(
+        column_types=CSV_COLUMN_TYPES, strings_can_be_null=True
+    )
+    if chunk_size is None:
+        yield _parse_timestamps(pa_csv.read_csv(file, convert_options=convert_options))
+        return
+    block_size = max(chunk_size * CSV_BYTES_PER_ROW, CSV_MIN_BLOCK_SIZE)
+    read_options = pa_csv.ReadOptions(block_size=block_size)
+    for batch in pa_csv.open_csv(
+        file, read_options=read_options, convert_options=convert_options
+    ):
+        yield _parse_timestamps(batch)
+
+
+def _parse_timestamps(batch: Batch) -> Batch:
+    # Timestamps are read as strings so that each value may carry its own zone
+    # offset. Zoned values are converted to UTC, naive ones are kept as they are.
+    columns = [
+        _parse_timestamp_column(batch.column(name))
+        if name in TIMESTAMP_COLUMNS
+        else batch.column(name)
+        for name in batch.schema.names
+    ]
+    return type(batch).from_arrays(columns, names=batch.schema.names)
+
+
+def _parse_timestamp_column(
+    column: pa.Array | pa.ChunkedArray,
+) -> pa.Array | pa.ChunkedArray:
+    zoned = pc.match_substring_regex(column, ZONED_TIMESTAMP_PATTERN)
+    if not pc.any(zoned).as_py():
+        return column.cast(TIMESTAMP_TYPE)
+    naive_as_utc = pc.if_else(
+        zoned, column, pc.binary_join_element_wise(column, "Z", "")
+    )
+    return naive_as_utc.cast(ZONED_TIMESTAMP_TYPE)
+
+
+def _read_parquet(file: BinaryIO, chunk_size: int | None) -> Iterator[Batch]:
+    if chunk_size is None:
+        yield pq.read_table(file)
+        return
+    yield from pq.ParquetFile(file).iter_batches(batch_size=chunk_size)
+
+
+def _read_arrow(file: BinaryIO, chunk_size: int | None) -> Iterator[Batch]:
+    with _buffered(file) as buffered:
+        batches = _open_arrow(buffered)
+        if chunk_size is None:
+            yield pa.Table.from_batches(list(batches))
+            return
+        yield from batches
+
+
+@contextmanager
+def _buffered(file: BinaryIO) -> Iterator[io.BufferedReader]:
+    if isinstance(file, io.BufferedReader):
+        yield file
+        return
+    buffered = io.BufferedReader(file)  # type: ignore
+    try:
+        yield buffered
+    finally:
+        # A reader left unfinished may only be closed after its file.
+        if not file.closed:
+            buffered.detach()
+
+
+def _open_arrow(buffered: io.BufferedReader) -> Iterable[pa.RecordBatch]:
+    is_file_layout = buffered.peek(ARROW_FILE_PREFIX_SIZE).startswith(ARROW_FILE_MAGIC)
+    if is_file_layout and buffered.seekable():
+        file_reader = pa.ipc.open_file(buffered)
+        return (file_reader.get_batch(i) for i in range(file_reader.num_record_batches))
+    if is_file_layout:
+        buffered.read(ARROW_FILE_PREFIX_SIZE)
+    batches: Iterable[pa.RecordBatch] = pa.ipc.open_stream(buffered)
+    return batches
+
+
+class _FileView(io.RawIOBase):
+    # Closing a compressed stream also closes its source, the view keeps the
+    # caller's file open so it can be read again after the pre-scan.
+    def __init__(self, file: BinaryIO):
+        self._file = file
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        data = self._file.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def _limit_rows(batches: Iterator[Batch], chunk_size: int | None) -> Iterator[Batch]:
+    for batch in batches:
+        if chunk_size is None or batch.num_rows <= chunk_size:
+            yield batch
+            continue
+        for offset in range(0, batch.num_rows, chunk_size):
+            yield batch.slice(offset, chunk_size)
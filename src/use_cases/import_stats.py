@@ -0,0 +1,92 @@
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+import pandas as pd
+
+from domain.entities.footfall_import import FootfallImportStage, FootfallImportStats
+
+
+class ImportStatsRecorder:
+    def __init__(self, round_trips: Callable[[], int] | None = None):
+        self.stats = FootfallImportStats()
+        self._round_trips = round_trips
+        self._started_at = time.perf_counter()
+        self._memory, _ = _get_memory()
+        self._tracks_peak = _reset_peak_memory()
+        self._started_round_trips = round_trips() if round_trips else 0
+
+    @contextmanager
+    def stage(self, name: str, rows: int = 0) -> Iterator[FootfallImportStage]:
+        stage = self.stats.stages.setdefault(name, FootfallImportStage())
+        stage.rows += rows
+        started_at = time.perf_counter()
+        round_trips = self._round_trips() if self._round_trips else 0
+        # The peak between stages still counts towards the import's.
+        self._sample_memory()
+        if self._tracks_peak:
+            _reset_peak_memory()
+        try:
+            yield stage
+        finally:
+            stage.seconds += time.perf_counter() - started_at
+            if self._round_trips:
+                stage.round_trips = (
+                    (stage.round_trips or 0) + self._round_trips() - round_trips
+                )
+            memory_delta = self._sample_memory()
+            stage.peak_memory_delta = max(stage.peak_memory_delta, memory_delta)
+
+    def frames(
+        self, name: str, frames: Iterator[pd.DataFrame]
+    ) -> Iterator[pd.DataFrame]:
+        while True:
+            with self.stage(name) as stage:
+                df = next(frames, None)
+                if df is None:
+                    return
+                stage.rows += len(df)
+            yield df
+
+    def finish(self, rows: int) -> FootfallImportStats:
+        self.stats.seconds = time.perf_counter() - self._started_at
+        if self.stats.seconds:
+            self.stats.rows_per_second = rows / self.stats.seconds
+        self._sample_memory()
+        if self._round_trips:
+            self.stats.round_trips = self._round_trips() - self._started_round_trips
+        return self.stats
+
+    def _sample_memory(self) -> int:
+        # Peak resident memory since the last reset, above the one at the start.
+        if not self._tracks_peak:
+            return 0
+        _, peak = _get_memory()
+        memory_delta = max(peak - self._memory, 0)
+        self.stats.peak_memory_delta = max(self.stats.peak_memory_delta, memory_delta)
+        return memory_delta
+
+
+def _reset_peak_memory() -> bool:
+    # Resets the kernel's high-water mark of the resident set size (VmHWM) to
+    # the current size. Only Linux has it, elsewhere memory is not reported.
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _get_memory() -> tuple[int, int]:
+    # Current and peak resident set size in bytes.
+    memory = {}
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                name, _, value = line.partition(":")
+                if name in ("VmRSS", "VmHWM"):
+                    memory[name] = int(value.split()[0]) * 1024
+    except OSError:
+        pass
+    return memory.get("VmRSS", 0), memory.get("VmHWM", 0)
@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from domain.entities.footfall import FootfallPartition, FootfallPartitionSummary
+from ports.repositories.footfall_partition_repository import (
+    FootfallPartitionRepository,
+)
+
+
+class MaintainFootfallPartitionsUseCase:
+    def __init__(
+        self,
+        partition_repository: FootfallPartitionRepository,
+        months_ahead: int = 3,
+        retention_months: int | None = None,
+        drop_expired: bool = False,
+    ):
+        self._partition_repository = partition_repository
+        self._months_ahead = months_ahead
+        self._retention_months = retention_months
+        self._drop_expired = drop_expired
+
+    def __call__(self, now: datetime | None = None) -> FootfallPartitionSummary:
+        summary = FootfallPartitionSummary()
+        now = now or datetime.now()
+        month = datetime(now.year, now.month, 1)
+        partitions = self._partition_repository.get_all()
+        existing = {partition.start_datetime for partition in partitions}
+        for offset in range(self._months_ahead + 1):
+            start_datetime = _add_months(month, offset)
+            if start_datetime in existing:
+                continue
+            partition = FootfallPartition(
+                name=f"footfall_{start_datetime:%Y_%m}",
+                start_datetime=start_datetime,
+                end_datetime=_add_months(start_datetime, 1),
+            )
+            self._partition_repository.add(partition)
+            summary.created.append(partition.name)
+
+        if self._retention_months is None:
+            return summary
+        expires_before = _add_months(month, -self._retention_months)
+        for partition in partitions:
+            if partition.end_datetime > expires_before:
+                continue
+            if self._drop_expired:
+                self._partition_repository.delete(partition)
+                summary.dropped.append(partition.name)
+            else:
+                self._partition_repository.detach(partition)
+                summary.detached.append(partition.name)
+        return summary
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    month = value.year * 12 + value.month - 1 + months
+    return datetime(month // 12, month % 12 + 1, 1)
@@ -1,28 +1,395 @@
-from io import BytesIO
-from typing import Any
+import multiprocessing
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import BinaryIO, Callable, Iterable, Iterator
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
-from pandas.core.groupby import DataFrameGroupBy
 
-from domain.entities.footfall import Footfall, OriginType
+from adapters.exceptions import WallNotFoundException
+from domain.entities.footfall import FootfallBatch, FootfallRange, OriginType
+from domain.entities.footfall_import import (
+    Compression,
+    FileFormat,
+    FootfallImportError,
+    FootfallImportSummary,
+    ImportStrategy,
+)
 from ports.repositories.footfall_repository import FootfallRepository
+from ports.repositories.wall_repository import WallRepository
 from use_cases.exceptions import NotValidFileException
+from use_cases.footfall_file_readers import (
+    read_footfall_frames,
+    read_footfall_wall_ids,
+)
+from use_cases.import_stats import ImportStatsRecorder
+
+ShardResult = tuple[list[FootfallImportError], pd.DataFrame | None]
+Mask = npt.NDArray[np.bool_]
+
+_shard_repository: FootfallRepository | None = None
 
 
 class ProcessFootfallsUseCase:
-    def __init__(self, footfall_repository: FootfallRepository):
+    max_reported_errors = 100
+
+    def __init__(
+        self,
+        footfall_repository: FootfallRepository,
+        chunk_size: int | None = None,
+        workers: int = 1,
+        shard_repository_factory: Callable[[], FootfallRepository] | None = None,
+        wall_repository: WallRepository | None = None,
+        round_trips: Callable[[], int] | None = None,
+    ):
         self._footfall_repository = footfall_repository
+        self._wall_repository = wall_repository
+        self._chunk_size = chunk_size
+        self._workers = workers
+        self._shard_repository_factory = shard_repository_factory
+        self._round_trips = round_trips
+
+    def __call__(
+        self,
+        file: BinaryIO,
+        file_format: FileFormat = FileFormat.csv,
+        compression: Compression | None = None,
+        on_chunk: Callable[[FootfallImportSummary], None] | None = None,
+        dry_run: bool = False,
+        strategy: ImportStrategy = ImportStrategy.history,
+        import_job_id: int | None = None,
+    ) -> FootfallImportSummary:
+        recorder = ImportStatsRecorder(self._round_trips)
+        if dry_run:
+            if self._wall_repository is None:
+                raise ValueError("A dry run needs a wall repository to check wall ids")
+            summary = self._validate(
+                self._read_frames(file, file_format, compression, recorder),
+                self._wall_repository,
+                recorder,
+                on_chunk,
+            )
+            summary.stats = recorder.finish(summary.rows)
+            return summary
+        with recorder.stage("walls"):
+            checked_walls = self._check_file_walls(file, file_format, compression)
+        frames = self._read_frames(file, file_format, compression, recorder)
+        if (
+            self._workers > 1
+            and self._shard_repository_factory is not None
+            and strategy != ImportStrategy.diff
+        ):
+            summary = self._process_sharded(
+                frames,
+                self._shard_repository_factory,
+                strategy,
+                checked_walls,
+                recorder,
+                on_chunk,
+                import_job_id,
+            )
+        else:
+            summary = self._process(frames, strategy, checked_walls, recorder, on_chunk)
+        summary.stats = recorder.finish(summary.rows)
+        return summary
+
+    def _process(
+        self,
+        frames: Iterator[pd.DataFrame],
+        strategy: ImportStrategy,
+        checked_walls: set[int],
+        recorder: ImportStatsRecorder,
+        on_chunk: Callable[[FootfallImportSummary], None] | None,
+    ) -> FootfallImportSummary:
+        summary = FootfallImportSummary()
+        last_rows = None
+        # Chunks are written in one transaction, so a file rejected on a later
+        # chunk leaves nothing behind.
+        with self._footfall_repository.atomic():
+            for df in frames:
+                with recorder.stage("cadence", len(df)):
+                    last_rows = self._check_consecutive(df, last_rows)
+                with recorder.stage("walls"):
+                    self._check_walls(df["wall_id"].unique().tolist(), checked_walls)
+                self._write(df, strategy, summary, recorder)
+                summary.rows += len(df)
+                summary.walls = len(last_rows)
+                summary.chunks += 1
+                if on_chunk:
+                    on_chunk(summary)
+        return summary
+
+    def _write(
+        self,
+        df: pd.DataFrame,
+        strategy: ImportStrategy,
+        summary: FootfallImportSummary,
+        recorder: ImportStatsRecorder,
+    ) -> None:
+        if strategy == ImportStrategy.diff:
+            self._replace_changed(df, summary, recorder)
+            return
+        with recorder.stage("batch", len(df)):
+            batch = self._to_batch(df)
+        if strategy == ImportStrategy.upsert:
+            with recorder.stage("write", len(df)):
+                self._footfall_repository.upsert_batch(batch)
+        else:
+            with recorder.stage("ranges", len(df)):
+                ranges = self._get_date_ranges(df)
+            with recorder.stage("write", len(df)):
+                self._footfall_repository.replace_batch(batch, ranges)
+
+    def _check_file_walls(
+        self,
+        file: BinaryIO,
+        file_format: FileFormat,
+        compression: Compression | None,
+    ) -> set[int]:
+        # Seekable files are pre-scanned for their wall ids so an unknown wall
+        # fails the import before anything is written, streams are checked
+        # chunk by chunk instead.
+        checked_walls: set[int] = set()
+        if self._wall_repository is None or not file.seekable():
+            return checked_walls
+        position = file.tell()
+        try:
+            wall_ids = read_footfall_wall_ids(file, file_format, compression)
+        except Exception:
+            raise NotValidFileException
+        file.seek(position)
+        self._check_walls(wall_ids, checked_walls)
+        return checked_walls
+
+    def _check_walls(self, wall_ids: Iterable[int], checked_walls: set[int]) -> None:
+        if self._wall_repository is None:
+            return
+        new_ids = sorted(set(wall_ids) - checked_walls)
+        if not new_ids:
+            return
+        unknown_ids = set(new_ids) - self._wall_repository.get_existing_ids(new_ids)
+        if unknown_ids:
+            raise WallNotFoundException({"id_filter": sorted(unknown_ids)})
+        checked_walls.update(new_ids)
+
+    def _replace_changed(
+        self,
+        df: pd.DataFrame,
+        summary: FootfallImportSummary,
+        recorder: ImportStatsRecorder,
+    ) -> None:
+        with recorder.stage("ranges", len(df)):
+            ranges = self._get_date_ranges(df)
+        with recorder.stage("diff", len(df)):
+            unchanged, known, stale = self._diff(
+                df, self._footfall_repository.get_active_in_ranges(ranges)
+            )
+        summary.unchanged += int(unchanged.sum())
+        summary.changed += int((known & ~unchanged).sum())
+        summary.new += int((~known).sum())
+        summary.superseded += len(stale)
+        if unchanged.all() and stale.empty:
+            return
+        with recorder.stage("batch", int((~unchanged).sum())):
+            batch = self._to_batch(df[~unchanged])
+            stale_ranges = [
+                FootfallRange(wall_id=wall_id, start_datetime=start, end_datetime=start)
+                for wall_id, start in zip(
+                    stale["wall_id"].tolist(),
+                    pd.DatetimeIndex(stale["from_date"]).to_pydatetime(),
+                )
+            ]
+        with recorder.stage("write", len(batch)):
+            self._footfall_repository.replace_batch(batch, stale_ranges)
+
+    @classmethod
+    def _diff(
+        cls, df: pd.DataFrame, active: FootfallBatch
+    ) -> tuple[Mask, Mask, pd.DataFrame]:
+        # An hour is unchanged only when its single active version is a
+        # reconstruction with the same values, otherwise every active version of
+        # that hour is superseded, as history imports do for the whole range.
+        keys = ["wall_id", "from_date"]
+        values = ["to_date", "people_in", "people_out"]
+        current = cls._to_frame(active)
+        versions = current.groupby(keys)["origin"].transform("size")
+        single = current[
+            (versions == 1) & (current["origin"] == OriginType.reconstruction)
+        ]
+        merged = df[keys + values].merge(
+            single[keys + values], on=keys, how="left", suffixes=("", "_current")
+        )
+        unchanged = (
+            pd.concat(
+                [merged[value] == merged[f"{value}_current"] for value in values],
+                axis=1,
+            )
+            .all(axis=1)
+            .to_numpy()
+        )
+        current_keys = pd.MultiIndex.from_frame(current[keys])
+        known = pd.MultiIndex.from_frame(df[keys]).isin(current_keys)
+        unchanged_keys = pd.MultiIndex.from_frame(df.loc[unchanged, keys])
+        stale = current.loc[~current_keys.isin(unchanged_keys), keys]
+        return unchanged, known, stale
+
+    def _validate(
+        self,
+        frames: Iterator[pd.DataFrame],
+        wall_repository: WallRepository,
+        recorder: ImportStatsRecorder,
+        on_chunk: Callable[[FootfallImportSummary], None] | None,
+    ) -> FootfallImportSummary:
+        summary = FootfallImportSummary()
+        errors: list[FootfallImportError] = []
+        last_rows = None
+        checked_walls: set[int] = set()
+        for df in frames:
+            with recorder.stage("cadence", len(df)):
+                last_rows, cadence_errors = self._find_cadence_errors(df, last_rows)
+            errors.extend(cadence_errors)
+            with recorder.stage("walls"):
+                errors.extend(
+                    self._find_wall_errors(df, wall_repository, checked_walls)
+                )
+            with recorder.stage("ranges", len(df)):
+                ranges = self._get_date_ranges(df)
+            with recorder.stage("superseded", len(df)):
+                summary.superseded += self._footfall_repository.count_active_in_ranges(
+                    ranges
+                )
+            summary.rows += len(df)
+            summary.walls = len(last_rows)
+            summary.chunks += 1
+            if on_chunk:
+                on_chunk(summary)
+            if len(errors) >= self.max_reported_errors:
+                break
+        if errors:
+            errors.sort(key=lambda error: error.row or 0)
+            raise NotValidFileException(errors[: self.max_reported_errors])
+        return summary
+
+    @staticmethod
+    def _find_wall_errors(
+        df: pd.DataFrame, wall_repository: WallRepository, checked_walls: set[int]
+    ) -> list[FootfallImportError]:
+        first_rows = df["wall_id"].drop_duplicates()
+        first_rows = first_rows[~first_rows.isin(checked_walls)]
+        if first_rows.empty:
+            return []
+        wall_ids = first_rows.tolist()
+        checked_walls.update(wall_ids)
+        existing_ids = wall_repository.get_existing_ids(wall_ids)
+        return [
+            FootfallImportError(message="Wall not found.", row=row + 1, wall_id=wall_id)
+            for row, wall_id in zip(first_rows.index.tolist(), wall_ids)
+            if wall_id not in existing_ids
+        ]
+
+    def _process_sharded(
+        self,
+        frames: Iterator[pd.DataFrame],
+        shard_repository_factory: Callable[[], FootfallRepository],
+        strategy: ImportStrategy,
+        checked_walls: set[int],
+        recorder: ImportStatsRecorder,
+        on_chunk: Callable[[FootfallImportSummary], None] | None,
+        import_job_id: int | None = None,
+    ) -> FootfallImportSummary:
+        # Walls are split across processes by wall_id, so each shard keeps its own
+        # cadence state. Shards are staged through their own connections and the
+        # whole file is applied in a single transaction once every shard is valid.
+        summary = FootfallImportSummary()
+        staging_key = uuid.uuid4().hex
+        if import_job_id is not None:
+            # Rows staged by an earlier attempt of a reclaimed job are left over.
+            self._footfall_repository.purge_staged(import_job_id)
+        last_rows: dict[int, pd.DataFrame | None] = {}
+        pool = ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_shard_worker,
+            initargs=(shard_repository_factory,),
+        )
+        try:
+            with pool:
+                pending: dict[int, Future[ShardResult]] = {}
+                for df in frames:
+                    with recorder.stage("walls"):
+                        self._check_walls(
+                            df["wall_id"].unique().tolist(), checked_walls
+                        )
+                    with recorder.stage("shards", len(df)):
+                        self._collect_shards(pending, last_rows)
+                        pending = {
+                            shard_id: pool.submit(
+                                _process_shard,
+                                staging_key,
+                                shard,
+                                last_rows.get(shard_id),
+                                import_job_id,
+                            )
+                            for shard_id, shard in df.groupby(
+                                df["wall_id"] % self._workers
+                            )
+                        }
+                    summary.rows += len(df)
+                    summary.chunks += 1
+                    if on_chunk:
+                        on_chunk(summary)
+                with recorder.stage("shards"):
+                    self._collect_shards(pending, last_rows)
+            with recorder.stage("write", summary.rows):
+                self._footfall_repository.apply_staged(staging_key, strategy)
+        except Exception:
+            self._footfall_repository.discard_staged(staging_key)
+            raise
+        summary.walls = sum(
+            len(rows) for rows in last_rows.values() if rows is not None
+        )
+        return summary
+
+    @classmethod
+    def _collect_shards(
+        cls,
+        pending: dict[int, "Future[ShardResult]"],
+        last_rows: dict[int, pd.DataFrame | None],
+    ) -> None:
+        errors = []
+        for shard_id, future in pending.items():
+            shard_errors, last_rows[shard_id] = future.result()
+            errors.extend(shard_errors)
+        if errors:
+            errors.sort(key=lambda error: error.row or 0)
+            raise NotValidFileException(errors[: cls.max_reported_errors])
 
-    def __call__(self, file: BytesIO) -> None:
-        df, groups = self._to_df(file)
-        self._check_consecutive(groups)
-        date_extremes = self._get_groups_date_extremes(groups)
-        self._invalidate_existing_footfalls(date_extremes)
-        footfalls = self._to_entities(df)
-        self._footfall_repository.add_batch(footfalls)
+    def _read_frames(
+        self,
+        file: BinaryIO,
+        file_format: FileFormat,
+        compression: Compression | None,
+        recorder: ImportStatsRecorder,
+    ) -> Iterator[pd.DataFrame]:
+        chunks = self._read_chunks(file, file_format, compression)
+        return recorder.frames("parse", map(self._to_df, chunks))
+
+    def _read_chunks(
+        self,
+        file: BinaryIO,
+        file_format: FileFormat,
+        compression: Compression | None,
+    ) -> Iterator[pd.DataFrame]:
+        try:
+            yield from read_footfall_frames(
+                file, file_format, self._chunk_size, compression
+            )
+        except Exception:
+            raise NotValidFileException
 
     @staticmethod
-    def _to_df(file: BytesIO) -> tuple[pd.DataFrame, DataFrameGroupBy]:  # type: ignore
+    def _to_df(df: pd.DataFrame) -> pd.DataFrame:
         required_columns = [
             "from_date",
             "to_date",
@@ -30,58 +397,117 @@ class ProcessFootfallsUseCase:
             "people_out",
             "wall_id",
         ]
+        if set(df.columns) != set(required_columns):
+            raise NotValidFileException
         try:
-            df = pd.read_csv(file)
-            assert set(df.columns) == set(required_columns)
             for field_name in ("from_date", "to_date"):
                 df[field_name] = pd.to_datetime(df[field_name])
-            groups_by_walls = df.groupby("wall_id")
-            return df, groups_by_walls
+            return df
         except Exception:
             raise NotValidFileException
 
-    @staticmethod
-    def _check_consecutive(groups: DataFrameGroupBy) -> None:  # type: ignore
-        for field_name in ("from_date", "to_date"):
-            for group_name, group_data in groups:
-                group_data = group_data.sort_values(by=field_name)
-                time_diff = group_data[field_name].diff()
-                consecutive_check = time_diff.dropna() == pd.Timedelta(hours=1)
-                if not consecutive_check.all():
-                    raise NotValidFileException
+    @classmethod
+    def _check_consecutive(
+        cls, df: pd.DataFrame, last_rows: pd.DataFrame | None = None
+    ) -> pd.DataFrame:
+        last_rows, errors = cls._find_cadence_errors(df, last_rows)
+        if errors:
+            raise NotValidFileException(errors)
+        return last_rows
 
-    @staticmethod
-    def _get_groups_date_extremes(groups: DataFrameGroupBy) -> dict[str, Any]:  # type: ignore
-        result = {}
-        for group_name, group_data in groups:
-            earliest_date = group_data["from_date"].min()
-            latest_date = group_data["from_date"].max()
-            result[str(group_name)] = {
-                "start": earliest_date.to_pydatetime(),
-                "end": latest_date.to_pydatetime(),
-            }
-        return result
-
-    def _invalidate_existing_footfalls(self, groups: dict[str, Any]) -> None:
-        for wall_id, dts in groups.items():
-            self._footfall_repository.update(
-                fields_to_update={"is_active": False},
-                with_error=False,
-                wall_id_filter=int(wall_id),
-                start_date_between=(dts["start"], dts["end"]),
+    @classmethod
+    def _find_cadence_errors(
+        cls, df: pd.DataFrame, last_rows: pd.DataFrame | None = None
+    ) -> tuple[pd.DataFrame, list[FootfallImportError]]:
+        # last_rows holds the latest row of every wall seen in previous chunks,
+        # so the one-hour cadence is also checked across chunk boundaries.
+        frames = [df[["wall_id", "from_date", "to_date"]]]
+        if last_rows is not None:
+            frames.insert(0, last_rows)
+        frame = pd.concat(frames).sort_values(["wall_id", "from_date"], kind="stable")
+        time_diff = frame.groupby("wall_id")[["from_date", "to_date"]].diff()
+        broken = (time_diff.notna() & time_diff.ne(pd.Timedelta(hours=1))).any(axis=1)
+        errors = cls._cadence_errors(frame, broken) if broken.any() else []
+        return frame.groupby("wall_id").tail(1), errors
+
+    @classmethod
+    def _cadence_errors(
+        cls, frame: pd.DataFrame, broken: "pd.Series[bool]"
+    ) -> list[FootfallImportError]:
+        previous = frame.groupby("wall_id")[["from_date", "to_date"]].shift()
+        rows = frame.assign(
+            row=frame.index + 1,
+            previous_from_date=previous["from_date"],
+            previous_to_date=previous["to_date"],
+        )[broken]
+        return [
+            FootfallImportError(
+                message=(
+                    f"{row['from_date']} - {row['to_date']} is not one hour after "
+                    f"{row['previous_from_date']} - {row['previous_to_date']}."
+                ),
+                row=int(row["row"]),
+                wall_id=int(row["wall_id"]),
             )
+            for row in rows.head(cls.max_reported_errors).to_dict("records")
+        ]
 
     @staticmethod
-    def _to_entities(df: pd.DataFrame) -> list[Footfall]:
+    def _get_date_ranges(df: pd.DataFrame) -> list[FootfallRange]:
+        extremes = df.groupby("wall_id")["from_date"].agg(["min", "max"])
         return [
-            Footfall(
-                start_datetime=row["from_date"].to_pydatetime(),
-                end_datetime=row["to_date"].to_pydatetime(),
-                people_in=row["people_in"],
-                people_out=row["people_out"],
-                wall_id=row["wall_id"],
-                is_active=True,
-                origin=OriginType.reconstruction,
+            FootfallRange(wall_id=wall_id, start_datetime=start, end_datetime=end)
+            for wall_id, start, end in zip(
+                extremes.index.tolist(),
+                pd.DatetimeIndex(extremes["min"]).to_pydatetime(),
+                pd.DatetimeIndex(extremes["max"]).to_pydatetime(),
             )
-            for _, row in df.iterrows()
         ]
+
+    @staticmethod
+    def _to_frame(batch: FootfallBatch) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "wall_id": pd.Series(batch.wall_ids, dtype="int64"),
+                "from_date": pd.to_datetime(pd.Series(batch.start_datetimes)),
+                "to_date": pd.to_datetime(pd.Series(batch.end_datetimes)),
+                "people_in": pd.Series(batch.people_in, dtype="int64"),
+                "people_out": pd.Series(batch.people_out, dtype="int64"),
+                "origin": pd.Series(batch.origins, dtype="object"),
+            }
+        )
+
+    @staticmethod
+    def _to_batch(df: pd.DataFrame) -> FootfallBatch:
+        size = len(df)
+        return FootfallBatch(
+            start_datetimes=pd.DatetimeIndex(df["from_date"]).to_pydatetime().tolist(),
+            end_datetimes=pd.DatetimeIndex(df["to_date"]).to_pydatetime().tolist(),
+            people_in=df["people_in"].tolist(),
+            people_out=df["people_out"].tolist(),
+            is_active=[True] * size,
+            origins=[OriginType.reconstruction] * size,
+            wall_ids=df["wall_id"].tolist(),
+        )
+
+
+def _init_shard_worker(repository_factory: Callable[[], FootfallRepository]) -> None:
+    global _shard_repository
+    _shard_repository = repository_factory()
+
+
+def _process_shard(
+    staging_key: str,
+    df: pd.DataFrame,
+    last_rows: pd.DataFrame | None,
+    import_job_id: int | None = None,
+) -> ShardResult:
+    assert _shard_repository is not None
+    try:
+        last_rows = ProcessFootfallsUseCase._check_consecutive(df, last_rows)
+    except NotValidFileException as e:
+        return e.errors, last_rows
+    _shard_repository.stage_batch(
+        staging_key, ProcessFootfallsUseCase._to_batch(df), import_job_id
+    )
+    return [], last_rows
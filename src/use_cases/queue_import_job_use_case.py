@@ -0,0 +1,140 @@
+import hashlib
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from adapters.exceptions import (
+    ImportJobNotFoundException,
+    ImportLedgerEntryAlreadyExistsException,
+    ImportLedgerEntryNotFoundException,
+)
+from domain.entities.import_job import ImportJob, ImportJobStatus
+from domain.entities.import_ledger import ImportLedgerEntry
+from ports.repositories.import_job_repository import ImportJobRepository
+from ports.repositories.import_ledger_repository import ImportLedgerRepository
+from use_cases.exceptions import IdempotencyKeyReusedException
+from use_cases.run_import_job_use_case import DEFAULT_LEASE
+
+
+def get_fingerprint(content_hash: str, import_job: ImportJob) -> str:
+    # The same bytes imported with another strategy or read with other parse
+    # options are a different import.
+    options = (
+        content_hash,
+        import_job.strategy,
+        import_job.file_format,
+        import_job.compression or "",
+    )
+    return hashlib.sha256(":".join(options).encode()).hexdigest()
+
+
+class QueueImportJobUseCase:
+    def __init__(
+        self,
+        import_job_repository: ImportJobRepository,
+        import_ledger_repository: ImportLedgerRepository,
+        lease: timedelta = DEFAULT_LEASE,
+    ):
+        self._import_job_repository = import_job_repository
+        self._import_ledger_repository = import_ledger_repository
+        self._lease = lease
+
+    def __call__(
+        self,
+        import_job: ImportJob,
+        content_hash: str,
+        idempotency_key: str | None = None,
+    ) -> tuple[ImportJob, bool]:
+        if import_job.dry_run:
+            return self._import_job_repository.add(import_job), True
+        fingerprint = get_fingerprint(content_hash, import_job)
+        entry = self._find_entry(fingerprint, idempotency_key)
+        abandoned_job = None
+        if entry is not None:
+            recorded_job = self._import_job_repository.get(
+                id_filter=entry.import_job_id
+            )
+            if self._is_abandoned(recorded_job):
+                abandoned_job = recorded_job
+            elif recorded_job.status != ImportJobStatus.failed:
+                return recorded_job, False
+        try:
+            # The job is only queued together with its ledger entry: a concurrent
+            # request for the same file rolls back and gets the recorded job.
+            with (
+                self._import_job_repository.atomic(),
+                self._import_ledger_repository.atomic(),
+            ):
+                if abandoned_job is not None:
+                    self._import_job_repository.update(
+                        {
+                            "status": ImportJobStatus.failed,
+                            "details": "The worker stopped before finishing.",
+                            "finished_at": datetime.now(),
+                        },
+                        id_filter=abandoned_job.id,
+                        status_filter=ImportJobStatus.running,
+                        claimed_before_filter=datetime.now() - self._lease,
+                    )
+                import_job = self._import_job_repository.add(import_job)
+                assert import_job.id
+                if entry is None:
+                    self._import_ledger_repository.add(
+                        ImportLedgerEntry(
+                            content_hash=fingerprint,
+                            import_job_id=import_job.id,
+                            idempotency_key=idempotency_key,
+                        )
+                    )
+                else:
+                    self._import_ledger_repository.update(
+                        {"import_job_id": import_job.id},
+                        id_filter=entry.id,
+                        import_job_id_filter=entry.import_job_id,
+                    )
+        except (
+            ImportJobNotFoundException,
+            ImportLedgerEntryAlreadyExistsException,
+            ImportLedgerEntryNotFoundException,
+        ):
+            return self._get_recorded_job(fingerprint, idempotency_key), False
+        if abandoned_job is not None:
+            Path(abandoned_job.file_path).unlink(missing_ok=True)
+        return import_job, True
+
+    def _is_abandoned(self, import_job: ImportJob) -> bool:
+        # The claim of a running job is renewed with every chunk, past the lease
+        # its worker is gone.
+        return (
+            import_job.status == ImportJobStatus.running
+            and import_job.claimed_at is not None
+            and import_job.claimed_at < datetime.now() - self._lease
+        )
+
+    def _get_recorded_job(
+        self, fingerprint: str, idempotency_key: str | None
+    ) -> ImportJob:
+        entry = self._find_entry(fingerprint, idempotency_key)
+        if entry is None:
+            raise ImportLedgerEntryNotFoundException(
+                {"content_hash_filter": fingerprint}
+            )
+        return self._import_job_repository.get(id_filter=entry.import_job_id)
+
+    def _find_entry(
+        self, fingerprint: str, idempotency_key: str | None
+    ) -> ImportLedgerEntry | None:
+        if idempotency_key:
+            try:
+                entry = self._import_ledger_repository.get(
+                    idempotency_key_filter=idempotency_key
+                )
+            except ImportLedgerEntryNotFoundException:
+                pass
+            else:
+                if entry.content_hash != fingerprint:
+                    raise IdempotencyKeyReusedException
+                return entry
+        try:
+            return self._import_ledger_repository.get(content_hash_filter=fingerprint)
+        except ImportLedgerEntryNotFoundException:
+            return None
@@ -0,0 +1,164 @@
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from adapters.exceptions import (
+    BaseNotFoundException,
+    ExternalException,
+    ImportJobNotFoundException,
+)
+from domain.entities.footfall_import import FootfallImportSummary
+from domain.entities.import_job import ImportJob, ImportJobStatus
+from ports.repositories.import_job_repository import ImportJobRepository
+from use_cases.exceptions import NotValidFileException
+from use_cases.process_footfalls_use_case import ProcessFootfallsUseCase
+
+logger = logging.getLogger()
+
+DEFAULT_LEASE = timedelta(minutes=10)
+
+
+class RunImportJobUseCase:
+    def __init__(
+        self,
+        import_job_repository: ImportJobRepository,
+        process_footfalls: ProcessFootfallsUseCase,
+        validate_footfalls: ProcessFootfallsUseCase | None = None,
+        lease: timedelta = DEFAULT_LEASE,
+        heartbeat_repository: ImportJobRepository | None = None,
+    ):
+        self._import_job_repository = import_job_repository
+        self._process_footfalls = process_footfalls
+        self._validate_footfalls = validate_footfalls or process_footfalls
+        self._lease = lease
+        self._heartbeat_repository = heartbeat_repository
+
+    def __call__(self) -> ImportJob | None:
+        import_job = self._import_job_repository.claim_next(self._lease)
+        if import_job is None:
+            return None
+        assert import_job.id
+        job_id = import_job.id
+        # Writes are fenced on this claim, a worker that lost it to another one
+        # must neither overwrite the job nor delete its file.
+        claim = {
+            "id_filter": job_id,
+            "status_filter": ImportJobStatus.running,
+            "started_at_filter": import_job.started_at,
+        }
+
+        def on_chunk(summary: FootfallImportSummary) -> None:
+            self._import_job_repository.update(
+                fields_to_update={
+                    "rows_processed": summary.rows,
+                    "walls_processed": summary.walls,
+                    **self._get_diff_fields(summary),
+                    "claimed_at": datetime.now(),
+                },
+                **claim,
+            )
+
+        with self._heartbeat(claim):
+            fields_to_update = self._run(import_job, on_chunk)
+        fields_to_update["finished_at"] = datetime.now()
+        try:
+            self._import_job_repository.update(fields_to_update, **claim)
+        except ImportJobNotFoundException:
+            logger.warning("Lost the claim on import job %s", job_id)
+            return None
+        Path(import_job.file_path).unlink(missing_ok=True)
+        return self._import_job_repository.get(id_filter=job_id)
+
+    @contextmanager
+    def _heartbeat(self, claim: dict[str, Any]) -> Iterator[None]:
+        # Steps without progress callbacks (a single chunk write, applying the
+        # staged rows, refreshing the rollups) can outlast the lease, so the
+        # claim is also renewed from a thread with its own repository.
+        if self._heartbeat_repository is None:
+            yield
+            return
+        repository = self._heartbeat_repository
+        stopped = threading.Event()
+
+        def renew() -> None:
+            while not stopped.wait(self._lease.total_seconds() / 3):
+                try:
+                    repository.update({"claimed_at": datetime.now()}, **claim)
+                except ImportJobNotFoundException:
+                    return
+                except ExternalException:
+                    continue
+
+        thread = threading.Thread(target=renew, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            thread.join()
+
+    def _run(
+        self,
+        import_job: ImportJob,
+        on_chunk: Callable[[FootfallImportSummary], None],
+    ) -> dict[str, Any]:
+        try:
+            process_footfalls = (
+                self._validate_footfalls
+                if import_job.dry_run
+                else self._process_footfalls
+            )
+            with open(import_job.file_path, "rb") as file:
+                summary = process_footfalls(
+                    file,
+                    file_format=import_job.file_format,
+                    compression=import_job.compression,
+                    on_chunk=on_chunk,
+                    dry_run=import_job.dry_run,
+                    strategy=import_job.strategy,
+                    import_job_id=import_job.id,
+                )
+            stats = asdict(summary.stats)
+            logger.info(
+                "Import job %s stats %s",
+                import_job.id,
+                json.dumps(stats),
+                extra={"import_job_id": import_job.id, "import_stats": stats},
+            )
+            return {
+                "status": ImportJobStatus.succeeded,
+                "rows_processed": summary.rows,
+                "walls_processed": summary.walls,
+                **self._get_diff_fields(summary),
+                "stats": summary.stats,
+            }
+        except NotValidFileException as e:
+            return {
+                "status": ImportJobStatus.failed,
+                "details": "The data is not valid.",
+                "errors": e.errors,
+            }
+        except BaseNotFoundException as e:
+            return {"status": ImportJobStatus.failed, "details": str(e)}
+        except ExternalException:
+            return {
+                "status": ImportJobStatus.failed,
+                "details": "Something went wrong. Please try again later.",
+            }
+        except Exception as e:
+            logger.exception(e)
+            return {"status": ImportJobStatus.failed, "details": str(e)}
+
+    @staticmethod
+    def _get_diff_fields(summary: FootfallImportSummary) -> dict[str, int]:
+        return {
+            "rows_superseded": summary.superseded,
+            "rows_unchanged": summary.unchanged,
+            "rows_changed": summary.changed,
+            "rows_new": summary.new,
+        }